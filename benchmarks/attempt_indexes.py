@@ -0,0 +1,150 @@
+"""
+Time the per-user attempt lookups before and after migration 0001
+
+Builds a synthetic slot_attempts table in SQLite with the schema as it was
+before the migration (a single broadcaster index), times the queries used by
+library.getLastSlots, getLastTwitchSlotsUser and getLastTwitchSlotsAttempts,
+then applies migrations/0001-attempt-indexes-sqlite.sql and times them again.
+
+    python benchmarks/attempt_indexes.py --rows 2000000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Tuple  # noqa: F401
+
+root: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+queries: List[Tuple[str, str]] = [
+    ('getLastSlots', '''
+SELECT MAX(attemptTime)
+    FROM (
+        SELECT MAX(attemptTime) AS attemptTime
+            FROM slot_attempts
+            WHERE broadcaster=?
+        UNION
+        SELECT MAX(attemptTime) FROM ffz_slot_attempts WHERE broadcaster=?
+        UNION
+        SELECT MAX(attemptTime) FROM bttv_slot_attempts WHERE broadcaster=?)
+'''),
+    ('getLastTwitchSlotsUser', '''
+SELECT MAX(attemptTime)
+    FROM slot_attempts
+    WHERE broadcaster=? AND twitchUser=?
+'''),
+    ('getLastTwitchSlotsAttempts', '''
+SELECT attemptTime
+    FROM slot_attempts
+    WHERE broadcaster=? AND twitchUser=? AND attemptTime>=?
+    ORDER BY attemptTime ASC
+'''),
+    ]
+
+
+def create_baseline(conn: sqlite3.Connection) -> None:
+    with open(os.path.join(root, 'database-sqlite.sql')) as file:
+        conn.executescript(file.read())
+    table: str
+    for table in ['slot_attempts', 'ffz_slot_attempts', 'bttv_slot_attempts']:
+        conn.executescript(f'''
+DROP INDEX {table}_broadcaster_user;
+DROP INDEX {table}_broadcaster_time;
+CREATE INDEX {table}_broadcaster ON {table} (broadcaster);
+''')
+
+
+def synthetic_rows(rows: int,
+                   channels: int,
+                   users: int,
+                   start: datetime) -> Iterator[Tuple]:
+    rng: random.Random = random.Random(0)
+    i: int
+    for i in range(rows):
+        # Half of the rows go to the first channel to model a busy channel
+        channel: int = 0 if rng.random() < 0.5 else rng.randrange(channels)
+        timestamp: datetime = start + timedelta(seconds=i)
+        user: int = rng.randrange(users)
+        yield (f'channel{channel}', str(timestamp), f'user{user}',
+               1, False, 'Kappa', 'Keepo', 'PogChamp', 25, 1902, 88,
+               False, False, False, False, False)
+
+
+def populate(conn: sqlite3.Connection,
+             rows: int,
+             channels: int,
+             users: int,
+             start: datetime) -> None:
+    conn.executemany('''
+INSERT INTO slot_attempts
+    (broadcaster, attemptTime, twitchUser, numMatching, isWin, emoticon1,
+    emoticon2, emoticon3, emoticonId1, emoticonId2, emoticonId3,
+    isBasicMatch, isKappaMatch, isCatMatch, isDogMatch, isSubscriberMatch)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+''', synthetic_rows(rows, channels, users, start))
+    conn.commit()
+    conn.execute('ANALYZE')
+
+
+def time_queries(conn: sqlite3.Connection,
+                 repeat: int,
+                 users: int,
+                 now: datetime) -> List[Tuple[str, float]]:
+    rng: random.Random = random.Random(1)
+    since: str = str(now - timedelta(hours=2))
+    results: List[Tuple[str, float]] = []
+    name: str
+    query: str
+    for name, query in queries:
+        start: float = time.perf_counter()
+        for _ in range(repeat):
+            user: str = f'user{rng.randrange(users)}'
+            params: Tuple = {
+                'getLastSlots': ('channel0',) * 3,
+                'getLastTwitchSlotsUser': ('channel0', user),
+                'getLastTwitchSlotsAttempts': ('channel0', user, since),
+                }[name]
+            conn.execute(query, params).fetchall()
+        results.append(
+            (name, (time.perf_counter() - start) / repeat * 1000))
+    return results
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=2000000)
+    parser.add_argument('--channels', type=int, default=100)
+    parser.add_argument('--users', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--database', default=':memory:')
+    args: argparse.Namespace = parser.parse_args()
+
+    conn: sqlite3.Connection = sqlite3.connect(args.database)
+    create_baseline(conn)
+    start: datetime = datetime(2017, 1, 1)
+    populate(conn, args.rows, args.channels, args.users, start)
+    now: datetime = start + timedelta(seconds=args.rows)
+
+    before: List[Tuple[str, float]]
+    before = time_queries(conn, args.repeat, args.users, now)
+    migration: str = os.path.join(root, 'migrations',
+                                  '0001-attempt-indexes-sqlite.sql')
+    with open(migration) as file:
+        conn.executescript(file.read())
+    conn.execute('ANALYZE')
+    after: List[Tuple[str, float]]
+    after = time_queries(conn, args.repeat, args.users, now)
+
+    print(f'{args.rows} rows, {args.channels} channels, {args.users} users')
+    print(f'{"query":<28}{"before ms":>12}{"after ms":>12}')
+    name: str
+    b: float
+    a: float
+    for (name, b), (_, a) in zip(before, after):
+        print(f'{name:<28}{b:>12.3f}{a:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+"""
+In-process stand-ins for the parts of BotGotsThis the slots spin touches
+
+FakeDatabase serves the DatabaseMain interface from an in-memory SQLite
+database built from database-sqlite.sql and counts the queries it runs.
+With isSqlite=False it stands in for PostgreSQL: PREPARE and EXECUTE are
+run on SQLite and every statement the server would parse is counted.
+FakeCacheStore serves synthetic emote sets. install() patches them into
+lib.database and bot.utils, the modules of this package are then imported
+with load().
+
+The benchmarks run from the BotGotsThis root so bot and lib import.
+"""
+import importlib
+import os
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional  # noqa
+from typing import Sequence, Set  # noqa: F401
+from unittest import mock
+
+root: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+package: str = os.path.basename(root)
+# bot and lib from the working directory, this package from its parent
+for path in (os.getcwd(), os.path.dirname(root)):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def load(module: str) -> ModuleType:
+    return importlib.import_module(f'{package}.{module}')
+
+
+def adapt_datetime(value: datetime) -> str:
+    return value.isoformat(' ')
+
+
+def convert_timestamp(value: bytes) -> datetime:
+    text: str = value.decode()
+    # isoformat leaves out the microseconds when they are 0
+    if '.' in text:
+        return datetime.strptime(text, '%Y-%m-%d %H:%M:%S.%f')
+    return datetime.strptime(text, '%Y-%m-%d %H:%M:%S')
+
+
+sqlite3.register_adapter(datetime, adapt_datetime)
+sqlite3.register_converter('timestamp', convert_timestamp)
+
+timestampText = re.compile(r'\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(\.\d+)?$')
+
+
+def to_sqlite(query: str) -> str:
+    """
+    The PostgreSQL only syntax of the slots queries in SQLite
+    """
+    return query.replace('ON CONFLICT ON CONSTRAINT slot_bots_pkey',
+                         'ON CONFLICT (broadcaster, bot)')
+
+
+class FakeCursor:
+    def __init__(self, database: 'FakeDatabase') -> None:
+        self.database: FakeDatabase = database
+        self._cursor: sqlite3.Cursor = database.connection.cursor()
+        database.cursors += 1
+
+    async def __aenter__(self) -> 'FakeCursor':
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._cursor.close()
+
+    async def close(self) -> None:
+        self._cursor.close()
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    async def execute(self,
+                      query: str,
+                      params: Sequence[Any] = ()) -> 'FakeCursor':
+        self.database.queries += 1
+        self._cursor.execute(self.database.parse(query), params)
+        return self
+
+    async def executemany(self,
+                          query: str,
+                          params: Sequence[Sequence[Any]]) -> 'FakeCursor':
+        self.database.queries += 1
+        self._cursor.executemany(self.database.parse(query), params)
+        return self
+
+    async def fetchone(self) -> Optional[Any]:
+        return self.database.row(self._cursor.fetchone())
+
+    async def fetchall(self) -> List[Any]:
+        return [self.database.row(row) for row in self._cursor.fetchall()]
+
+    def __aiter__(self) -> 'FakeCursor':
+        return self
+
+    async def __anext__(self) -> Any:
+        row: Optional[Any] = self._cursor.fetchone()
+        if row is None:
+            raise StopAsyncIteration
+        return self.database.row(row)
+
+
+class FakeDatabase:
+    """
+    DatabaseMain over one SQLite connection, acquire() always returns it
+
+    Counts the queries, the cursors opened, the distinct statement texts and
+    the statements parsed. sqlite3 caches the compiled statements by text,
+    PostgreSQL parses every statement.
+    """
+    def __init__(self, path: str = ':memory:', isSqlite: bool = True) -> None:
+        self.isSqlite: bool = isSqlite
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            path,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+        with open(os.path.join(root, 'database-sqlite.sql'),
+                  encoding='utf-8') as file:
+            self.connection.executescript(file.read())
+        self.queries: int = 0
+        self.commits: int = 0
+        self.cursors: int = 0
+        self.parses: int = 0
+        self.statements: Set[str] = set()
+
+    def parse(self, query: str) -> str:
+        """
+        The SQLite text to run for query
+        """
+        if self.isSqlite:
+            if query not in self.statements:
+                self.parses += 1
+            self.statements.add(query)
+            return query
+        self.statements.add(query)
+        self.parses += 1
+        return to_sqlite(query)
+
+    def row(self, row: Optional[Any]) -> Optional[Any]:
+        """
+        Timestamps as datetime, like the PostgreSQL driver returns them
+        without the [timestamp] column hints of SQLite
+        """
+        if self.isSqlite or row is None:
+            return row
+        return tuple(convert_timestamp(v.encode())
+                     if isinstance(v, str) and timestampText.match(v) else v
+                     for v in row)
+
+    def acquire(self) -> 'FakeDatabase':
+        return self
+
+    async def __aenter__(self) -> 'FakeDatabase':
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        pass
+
+    async def cursor(self) -> FakeCursor:
+        return FakeCursor(self)
+
+    async def commit(self) -> None:
+        self.commits += 1
+        self.connection.commit()
+
+
+class FakeTimeoutDatabase:
+    def __init__(self) -> None:
+        self.timeouts: int = 0
+
+    def acquire(self) -> 'FakeTimeoutDatabase':
+        return self
+
+    async def __aenter__(self) -> 'FakeTimeoutDatabase':
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        pass
+
+    async def recordTimeout(self, *args: Any) -> None:
+        self.timeouts += 1
+
+
+class FakeCacheStore:
+    """
+    Synthetic Twitch, FFZ and BTTV emotes, every call is counted
+    """
+    def __init__(self,
+                 twitchEmotes: int = 200,
+                 channelEmotes: int = 20,
+                 features: Optional[Set[str]] = None) -> None:
+        self.calls: int = 0
+        self.features: Set[str] = (features if features is not None
+                                   else {'slots', 'ffzslots', 'bttvslots'})
+        basic: List[str] = [':)', ':(', ':D', '>(', ':z', 'o_O', 'B)', ':o',
+                            '<3', ':\\', ';)', ':P', ';P', 'R)']
+        self.twitchEmotes: Dict[int, str] = {
+            i + 1: name for i, name in enumerate(basic)}
+        self.twitchEmotes.update({100 + i: f'emote{i}'
+                                  for i in range(twitchEmotes)})
+        self.twitchEmotes.update({
+            25: 'Kappa', 26: 'Keepo', 27: 'CoolCat', 28: 'FrankerZ',
+            29: 'OhMyDog'})
+        self.twitchSets: Dict[int, int] = {
+            i: (i // 10 if i >= 100 else 0) for i in self.twitchEmotes}
+        self.globalFfz: Dict[int, str] = {i: f'ffz{i}' for i in range(50)}
+        self.globalBttv: Dict[str, str] = {f'b{i}': f'bttv{i}'
+                                           for i in range(50)}
+        self.channelEmotes: int = channelEmotes
+
+    async def hasFeature(self, channel: str, feature: str) -> bool:
+        self.calls += 1
+        return feature in self.features
+
+    async def twitch_get_bot_emote_set(self) -> Set[int]:
+        self.calls += 1
+        return set(self.twitchSets.values())
+
+    async def twitch_load_emotes(self, emoteSets: Set[int]) -> bool:
+        self.calls += 1
+        return True
+
+    async def twitch_get_emotes(self) -> Dict[int, str]:
+        self.calls += 1
+        return dict(self.twitchEmotes)
+
+    async def twitch_get_emote_sets(self) -> Dict[int, int]:
+        self.calls += 1
+        return dict(self.twitchSets)
+
+    async def ffz_load_global_emotes(self) -> bool:
+        self.calls += 1
+        return True
+
+    async def ffz_get_global_emotes(self) -> Dict[int, str]:
+        self.calls += 1
+        return dict(self.globalFfz)
+
+    async def ffz_load_broadcaster_emotes(self, broadcaster: str) -> bool:
+        self.calls += 1
+        return True
+
+    async def ffz_get_broadcaster_emotes(self,
+                                         broadcaster: str) -> Dict[int, str]:
+        self.calls += 1
+        return {1000 + i: f'{broadcaster}Ffz{i}'
+                for i in range(self.channelEmotes)}
+
+    async def bttv_load_global_emotes(self) -> bool:
+        self.calls += 1
+        return True
+
+    async def bttv_get_global_emotes(self) -> Dict[str, str]:
+        self.calls += 1
+        return dict(self.globalBttv)
+
+    async def bttv_load_broadcaster_emotes(self, broadcaster: str) -> bool:
+        self.calls += 1
+        return True
+
+    async def bttv_get_broadcaster_emotes(self,
+                                          broadcaster: str) -> Dict[str, str]:
+        self.calls += 1
+        return {f'{broadcaster}{i}': f'{broadcaster}Bttv{i}'
+                for i in range(self.channelEmotes)}
+
+
+class FakeChannel:
+    def __init__(self, channel: str) -> None:
+        self.channel: str = channel
+        self.sessionData: Dict[str, Any] = {}
+        self.messages: List[str] = []
+
+    def send(self, messages: Any) -> None:
+        if isinstance(messages, str):
+            self.messages.append(messages)
+        else:
+            self.messages.extend(messages)
+
+
+class FakePermissions(NamedTuple):
+    chatModerator: bool = True
+
+
+class FakeArgs(NamedTuple):
+    """
+    The fields of lib.data.ChatCommandArgs the slots commands read
+    """
+    data: FakeCacheStore
+    chat: FakeChannel
+    tags: Any
+    nick: str
+    message: str
+    permissions: FakePermissions
+    timestamp: datetime
+
+
+class Whispers:
+    def __init__(self) -> None:
+        self.sent: List[str] = []
+
+    def __call__(self, nick: str, message: str) -> None:
+        self.sent.append(nick)
+
+
+@contextmanager
+def install(database: FakeDatabase,
+            timeoutDatabase: Optional[FakeTimeoutDatabase] = None,
+            whispers: Optional[Whispers] = None) -> Iterator[None]:
+    """
+    Patch the fakes in for DatabaseMain, DatabaseTimeout and bot.utils
+    """
+    import bot.globals
+    import bot.utils
+    import lib.database
+
+    with mock.patch.object(lib.database.DatabaseMain, 'acquire',
+                           database.acquire), \
+            mock.patch.object(lib.database.DatabaseTimeout, 'acquire',
+                              (timeoutDatabase
+                               or FakeTimeoutDatabase()).acquire), \
+            mock.patch.object(bot.utils, 'whisper', whispers or Whispers()), \
+            mock.patch.object(bot.globals, 'running', True):
+        if database.isSqlite:
+            yield
+        else:
+            # The partition maintenance needs the PostgreSQL functions
+            with mock.patch.object(load('retention'), 'start', lambda: None):
+                yield
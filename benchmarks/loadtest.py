@@ -0,0 +1,246 @@
+"""
+Replay synthetic chat traffic through the command table of items/channel.py
+against the fakes in benchmarks/fakes.py, in real time
+
+Chatters send the slots commands as a Poisson process spread over the
+channels, optionally with a raid: --raid-size chatters of one channel
+spinning within two seconds. Bot-like spammers spin at a fixed interval and
+start with two hours of fixed interval attempts in the database, so
+process_bot marks them on their first spin.
+
+Reports throughput, the rejections by cause, the channel cooldown waits,
+the bots marked and the event loop lag as JSON.
+
+    cd BotGotsThis
+    python pkg/slots/benchmarks/loadtest.py --channels 200 --users 5000 \\
+        --rate 500 --bots 50 --raid-size 300 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Tuple  # noqa: F401
+from unittest import mock
+
+import fakes
+from spins import percentile
+
+
+class Message(NamedTuple):
+    at: float
+    channel: str
+    nick: str
+    command: str
+
+
+def traffic(args: argparse.Namespace) -> List[Message]:
+    rng: random.Random = random.Random(args.seed)
+    commands: List[str] = args.commands.split(',')
+    perChannel: int = max(1, args.users // args.channels)
+    messages: List[Message] = []
+    at: float = rng.expovariate(args.rate)
+    while at < args.duration:
+        c: int = rng.randrange(args.channels)
+        messages.append(Message(at, f'channel{c}',
+                                f'c{c}user{rng.randrange(perChannel)}',
+                                rng.choice(commands)))
+        at += rng.expovariate(args.rate)
+    i: int
+    for i in range(args.raid_size):
+        messages.append(Message(args.raid_at + rng.uniform(0, 2), 'channel0',
+                                f'raider{i}', commands[0]))
+    for i in range(args.bots):
+        at = rng.uniform(0, args.bot_interval)
+        while at < args.duration:
+            messages.append(Message(at, f'channel{i % args.channels}',
+                                    f'spambot{i}', commands[0]))
+            at += args.bot_interval
+    messages.sort()
+    return messages
+
+
+def seedBots(database: fakes.FakeDatabase,
+             args: argparse.Namespace,
+             now: datetime) -> None:
+    """
+    Two hours of attempts 121 seconds apart for every spammer
+    """
+    rows: List[Tuple[Any, ...]] = []
+    i: int
+    for i in range(args.bots):
+        t: datetime = now - timedelta(seconds=121)
+        while t > now - timedelta(hours=2):
+            rows.append(('twitch', f'channel{i % args.channels}', t,
+                         f'spambot{i}', 1, False, 'a', 'b', 'c', '1', '2',
+                         '3'))
+            t -= timedelta(seconds=121)
+    database.connection.executemany('''
+INSERT INTO slot_attempts
+    (variant, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+    emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2, emoticonId3)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+''', rows)
+    database.connection.commit()
+
+
+def counting(function: Callable[..., Any],
+             counts: Counter,
+             key: str) -> Callable[..., Any]:
+    """
+    Count the calls of function that return a true value
+    """
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        result: Any = function(*args, **kwargs)
+        if result:
+            counts[key] += 1
+        return result
+    return wrapper
+
+
+async def monitorLag(interval: float,
+                     lags: List[float],
+                     stop: asyncio.Event) -> None:
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    while not stop.is_set():
+        began: float = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - began - interval)
+
+
+async def run(args: argparse.Namespace,
+              messages: List[Message],
+              database: fakes.FakeDatabase,
+              cache: fakes.FakeCacheStore,
+              counts: Counter) -> Dict[str, Any]:
+    items = fakes.load('items.channel')
+    recorder = fakes.load('recorder')
+    scheduler = fakes.load('scheduler')
+    table: Dict[str, Any] = dict(items.commands())
+
+    chats: Dict[str, fakes.FakeChannel] = {}
+    latencies: List[float] = []
+    lags: List[float] = []
+    stop: asyncio.Event = asyncio.Event()
+    monitor: asyncio.Future = asyncio.ensure_future(
+        monitorLag(0.01, lags, stop))
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    start: float = loop.time()
+    startTime: datetime = datetime.utcnow()
+
+    async def dispatch(message: Message) -> None:
+        if message.channel not in chats:
+            chats[message.channel] = fakes.FakeChannel(message.channel)
+        commandArgs: fakes.FakeArgs = fakes.FakeArgs(
+            cache, chats[message.channel], None, message.nick,
+            message.command, fakes.FakePermissions(),
+            startTime + timedelta(seconds=loop.time() - start))
+        began: float = time.perf_counter()
+        result: bool = await table[message.command](commandArgs)
+        latencies.append(time.perf_counter() - began)
+        counts['handled' if result else 'not handled'] += 1
+
+    tasks: List[asyncio.Future] = []
+    message: Message
+    for message in messages:
+        delay: float = start + message.at - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(dispatch(message)))
+    await asyncio.gather(*tasks)
+    elapsed: float = loop.time() - start
+    stop.set()
+    await monitor
+    await recorder.get().shutdown()
+
+    schedulers: List[Any] = [scheduler.get(c) for c in chats.values()]
+    served: int = sum(s.served for s in schedulers)
+    spins: int = database.connection.execute(
+        'SELECT COUNT(*) FROM slot_attempts WHERE attemptTime>=?',
+        (startTime,)).fetchone()[0]
+    bots: int = database.connection.execute(
+        "SELECT COUNT(*) FROM slot_bots WHERE bot LIKE 'spambot%'"
+        ).fetchone()[0]
+    return {
+        'elapsed_seconds': round(elapsed, 1),
+        'messages': len(messages),
+        'messages_per_second': round(len(messages) / elapsed, 1),
+        'spins': spins,
+        'spins_per_second': round(spins / elapsed, 1),
+        'rejected': {
+            'already_queued': sum(s.duplicates for s in schedulers),
+            'queue_full': sum(s.dropped for s in schedulers),
+            'user_cooldown': counts['user_cooldown'],
+            'user_cooldown_cached': counts['user_cooldown_cached'],
+            },
+        'channel_cooldown_waits': counts['channel_cooldown'],
+        'queue_wait_mean_ms': round(
+            sum(s.totalWait for s in schedulers) / max(served, 1) * 1000, 1),
+        'queue_wait_max_ms': round(
+            max((s.maxWait for s in schedulers), default=0) * 1000, 1),
+        'handler_p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'handler_p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'bots_marked': bots,
+        'bots': args.bots,
+        'loop_lag_p50_ms': round(percentile(lags, 0.5) * 1000, 3),
+        'loop_lag_p99_ms': round(percentile(lags, 0.99) * 1000, 3),
+        'loop_lag_max_ms': round(max(lags) * 1000, 3),
+        'chat_messages': sum(len(c.messages) for c in chats.values()),
+        'queries': database.queries,
+        'outcomes': {k: counts[k] for k in ('handled', 'not handled')},
+        }
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Load test the slots commands against fakes')
+    parser.add_argument('--duration', type=float, default=20.0,
+                        help='seconds of traffic')
+    parser.add_argument('--channels', type=int, default=100)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--rate', type=float, default=200.0,
+                        help='chatter messages per second over all channels')
+    parser.add_argument('--commands', default='!slots,!ffzslots,!bttvslots')
+    parser.add_argument('--bots', type=int, default=20)
+    parser.add_argument('--bot-interval', type=float, default=1.0,
+                        help='seconds between the spins of a spammer')
+    parser.add_argument('--raid-size', type=int, default=0)
+    parser.add_argument('--raid-at', type=float, default=5.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON file, default stdout')
+    args: argparse.Namespace = parser.parse_args()
+
+    library = fakes.load('library')
+    random.seed(args.seed)
+    database: fakes.FakeDatabase = fakes.FakeDatabase()
+    seedBots(database, args, datetime.utcnow())
+    cache: fakes.FakeCacheStore = fakes.FakeCacheStore()
+    counts: Counter = Counter()
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    with fakes.install(database), \
+            mock.patch.object(library, 'in_cooldown', counting(
+                library.in_cooldown, counts, 'user_cooldown')), \
+            mock.patch.object(library, 'in_cached_cooldown', counting(
+                library.in_cached_cooldown, counts,
+                'user_cooldown_cached')), \
+            mock.patch.object(library, 'channel_cooldown_left', counting(
+                library.channel_cooldown_left, counts,
+                'channel_cooldown')):
+        report: Dict[str, Any] = loop.run_until_complete(
+            run(args, traffic(args), database, cache, counts))
+    report['parameters'] = {k: v for k, v in vars(args).items()
+                            if k != 'output'}
+
+    text: str = json.dumps(report, indent=2, sort_keys=True) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == '__main__':
+    main()
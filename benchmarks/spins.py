@@ -0,0 +1,199 @@
+"""
+Drive simulated !slots, !ffzslots and !bttvslots spins through spin.spin
+against the fakes in benchmarks/fakes.py
+
+Every channel gets a spin every --spacing simulated seconds from a random
+user, channels run concurrently. Reports per-spin latency percentiles,
+database queries and cursors, the distinct statement texts the spins
+parsed, cache calls and memory per spin as JSON with sorted keys,
+one value per line, so two result files diff cleanly between commits.
+
+    cd BotGotsThis
+    python pkg/slots/benchmarks/spins.py --spins 5000 --output before.json
+    git diff --no-index before.json after.json
+
+--postgres runs the PostgreSQL texts of the package queries on the fake,
+which counts every statement as a parse. It checks the queries per spin, it
+does not measure a real PostgreSQL server.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple  # noqa: F401
+
+import fakes
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    ordered: List[float] = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def schedule(spins: int,
+             channels: int,
+             users: int,
+             spacing: float,
+             seed: int) -> Dict[str, List[Tuple[str, str, timedelta]]]:
+    """
+    (variant, user, offset) of every spin per channel
+    """
+    rng: random.Random = random.Random(seed)
+    names: List[str] = ['twitch', 'ffz', 'bttv']
+    plan: Dict[str, List[Tuple[str, str, timedelta]]] = {
+        f'channel{c}': [] for c in range(channels)}
+    i: int
+    for i in range(spins):
+        channel: str = f'channel{i % channels}'
+        offset: timedelta = timedelta(
+            seconds=spacing * len(plan[channel]))
+        plan[channel].append((rng.choice(names), f'user{rng.randrange(users)}',
+                              offset))
+    return plan
+
+
+async def run(plan: Dict[str, List[Tuple[str, str, timedelta]]],
+              database: fakes.FakeDatabase,
+              cache: fakes.FakeCacheStore,
+              traceMemory: bool) -> Dict[str, Any]:
+    recorder = fakes.load('recorder')
+    spin = fakes.load('spin')
+    variant = fakes.load('variant')
+    fakes.load('library')
+
+    latencies: List[float] = []
+    # Memory still traced at the end of each spin over the start, Python 3.6
+    # has no tracemalloc.reset_peak for a per-spin peak
+    allocated: List[int] = []
+    outcomes: Counter = Counter()
+    start: datetime = datetime.utcnow()
+    chats: Dict[str, fakes.FakeChannel] = {
+        c: fakes.FakeChannel(c) for c in plan}
+
+    async def channel(name: str) -> None:
+        slotVariant: str
+        user: str
+        offset: timedelta
+        for slotVariant, user, offset in plan[name]:
+            args: fakes.FakeArgs = fakes.FakeArgs(
+                cache, chats[name], None, user,
+                variant.variants[slotVariant].command,
+                fakes.FakePermissions(), start + offset)
+            if traceMemory:
+                before: int = tracemalloc.get_traced_memory()[0]
+            began: float = time.perf_counter()
+            result: bool = await spin.spin(args, variant.variants[slotVariant])
+            latencies.append(time.perf_counter() - began)
+            if traceMemory:
+                allocated.append(tracemalloc.get_traced_memory()[0] - before)
+            outcomes['spun' if result else 'rejected'] += 1
+
+    queries: int = database.queries
+    parses: int = database.parses
+    cursors: int = database.cursors
+    statements: int = len(database.statements)
+    calls: int = cache.calls
+    if traceMemory:
+        tracemalloc.start()
+    retained: int = tracemalloc.get_traced_memory()[0]
+    began: float = time.perf_counter()
+    await asyncio.gather(*(channel(c) for c in plan))
+    elapsed: float = time.perf_counter() - began
+    spinQueries: int = database.queries - queries
+    spinCursors: int = database.cursors - cursors
+    spinParses: int = database.parses - parses
+    spinStatements: int = len(database.statements) - statements
+    await recorder.get().shutdown()
+    writeQueries: int = database.queries - queries - spinQueries
+    retained = tracemalloc.get_traced_memory()[0] - retained
+    if traceMemory:
+        tracemalloc.stop()
+
+    count: int = len(latencies)
+    result: Dict[str, Any] = {
+        'spins': count,
+        'spins_per_second': round(count / elapsed, 1),
+        'spin_p50_ms': round(percentile(latencies, 0.5) * 1000, 3),
+        'spin_p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'spin_max_ms': round(max(latencies) * 1000, 3),
+        'queries_per_spin': round(spinQueries / count, 3),
+        'write_queries_per_spin': round(writeQueries / count, 3),
+        'cursors_per_spin': round(spinCursors / count, 3),
+        'parses_per_spin': round(spinParses / count, 3),
+        'statement_texts': spinStatements,
+        'cache_calls_per_spin': round((cache.calls - calls) / count, 3),
+        'outcomes': dict(outcomes),
+        'messages': sum(len(c.messages) for c in chats.values()),
+        }
+    if traceMemory:
+        result['memory_allocated_bytes_per_spin'] = round(
+            sum(allocated) / count)
+        result['memory_retained_bytes_per_spin'] = round(retained / count)
+    return result
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Benchmark the slots spin pipeline against fakes')
+    parser.add_argument('--spins', type=int, default=2000)
+    parser.add_argument('--channels', type=int, default=20)
+    parser.add_argument('--users', type=int, default=200,
+                        help='users per channel')
+    parser.add_argument('--spacing', type=float, default=5.0,
+                        help='simulated seconds between spins of a channel')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--memory-spins', type=int, default=500,
+                        help='spins of the second, traced, memory run')
+    parser.add_argument('--postgres', action='store_true',
+                        help='count the statements as PostgreSQL parses them')
+    parser.add_argument('--output', help='JSON file, default stdout')
+    args: argparse.Namespace = parser.parse_args()
+
+    commit: str = subprocess.run(
+        ['git', 'rev-parse', '--short', 'HEAD'], cwd=fakes.root,
+        stdout=subprocess.PIPE, universal_newlines=True).stdout.strip()
+    report: Dict[str, Any] = {
+        'commit': commit,
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'parameters': {k: v for k, v in vars(args).items() if k != 'output'},
+        }
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    cache: fakes.FakeCacheStore = fakes.FakeCacheStore()
+    random.seed(args.seed)
+    database: fakes.FakeDatabase = fakes.FakeDatabase(
+        isSqlite=not args.postgres)
+    whispers: fakes.Whispers = fakes.Whispers()
+    with fakes.install(database, whispers=whispers):
+        report['timing'] = loop.run_until_complete(run(
+            schedule(args.spins, args.channels, args.users, args.spacing,
+                     args.seed),
+            database, cache, False))
+    report['timing']['whispers'] = len(whispers.sent)
+    # A fresh database and channels so the traced run starts as cold
+    database = fakes.FakeDatabase(isSqlite=not args.postgres)
+    with fakes.install(database):
+        report['memory'] = loop.run_until_complete(run(
+            schedule(args.memory_spins, args.channels, args.users,
+                     args.spacing, args.seed + 1),
+            database, cache, True))
+
+    text: str = json.dumps(report, indent=2, sort_keys=True) + '\n'
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == '__main__':
+    main()
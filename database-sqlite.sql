@@ -4,19 +4,22 @@ CREATE TABLE slot_bots (
     marked TIMESTAMP NOT NULL,
     PRIMARY KEY (broadcaster, bot)
 );
+CREATE INDEX slot_bots_marked ON slot_bots (marked);
 
 CREATE TABLE slot_winners (
     id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    variant VARCHAR NOT NULL,
     broadcaster VARCHAR NOT NULL,
     winningTime TIMESTAMP NOT NULL,
     winner VARCHAR NOT NULL,
     winningEmote VARCHAR NOT NULL,
-    winningEmoteId INTEGER NOT NULL
+    winningEmoteId VARCHAR NOT NULL
 );
-CREATE INDEX slot_winners_broadcaster ON slot_winners (broadcaster);
+CREATE INDEX slot_winners_broadcaster ON slot_winners (broadcaster, variant);
 
 CREATE TABLE slot_attempts (
     id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    variant VARCHAR NOT NULL,
     broadcaster VARCHAR NOT NULL,
     attemptTime TIMESTAMP NOT NULL,
     twitchUser VARCHAR NOT NULL,
@@ -25,29 +28,75 @@ CREATE TABLE slot_attempts (
     emoticon1 VARCHAR NOT NULL,
     emoticon2 VARCHAR NOT NULL,
     emoticon3 VARCHAR NOT NULL,
-    emoticonId1 INTEGER NOT NULL,
-    emoticonId2 INTEGER NOT NULL,
-    emoticonId3 INTEGER NOT NULL,
-    isBasicMatch BOOLEAN NOT NULL,
-    isKappaMatch BOOLEAN NOT NULL,
-    isCatMatch BOOLEAN NOT NULL,
-    isDogMatch BOOLEAN NOT NULL,
-    isSubscriberMatch BOOLEAN NOT NULL
+    emoticonId1 VARCHAR NOT NULL,
+    emoticonId2 VARCHAR NOT NULL,
+    emoticonId3 VARCHAR NOT NULL,
+    isBasicMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isKappaMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isCatMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isDogMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isSubscriberMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    spinSeed BIGINT,
+    spinCounter INTEGER
 );
-CREATE INDEX slot_attempts_broadcaster ON slot_attempts (broadcaster);
+CREATE INDEX slot_attempts_broadcaster_user
+    ON slot_attempts (broadcaster, variant, twitchUser, attemptTime);
+CREATE INDEX slot_attempts_broadcaster_time
+    ON slot_attempts (broadcaster, attemptTime);
 
-CREATE TABLE ffz_slot_winners (
-    id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+CREATE VIEW twitch_slot_attempts AS
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+            emoticonId3, isBasicMatch, isKappaMatch, isCatMatch, isDogMatch,
+            isSubscriberMatch
+        FROM slot_attempts WHERE variant='twitch';
+
+CREATE VIEW twitch_slot_winners AS
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            winningEmoteId
+        FROM slot_winners WHERE variant='twitch';
+
+CREATE VIEW ffz_slot_attempts AS
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+            emoticonId3
+        FROM slot_attempts WHERE variant='ffz';
+
+CREATE VIEW ffz_slot_winners AS
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            winningEmoteId
+        FROM slot_winners WHERE variant='ffz';
+
+CREATE VIEW bttv_slot_attempts AS
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+            emoticonId3
+        FROM slot_attempts WHERE variant='bttv';
+
+CREATE VIEW bttv_slot_winners AS
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            winningEmoteId
+        FROM slot_winners WHERE variant='bttv';
+
+CREATE TABLE slot_stats (
     broadcaster VARCHAR NOT NULL,
-    winningTime TIMESTAMP NOT NULL,
-    winner VARCHAR NOT NULL,
-    winningEmote VARCHAR NOT NULL,
-    winningEmoteId INTEGER NOT NULL
+    variant VARCHAR NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    attempts INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    basicMatches INTEGER NOT NULL DEFAULT 0,
+    kappaMatches INTEGER NOT NULL DEFAULT 0,
+    catMatches INTEGER NOT NULL DEFAULT 0,
+    dogMatches INTEGER NOT NULL DEFAULT 0,
+    subscriberMatches INTEGER NOT NULL DEFAULT 0,
+    lastWin TIMESTAMP,
+    PRIMARY KEY (broadcaster, variant, twitchUser)
 );
-CREATE INDEX ffz_slot_winners_broadcaster ON ffz_slot_winners (broadcaster);
+CREATE INDEX slot_stats_wins ON slot_stats (broadcaster, variant, wins);
 
-CREATE TABLE ffz_slot_attempts (
-    id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+CREATE TABLE slot_attempts_archive (
+    id INTEGER NOT NULL PRIMARY KEY,
+    variant VARCHAR NOT NULL,
     broadcaster VARCHAR NOT NULL,
     attemptTime TIMESTAMP NOT NULL,
     twitchUser VARCHAR NOT NULL,
@@ -56,34 +105,37 @@ CREATE TABLE ffz_slot_attempts (
     emoticon1 VARCHAR NOT NULL,
     emoticon2 VARCHAR NOT NULL,
     emoticon3 VARCHAR NOT NULL,
-    emoticonId1 INTEGER NOT NULL,
-    emoticonId2 INTEGER NOT NULL,
-    emoticonId3 INTEGER NOT NULL
+    emoticonId1 VARCHAR NOT NULL,
+    emoticonId2 VARCHAR NOT NULL,
+    emoticonId3 VARCHAR NOT NULL,
+    isBasicMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isKappaMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isCatMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isDogMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isSubscriberMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    spinSeed BIGINT,
+    spinCounter INTEGER
 );
-CREATE INDEX ffz_slot_attempts_broadcaster ON ffz_slot_attempts (broadcaster);
+CREATE INDEX slot_attempts_archive_time
+    ON slot_attempts_archive (attemptTime);
 
-CREATE TABLE bttv_slot_winners (
-    id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+CREATE TABLE slot_attempts_daily (
     broadcaster VARCHAR NOT NULL,
-    winningTime TIMESTAMP NOT NULL,
-    winner VARCHAR NOT NULL,
-    winningEmote VARCHAR NOT NULL,
-    winningEmoteId VARCHAR NOT NULL
+    variant VARCHAR NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    day DATE NOT NULL,
+    attempts INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    PRIMARY KEY (broadcaster, variant, twitchUser, day)
 );
-CREATE INDEX bttv_slot_winners_broadcaster ON bttv_slot_winners (broadcaster);
 
-CREATE TABLE bttv_slot_attempts (
-    id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
-    broadcaster VARCHAR NOT NULL,
-    attemptTime TIMESTAMP NOT NULL,
-    twitchUser VARCHAR NOT NULL,
-    numMatching INTEGER NOT NULL,
-    isWin BOOLEAN NOT NULL,
-    emoticon1 VARCHAR NOT NULL,
-    emoticon2 VARCHAR NOT NULL,
-    emoticon3 VARCHAR NOT NULL,
-    emoticonId1 VARCHAR NOT NULL,
-    emoticonId2 VARCHAR NOT NULL,
-    emoticonId3 VARCHAR NOT NULL
+CREATE TABLE slots_migrations (
+    version INTEGER NOT NULL PRIMARY KEY,
+    applied TIMESTAMP NOT NULL
 );
-CREATE INDEX bttv_slot_attempts_broadcaster ON bttv_slot_attempts (broadcaster);
+INSERT INTO slots_migrations (version, applied) VALUES (1, CURRENT_TIMESTAMP);
+INSERT INTO slots_migrations (version, applied) VALUES (2, CURRENT_TIMESTAMP);
+INSERT INTO slots_migrations (version, applied) VALUES (3, CURRENT_TIMESTAMP);
+INSERT INTO slots_migrations (version, applied) VALUES (4, CURRENT_TIMESTAMP);
+INSERT INTO slots_migrations (version, applied) VALUES (5, CURRENT_TIMESTAMP);
+INSERT INTO slots_migrations (version, applied) VALUES (6, CURRENT_TIMESTAMP);
@@ -0,0 +1,86 @@
+import itertools
+from collections import deque
+from datetime import datetime
+from typing import Deque, Iterable, List, Tuple  # noqa: F401
+
+# (minimum number of intervals, standard deviation below which it is a bot,
+#  only the most recent intervals)
+thresholds: List[Tuple[int, float, bool]] = [
+    (5, 1, False),  # < 2 seconds of variations
+    (5, 1, True),  # < 2 seconds of variations on the last 5
+    (10, 3.5, False),  # < 10 seconds
+    (15, 10, False),  # < 30 seconds
+    ]
+recentIntervals: int = 5
+
+
+def below_stdev(count: int, total: int, squares: int, limit: float) -> bool:
+    """
+    statistics.stdev(s) < limit for whole second intervals, without rounding
+
+    stdev < limit <=> n * sum(x^2) - sum(x)^2 < limit^2 * n * (n - 1)
+    """
+    return (count * squares - total * total
+            < limit * limit * count * (count - 1))
+
+
+class BotDetector:
+    """
+    The attempts of a user within the bot detection window with running
+    interval sums, so each attempt is checked in constant time
+    """
+    __slots__ = ('times', 'intervals', 'total', 'squares')
+
+    def __init__(self, times: Iterable[datetime] = ()) -> None:
+        self.times: Deque[datetime] = deque()
+        self.intervals: Deque[int] = deque()
+        self.total: int = 0
+        self.squares: int = 0
+        timestamp: datetime
+        for timestamp in times:
+            self.add(timestamp)
+
+    def __getstate__(self) -> List[datetime]:
+        return list(self.times)
+
+    def __setstate__(self, times: List[datetime]) -> None:
+        self.__init__(times)  # type: ignore
+
+    def add(self, timestamp: datetime) -> None:
+        if self.times:
+            interval: int = int((timestamp - self.times[-1]).total_seconds())
+            self.intervals.append(interval)
+            self.total += interval
+            self.squares += interval * interval
+        self.times.append(timestamp)
+
+    def expire(self, before: datetime) -> None:
+        while self.times and self.times[0] < before:
+            self.times.popleft()
+            if self.intervals:
+                interval: int = self.intervals.popleft()
+                self.total -= interval
+                self.squares -= interval * interval
+
+    def is_bot(self, since: datetime) -> bool:
+        """
+        Whether the attempts from since onwards look like a bot, the older
+        attempts are dropped
+        """
+        self.expire(since)
+        count: int = len(self.intervals)
+        recent: List[int] = list(itertools.islice(
+            self.intervals, max(count - recentIntervals, 0), None))
+        minimum: int
+        limit: float
+        onlyRecent: bool
+        for minimum, limit, onlyRecent in thresholds:
+            if count < minimum:
+                continue
+            if onlyRecent:
+                if below_stdev(len(recent), sum(recent),
+                               sum(i * i for i in recent), limit):
+                    return True
+            elif below_stdev(count, self.total, self.squares, limit):
+                return True
+        return False
@@ -1,8 +1,20 @@
 ﻿from bot.coroutine import connection as connectionM  # noqa: F401
 from datetime import datetime
+from typing import List  # noqa: F401
+
+from . import shard, warmer
 
 
 def parseMessage(connection: 'connectionM.ConnectionHandler',
                  ircmsg: str,
                  now: datetime) -> None:
-    pass
+    # Twitch sends the ROOMSTATE of a channel when the bot joins it
+    if ' ROOMSTATE #' not in ircmsg:
+        return
+    parts: List[str] = ircmsg.split()
+    if parts and parts[0].startswith('@'):
+        del parts[0]
+    if (len(parts) >= 3 and parts[1] == 'ROOMSTATE'
+            and parts[2].startswith('#')):
+        warmer.join(parts[2][1:])
+        shard.start()
@@ -1,8 +1,9 @@
-﻿from typing import Iterable, Mapping, Optional
+﻿from typing import Dict, Iterable, Mapping, Optional
 
 from lib.data import ChatCommand
 
-from .. import channel
+from .. import channel, library  # noqa: F401
+from ..variant import SlotVariant, variants
 
 
 def filterMessage() -> Iterable[ChatCommand]:
@@ -11,15 +12,16 @@ def filterMessage() -> Iterable[ChatCommand]:
 
 def commands() -> Mapping[str, Optional[ChatCommand]]:
     if not hasattr(commands, 'commands'):
-        setattr(commands, 'commands', {
-            '!slots': channel.commandSlots,
-            '!slotswinners': channel.commandSlotWinners,
-            '!ffzslots': channel.commandFfzSlots,
-            '!ffzslotswinners': channel.commandFfzSlotWinners,
-            '!bttvslots': channel.commandBttvSlots,
-            '!bttvslotswinners': channel.commandBttvSlotWinners,
-            }
-        )
+        slotCommands: Dict[str, Optional[ChatCommand]] = {}
+        slotVariant: SlotVariant
+        for slotVariant in variants.values():
+            slotCommands[slotVariant.command] = (
+                channel.slotsCommand(slotVariant))
+            slotCommands[slotVariant.winnersCommand] = (
+                channel.slotWinnersCommand(slotVariant))
+        slotCommands['!slotsstats'] = channel.commandSlotsStats
+        slotCommands['!slotstop'] = channel.commandSlotsTop
+        setattr(commands, 'commands', slotCommands)
     return getattr(commands, 'commands')
 
 
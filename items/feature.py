@@ -1,11 +1,14 @@
-﻿from typing import Mapping, Optional
+﻿from typing import Dict, Mapping, Optional
+
+from .. import library  # noqa: F401
+from ..variant import variants
 
 
 def features() -> Mapping[str, Optional[str]]:
     if not hasattr(features, 'features'):
-        setattr(features, 'features', {
-            'slots': 'Emoticon Slots',
-            'ffzslots': 'FrankerFaceZ Emoticon Slots',
-            'bttvslots': 'Better Twitch.TV Emoticon Slots',
-            })
+        featureNames: Dict[str, Optional[str]] = {
+            v.feature: v.featureName for v in variants.values()
+            }
+        featureNames['slotsdigest'] = 'Emoticon Slots Digest Output'
+        setattr(features, 'features', featureNames)
     return getattr(features, 'features')
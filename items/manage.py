@@ -2,6 +2,14 @@
 
 from lib.data import ManageBotCommand
 
+from .. import manage
+
 
 def methods() -> Mapping[str, Optional[ManageBotCommand]]:
-    return {}
+    return {
+        'slotstiming': manage.manageSlotsTiming,
+        'slotsodds': manage.manageSlotsOdds,
+        'slotsqueue': manage.manageSlotsQueue,
+        'slotsreplay': manage.manageSlotsReplay,
+        'slotsseed': manage.manageSlotsSeed,
+        }
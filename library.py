@@ -1,14 +1,17 @@
 import asyncio
 import random
-import statistics
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set, Tuple  # noqa: F401
+from typing import Any, Dict, List, NamedTuple, Optional, Set  # noqa: F401
+from typing import Tuple  # noqa: F401
 
-import aioodbc.cursor  # noqa: F401
-
-from bot import data, utils  # noqa: F401
+from bot import data  # noqa: F401
 from lib.cache import CacheStore
 from lib.database import DatabaseMain
+from . import marks, notifier, pool, recorder, retention, scoring, shared
+from . import state, variant
+from .detector import BotDetector
+from .repository import PreSpinState, SlotStats, SlotsRepository
+from .variant import SlotVariant
 
 
 basicEmotes: Set[str] = {
@@ -24,277 +27,256 @@ dogEmotes: Set[str] = {'FrankerZ', 'RalpherZ', 'CorgiDerp', 'OhMyDog'}
 channelCooldown: timedelta = timedelta(seconds=3)
 attemptCooldown: timedelta = timedelta(seconds=120)
 botCooldown: timedelta = timedelta(minutes=20)
-unbotCooldown: timedelta = timedelta(hours=1)
+unbotCooldown: timedelta = marks.markDuration
 logBotAttempts: timedelta = timedelta(hours=2)
 
 
-async def isSlotBots(
-        database: DatabaseMain,
+async def markBot(
+        slotsRepository: SlotsRepository,
         broadcaster: str,
         user: str,
         timestamp: datetime) -> bool:
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str = '''
-SELECT 1 FROM slot_bots WHERE broadcaster=? AND bot=? AND marked>=?
-'''
-        await cursor.execute(query, (broadcaster, user, timestamp))
-        return bool(await cursor.fetchone())
+    marked: bool = await slotsRepository.markSlotBots(broadcaster, user,
+                                                      timestamp)
+    marks.get().mark(broadcaster, user, timestamp)
+    return marked
 
 
-async def markSlotBots(
-        database: DatabaseMain,
+async def getPreSpinState(
+        slotsRepository: SlotsRepository,
         broadcaster: str,
+        slotVariant: SlotVariant,
         user: str,
-        timestamp: datetime) -> bool:
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str
-        params: Tuple[Any, ...]
-        if database.isSqlite:
-            query = '''
-REPLACE INTO slot_bots (broadcaster, bot, marked) VALUES (?, ?, ?)
-'''
-            params = broadcaster, user, timestamp
-        else:
-            query = '''
-INSERT INTO slot_bots (broadcaster, bot, marked) VALUES (?, ?, ?)
-    ON CONFLICT ON CONSTRAINT slot_bots_pkey
-    DO UPDATE SET marked=?
-        '''
-            params = broadcaster, user, timestamp, timestamp, timestamp
-        await cursor.execute(query, params)
-        return cursor.rowcount != 0
-
-
-async def getLastSlots(database: DatabaseMain, broadcaster: str) -> datetime:
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str
-        if database.isSqlite:
-            query = '''
-SELECT MAX(attemptTime) AS "[timestamp]"
-    FROM (
-        SELECT MAX(attemptTime) AS attemptTime
-            FROM slot_attempts
-            WHERE broadcaster=?
-        UNION
-        SELECT MAX(attemptTime) FROM ffz_slot_attempts WHERE broadcaster=?
-        UNION
-        SELECT MAX(attemptTime) FROM bttv_slot_attempts WHERE broadcaster=?)
-'''
-        else:
-            query = '''
-SELECT MAX(attemptTime)
-    FROM (
-        SELECT MAX(attemptTime) AS attemptTime
-            FROM slot_attempts
-            WHERE broadcaster=?
-        UNION
-        SELECT MAX(attemptTime) FROM ffz_slot_attempts WHERE broadcaster=?
-        UNION
-        SELECT MAX(attemptTime) FROM bttv_slot_attempts WHERE broadcaster=?
-        ) AS a
-'''
-        await cursor.execute(query, (broadcaster,) * 3)
-        return (await cursor.fetchone() or [None])[0] or datetime.min
+        timestamp: datetime,
+        withAttempts: bool = True,
+        withMark: bool = True) -> PreSpinState:
+    """
+    Fetch everything the cooldown and bot checks need in one query
 
+    Attempts older than logBotAttempts do not affect any check, bounding the
+    attempt lookups to it keeps them in the current partition.
+    """
+    return await slotsRepository.preSpinState(
+        broadcaster, slotVariant, user, timestamp - logBotAttempts,
+        timestamp - unbotCooldown, withAttempts, withMark)
 
-async def in_cooldown(
-        database: DatabaseMain,
-        channel: str,
-        nick: str,
-        timestamp: datetime,
-        lastAttempt: datetime,
-        isBot: bool) -> bool:
-    since: timedelta = timestamp - await getLastSlots(database, channel)
-    cooldownLeft: float
-    if since < channelCooldown:
-        cooldownLeft = round((channelCooldown - since).total_seconds(), 1)
-        utils.whisper(nick, f'Channel cooldown ({cooldownLeft:.1f} seconds)')
-        return True
 
+async def loadPreSpinState(
+        slotsRepository: SlotsRepository,
+        chat: 'data.Channel',
+        slotVariant: SlotVariant,
+        user: str,
+        timestamp: datetime) -> PreSpinState:
+    """
+    getPreSpinState merged with, and cached into, the channel SlotsState
+
+    The cached times win when they are newer since attempts still queued in
+    the recorder are not in the database yet. The recent attempts are only
+    fetched to seed the user's BotDetector. The bot mark comes from the
+    marks loaded into BotMarks, the only in-process copy of them.
+    """
+    slotsState: state.SlotsState = state.get(chat)
+    botMarks: marks.BotMarks = marks.get()
+    await botMarks.load(slotsRepository, timestamp)
+    name: str = slotVariant.name
+    withAttempts: bool = (name, user) not in slotsState.detectors
+    preSpin: PreSpinState = await getPreSpinState(
+        slotsRepository, chat.channel, slotVariant, user, timestamp,
+        withAttempts, withMark=False)
+    if withAttempts:
+        slotsState.detectors[name, user] = BotDetector(preSpin.attempts)
+    lastSlots: datetime = max(preSpin.lastSlots,
+                              slotsState.lastSlots or datetime.min)
+    lastAttempt: datetime = max(
+        preSpin.lastAttempt,
+        slotsState.lastAttempts.get((name, user), datetime.min))
+    store: Optional[shared.SharedStore] = shared.get()
+    if store is not None:
+        # Spins of the channel in the process that owned it before
+        lastAttempt = max(lastAttempt, await store.lastAttempt(
+            chat.channel, name, user))
+        botMarks.mark(chat.channel, user,
+                      await store.botMarked(chat.channel, user))
+    marked: datetime = botMarks.marked(chat.channel, user)
+    slotsState.lastSlots = lastSlots
+    slotsState.lastAttempts[name, user] = lastAttempt
+    return PreSpinState(marked >= timestamp - unbotCooldown, marked,
+                        lastAttempt, lastSlots, preSpin.attempts)
+
+
+def in_cached_cooldown(chat: 'data.Channel',
+                       variant: str,
+                       nick: str,
+                       timestamp: datetime) -> bool:
+    """
+    Check the user cooldown against the cached SlotsState without any query
+
+    A cached attempt means loadPreSpinState already merged the user's mark
+    into BotMarks, where a missing mark means not a bot.
+    """
+    slotsState: state.SlotsState = state.get(chat)
+    botMarks: marks.BotMarks = marks.get()
+    if (variant, nick) not in slotsState.lastAttempts or not botMarks.loaded:
+        return False
+    isBot: bool = (botMarks.marked(chat.channel, nick)
+                   >= timestamp - unbotCooldown)
+    return in_cooldown(chat.channel, nick, timestamp,
+                       slotsState.lastAttempts[variant, nick], isBot)
+
+
+def recordState(chat: 'data.Channel',
+                variant: str,
+                user: str,
+                timestamp: datetime) -> None:
+    slotsState: state.SlotsState = state.get(chat)
+    slotsState.record(variant, user, timestamp)
+    if timestamp - slotsState.pruned >= unbotCooldown:
+        slotsState.prune(timestamp - unbotCooldown)
+
+
+def channel_cooldown_left(timestamp: datetime,
+                          lastSlots: Optional[datetime]) -> timedelta:
+    if lastSlots is None:
+        return timedelta()
+    return max(lastSlots + channelCooldown - timestamp, timedelta())
+
+
+async def claim_channel(channel: str, timestamp: datetime) -> datetime:
+    """
+    Wait until no process spun in the channel within channelCooldown and
+    take it, returns the time of the spin
+    """
+    store: Optional[shared.SharedStore] = shared.get()
+    if store is None:
+        return timestamp
+    while True:
+        lastSlots: Optional[datetime] = await store.claim(
+            channel, timestamp, channelCooldown)
+        if lastSlots is None:
+            return timestamp
+        delay: timedelta = channel_cooldown_left(timestamp, lastSlots)
+        await asyncio.sleep(delay.total_seconds())
+        timestamp += delay
+
+
+def in_cooldown(channel: str,
+                nick: str,
+                timestamp: datetime,
+                lastAttempt: datetime,
+                isBot: bool) -> bool:
     cooldown: timedelta = attemptCooldown if not isBot else botCooldown
-    since = timestamp - lastAttempt
+    since: timedelta = timestamp - lastAttempt
     if since < cooldown:
+        cooldownLeft: float
         if not isBot:
             cooldownLeft = round((cooldown - since).total_seconds(), 1)
-            utils.whisper(nick, f'Slots Cooldown ({cooldownLeft:.1f} seconds)')
+            notifier.whisper(channel, nick, 'cooldown',
+                             f'Slots Cooldown ({cooldownLeft:.1f} seconds)',
+                             timestamp, cooldown - since)
         return True
     return False
 
 
 async def process_bot(
-        database: DatabaseMain,
-        channel: str,
+        slotsRepository: SlotsRepository,
+        chat: 'data.Channel',
+        variant: str,
         nick: str,
         timestamp: datetime,
         lastAttempt: datetime,
-        isBot: bool,
-        attempts: List[datetime]) -> Optional[bool]:
+        isBot: bool) -> Optional[bool]:
     """
     Returns True if marked as bot, return False if unmarked, None otherwise
     """
-    toMark: bool = False
     if timestamp - lastAttempt >= unbotCooldown:
         return False if isBot else None
-    else:
-        s: List[int] = []
-        for i in range(1, len(attempts)):
-            s.append(int((attempts[i] - attempts[i - 1]).total_seconds()))
-        # < 2 seconds of variations
-        if len(s) >= 5 and statistics.stdev(s) < 1:
-            toMark = True
-        # < 2 seconds of variations on the last 5
-        if len(s) >= 5 and statistics.stdev(s[-5:]) < 1:
-            toMark = True
-        # < 10 seconds
-        if len(s) >= 10 and statistics.stdev(s) < 3.5:
-            toMark = True
-        # < 30 seconds
-        if len(s) >= 15 and statistics.stdev(s) < 10:
-            toMark = True
+    botDetector: BotDetector = state.get(chat).detectors[variant, nick]
+    toMark: bool = botDetector.is_bot(timestamp - logBotAttempts)
     if toMark and not isBot:
-        await markSlotBots(database, channel, nick, timestamp)
+        await markBot(slotsRepository, chat.channel, nick, timestamp)
+        store: Optional[shared.SharedStore] = shared.get()
+        if store is not None:
+            await store.mark(chat.channel, nick, timestamp)
     return True if toMark else None
 
 
-async def generate_twitch_pool(dataCache: CacheStore
-                               ) -> Optional[Dict[int, str]]:
+def is_kappa(name: str) -> bool:
+    return (name in extraKappaEmotes
+            or 'kappa' in name.lower()
+            or 'klappa' in name.lower())
+
+
+def poolBroadcaster(variantName: str, chat: 'data.Channel') -> Optional[str]:
+    """
+    The broadcaster the pool of the variant is stored under in the channel
+    """
+    # The Twitch pool is only per channel when the channel has categories
+    if (variantName == 'twitch'
+            and chat.channel not in scoring.channelCategories):
+        return None
+    return chat.channel
+
+
+async def load_twitch_pool(chat: 'data.Channel',
+                           dataCache: CacheStore
+                           ) -> Optional[pool.EmotePool]:
     emoteSets: Optional[Set[int]] = await dataCache.twitch_get_bot_emote_set()
     if emoteSets is None:
         return None
     if not await dataCache.twitch_load_emotes(emoteSets):
         return None
     emotes: Dict[int, str] = await dataCache.twitch_get_emotes()
-    if len(emotes) < 8:
+    emoteIdSets: Optional[Dict[int, int]]
+    emoteIdSets = await dataCache.twitch_get_emote_sets()
+    # Keep Kappa last so it can be left out of the draw
+    if 25 in emotes:
+        kappa: str = emotes.pop(25)
+        emotes[25] = kappa
+    return pool.store('twitch', poolBroadcaster('twitch', chat), emotes,
+                      datetime.utcnow(), emoteIdSets)
+
+
+async def generate_twitch_pool(chat: 'data.Channel',
+                               dataCache: CacheStore,
+                               rng: random.Random
+                               ) -> Optional[pool.Sample[int]]:
+    emotePool: Optional[pool.EmotePool]
+    emotePool = pool.get('twitch', poolBroadcaster('twitch', chat),
+                         datetime.utcnow())
+    if emotePool is None:
+        emotePool = await load_twitch_pool(chat, dataCache)
+    if emotePool is None or len(emotePool) < 8:
         return None
-    if len(emotes) > 16:
-        if 25 in emotes:
-            del emotes[25]
-        emotes = dict(random.sample(emotes.items(), 15))
-        emotes[25] = 'Kappa'
+    if len(emotePool) <= 16:
+        return emotePool.sample(16, rng)
+    count: int = len(emotePool)
+    if emotePool.ids[-1] == 25:
+        count -= 1
+    emotes: pool.Sample[int] = emotePool.sample(15, rng, count)
+    emotePool.put(emotes, 25, 'Kappa')
     return emotes
 
 
-async def getLastTwitchSlotsUser(
-        database: DatabaseMain,
-        broadcaster: str,
-        user: str) -> datetime:
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str
-        if database.isSqlite:
-            query = '''
-SELECT MAX(attemptTime) AS "[timestamp]"
-    FROM slot_attempts
-    WHERE broadcaster=? AND twitchUser=?
-'''
-        else:
-            query = '''
-SELECT MAX(attemptTime)
-    FROM slot_attempts
-    WHERE broadcaster=? AND twitchUser=?
-'''
-        await cursor.execute(query, (broadcaster, user))
-        return (await cursor.fetchone() or [None])[0] or datetime.min
-
-
-async def getLastTwitchSlotsAttempts(
-        database: DatabaseMain,
-        broadcaster: str,
-        user: str,
-        timestamp: datetime) -> List[datetime]:
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str = '''
-SELECT attemptTime
-    FROM slot_attempts
-    WHERE broadcaster=? AND twitchUser=? AND attemptTime>=?
-    ORDER BY attemptTime ASC
-'''
-        return [attempt async for attempt,
-                in await cursor.execute(query, (broadcaster, user, timestamp))]
-
-
-async def recordTwitchSlots(
-        database: DatabaseMain,
-        dataCache: CacheStore,
-        channel: str,
-        nick: str,
-        emotes: Dict[int, str],
-        selectedIds: List[int]) -> None:
-    emoteSets: Dict[int, int]
-    maybeSets: Optional[Dict[int, int]]
-    maybeSets = await dataCache.twitch_get_emote_sets()
-    if maybeSets is not None:
-        emoteSets = maybeSets
-    else:
-        emoteSets = {i: i for i in selectedIds}
-    matchEmoteId: int = selectedIds[0]
-    matchEmoteSetId: int = emoteSets[matchEmoteId]
-    numMatching: int = 0
-    numBasic: int = 0
-    numKappa: int = 0
-    numCat: int = 0
-    numDog: int = 0
-    numSub: int = 0
-    emoteId: int
-    for emoteId in selectedIds:
-        if emoteId == matchEmoteId:
-            numMatching += 1
-        if emotes[emoteId] in basicEmotes:
-            numBasic += 1
-        if (emotes[emoteId] in extraKappaEmotes
-                or 'kappa' in emotes[emoteId].lower()
-                or 'klappa' in emotes[emoteId].lower()):
-            numKappa += 1
-        if emotes[emoteId] in catEmotes:
-            numCat += 1
-        if emotes[emoteId] in dogEmotes:
-            numDog += 1
-        if emoteSets[emoteId] == matchEmoteSetId:
-            numSub += 1
-    allMatching: bool = numMatching == 3
-    allBasic: bool = numBasic == 3
-    allKappa: bool = numKappa == 3
-    allCat: bool = numCat == 3
-    allDog: bool = numDog == 3
-    allSub: bool = numSub == 3 and matchEmoteSetId != 0
-
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str
-        params: Tuple[Any, ...]
-        query = '''
-INSERT INTO slot_attempts
-        (broadcaster, attemptTime, twitchUser, numMatching, isWin, emoticon1,
-        emoticon2, emoticon3, emoticonId1, emoticonId2, emoticonId3,
-        isBasicMatch, isKappaMatch, isCatMatch, isDogMatch, isSubscriberMatch)
-    VALUES (?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-'''
-        params = (channel, nick, numMatching, allMatching,
-                  emotes[selectedIds[0]], emotes[selectedIds[1]],
-                  emotes[selectedIds[2]],
-                  selectedIds[0], selectedIds[1], selectedIds[2],
-                  allBasic, allKappa, allCat, allDog, allSub,)
-        await cursor.execute(query, params)
-
-        if allMatching:
-            query = '''
-INSERT INTO slot_winners
-        (broadcaster, winningTime, winner, winningEmote, winningEmoteId)
-    VALUES (?, CURRENT_TIMESTAMP, ?, ?, ?)
-'''
-            params = channel, nick, emotes[selectedIds[0]], selectedIds[0],
-            await cursor.execute(query, params)
-
-        await database.commit()
-
-
-async def generate_ffz_pool(chat: 'data.Channel',
-                            dataCache: CacheStore
-                            ) -> Optional[Dict[int, str]]:
+async def score_twitch(dataCache: CacheStore,
+                       emotes: pool.Sample[int],
+                       selectedIds: List[int]) -> Dict[str, bool]:
+    matches: int = emotes.matches(selectedIds)
+    scores: Dict[str, bool] = {}
+    bit: int
+    category: scoring.Category
+    for bit, category in enumerate(emotes.categories):
+        if category.column is not None:
+            scores[category.column] = bool(matches & (1 << bit))
+    matchEmoteSetId: Any = emotes.groups[selectedIds[0]]
+    scores['isSubscriberMatch'] = (
+        matchEmoteSetId != 0
+        and all(emotes.groups[i] == matchEmoteSetId for i in selectedIds))
+    return scores
+
+
+async def load_ffz_pool(chat: 'data.Channel',
+                        dataCache: CacheStore
+                        ) -> Optional[pool.EmotePool]:
     async def getGlobal() -> Optional[Dict[int, str]]:
         if not await dataCache.ffz_load_global_emotes():
             return None
@@ -312,95 +294,26 @@ async def generate_ffz_pool(chat: 'data.Channel',
     )
     if globalEmotes is None or chanEmotes is None:
         return None
-    emotes: Dict[int, str]
-    emotes = dict(list(globalEmotes.items()) + list(chanEmotes.items()))
-    if len(emotes) > 16:
-        emotes = dict(random.sample(emotes.items(), 16))
-    return emotes
-
-
-async def getLastFfzSlotsUser(
-        database: DatabaseMain,
-        broadcaster: str,
-        user: str) -> datetime:
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str
-        if database.isSqlite:
-            query = '''
-SELECT MAX(attemptTime) AS "[timestamp]"
-    FROM ffz_slot_attempts
-    WHERE broadcaster=? AND twitchUser=?
-'''
-        else:
-            query = '''
-SELECT MAX(attemptTime)
-    FROM ffz_slot_attempts
-    WHERE broadcaster=? AND twitchUser=?
-'''
-        await cursor.execute(query, (broadcaster, user))
-        return (await cursor.fetchone() or [None])[0] or datetime.min
-
+    return pool.store('ffz', chat.channel, {**globalEmotes, **chanEmotes},
+                      datetime.utcnow())
 
-async def getLastFfzSlotsAttempts(
-        database: DatabaseMain,
-        broadcaster: str,
-        user: str,
-        timestamp: datetime) -> List[datetime]:
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str = '''
-SELECT attemptTime
-    FROM ffz_slot_attempts
-    WHERE broadcaster=? AND twitchUser=? AND attemptTime>=?
-    ORDER BY attemptTime ASC
-'''
-        return [attempt async for attempt,
-                in await cursor.execute(query, (broadcaster, user, timestamp))]
 
-
-async def recordFfzSlots(
-        database: DatabaseMain,
-        channel: str,
-        nick: str,
-        emotes: Dict[int, str],
-        selectedIds: List[int]) -> None:
-    numMatching: int = 0
-    emoteId: int
-    for emoteId in selectedIds:
-        if emoteId == selectedIds[0]:
-            numMatching += 1
-    allMatching: bool = numMatching == 3
-
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str
-        params: Tuple[Any, ...]
-        query = '''
-INSERT INTO ffz_slot_attempts
-        (broadcaster, attemptTime, twitchUser, numMatching, isWin, emoticon1,
-        emoticon2, emoticon3, emoticonId1, emoticonId2, emoticonId3)
-    VALUES (?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''
-        params = (channel, nick, numMatching, allMatching,
-                  emotes[selectedIds[0]], emotes[selectedIds[1]],
-                  emotes[selectedIds[2]], selectedIds[0], selectedIds[1],
-                  selectedIds[2],)
-        await cursor.execute(query, params)
-
-        if allMatching:
-            query = '''
-INSERT INTO ffz_slot_winners
-    (broadcaster, winningTime, winner, winningEmote, winningEmoteId)
-    VALUES (?, CURRENT_TIMESTAMP, ?, ?, ?)'''
-            params = channel, nick, emotes[selectedIds[0]], selectedIds[0],
-            await cursor.execute(query, params)
-
-        await database.commit()
+async def generate_ffz_pool(chat: 'data.Channel',
+                            dataCache: CacheStore,
+                            rng: random.Random
+                            ) -> Optional[pool.Sample[int]]:
+    emotePool: Optional[pool.EmotePool]
+    emotePool = pool.get('ffz', chat.channel, datetime.utcnow())
+    if emotePool is None:
+        emotePool = await load_ffz_pool(chat, dataCache)
+    if emotePool is None:
+        return None
+    return emotePool.sample(16, rng)
 
 
-async def generate_bttv_pool(chat: 'data.Channel',
-                             dataCache: CacheStore
-                             ) -> Optional[Dict[str, str]]:
+async def load_bttv_pool(chat: 'data.Channel',
+                         dataCache: CacheStore
+                         ) -> Optional[pool.EmotePool]:
     async def getGlobal() -> Optional[Dict[str, str]]:
         if not await dataCache.bttv_load_global_emotes():
             return None
@@ -418,87 +331,186 @@ async def generate_bttv_pool(chat: 'data.Channel',
     )
     if globalEmotes is None or chanEmotes is None:
         return None
-    emotes: Dict[str, str]
-    emotes = dict(list(globalEmotes.items()) + list(chanEmotes.items()))
-    if len(emotes) > 16:
-        emotes = dict(random.sample(emotes.items(), 16))
-    return emotes
+    return pool.store('bttv', chat.channel, {**globalEmotes, **chanEmotes},
+                      datetime.utcnow())
 
 
-async def getLastBttvSlotsUser(
-        database: DatabaseMain,
-        broadcaster: str,
-        user: str) -> datetime:
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str
-        if database.isSqlite:
-            query = '''
-SELECT MAX(attemptTime) AS "[timestamp]"
-    FROM bttv_slot_attempts
-    WHERE broadcaster=? AND twitchUser=?
-'''
-        else:
-            query = '''
-SELECT MAX(attemptTime)
-    FROM bttv_slot_attempts
-    WHERE broadcaster=? AND twitchUser=?
-'''
-        await cursor.execute(query, (broadcaster, user))
-        return (await cursor.fetchone() or [None])[0] or datetime.min
-
-
-async def getLastBttvSlotsAttempts(
-        database: DatabaseMain,
-        broadcaster: str,
-        user: str,
-        timestamp: datetime) -> List[datetime]:
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str = '''
-SELECT attemptTime
-    FROM bttv_slot_attempts
-    WHERE broadcaster=? AND twitchUser=? AND attemptTime>=?
-    ORDER BY attemptTime ASC
-'''
-        return [attempt async for attempt,
-                in await cursor.execute(query, (broadcaster, user, timestamp))]
+async def generate_bttv_pool(chat: 'data.Channel',
+                             dataCache: CacheStore,
+                             rng: random.Random
+                             ) -> Optional[pool.Sample[str]]:
+    emotePool: Optional[pool.EmotePool]
+    emotePool = pool.get('bttv', chat.channel, datetime.utcnow())
+    if emotePool is None:
+        emotePool = await load_bttv_pool(chat, dataCache)
+    if emotePool is None:
+        return None
+    return emotePool.sample(16, rng)
 
 
-async def recordBttvSlots(
-        database: DatabaseMain,
-        channel: str,
+async def recordSlots(
+        slotVariant: SlotVariant,
+        dataCache: CacheStore,
+        chat: 'data.Channel',
         nick: str,
-        emotes: Dict[str, str],
-        selectedIds: List[str]) -> None:
+        emotes: Dict[Any, str],
+        selectedIds: List[Any],
+        timestamp: datetime,
+        spinSeed: Optional[int] = None,
+        spinCounter: Optional[int] = None) -> None:
     numMatching: int = 0
-    emoteId: str
+    emoteId: Any
     for emoteId in selectedIds:
         if emoteId == selectedIds[0]:
             numMatching += 1
     allMatching: bool = numMatching == 3
-
-    cursor: aioodbc.cursor.Cursor
-    async with await database.cursor() as cursor:
-        query: str
-        params: Tuple[Any, ...]
+    scores: Dict[str, bool] = {}
+    if slotVariant.scorer is not None:
+        scores = await slotVariant.scorer(dataCache, emotes, selectedIds)
+
+    columns: str = ''.join(f', {column}' for column in scores)
+    values: str = ', ?' * len(scores)
+    rows: List[recorder.Row] = []
+    query: str
+    params: Tuple[Any, ...]
+    query = f'''
+INSERT INTO slot_attempts
+    (variant, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+    emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+    emoticonId3, spinSeed, spinCounter{columns})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?{values})
+'''
+    params = (slotVariant.name, chat.channel, timestamp, nick, numMatching,
+              allMatching, emotes[selectedIds[0]], emotes[selectedIds[1]],
+              emotes[selectedIds[2]], str(selectedIds[0]),
+              str(selectedIds[1]), str(selectedIds[2]), spinSeed,
+              spinCounter,
+              ) + tuple(scores.values())
+    rows.append(recorder.row(query, params))
+
+    if allMatching:
         query = '''
-INSERT INTO bttv_slot_attempts
-        (broadcaster, attemptTime, twitchUser, numMatching, isWin, emoticon1,
-        emoticon2, emoticon3, emoticonId1, emoticonId2, emoticonId3)
-    VALUES (?, CURRENT_TIMESTAMP, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''
-        params = (channel, nick, numMatching, allMatching,
-                  emotes[selectedIds[0]], emotes[selectedIds[1]],
-                  emotes[selectedIds[2]], selectedIds[0], selectedIds[1],
-                  selectedIds[2],)
-        await cursor.execute(query, params)
-
-        if allMatching:
-            query = '''
-INSERT INTO bttv_slot_winners
-    (broadcaster, winningTime, winner, winningEmote, winningEmoteId)
-    VALUES (?, CURRENT_TIMESTAMP, ?, ?, ?)'''
-            params = channel, nick, emotes[selectedIds[0]], selectedIds[0],
-            await cursor.execute(query, params)
-
-        await database.commit()
+INSERT INTO slot_winners
+    (variant, broadcaster, winningTime, winner, winningEmote,
+    winningEmoteId)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+        params = (slotVariant.name, chat.channel, timestamp, nick,
+                  emotes[selectedIds[0]], str(selectedIds[0]),)
+        rows.append(recorder.row(query, params))
+
+    statsColumns: List[str] = [statsColumn(column) for column in scores]
+    columns = ''.join(f', {column}' for column in statsColumns)
+    updates: str = ''.join(f''',
+        {column}=slot_stats.{column} + excluded.{column}'''
+                           for column in statsColumns)
+    sums: str = ''.join(f''',
+        COALESCE(s.{column}, 0) + n.{column}''' for column in statsColumns)
+    aliases: str = ''.join(f', ? AS {column}' for column in statsColumns)
+    # SQLite only has ON CONFLICT DO UPDATE from 3.24, the REPLACE reads the
+    # old row in the same statement
+    sqliteQuery: str = f'''
+REPLACE INTO slot_stats
+    (broadcaster, variant, twitchUser, attempts, wins, lastWin{columns})
+    SELECT n.broadcaster, n.variant, n.twitchUser,
+        COALESCE(s.attempts, 0) + 1, COALESCE(s.wins, 0) + n.wins,
+        COALESCE(n.lastWin, s.lastWin){sums}
+    FROM (SELECT ? AS broadcaster, ? AS variant, ? AS twitchUser,
+            ? AS wins, ? AS lastWin{aliases}) AS n
+        LEFT JOIN slot_stats AS s
+            ON s.broadcaster=n.broadcaster AND s.variant=n.variant
+                AND s.twitchUser=n.twitchUser
+'''
+    query = f'''
+INSERT INTO slot_stats
+    (broadcaster, variant, twitchUser, attempts, wins, lastWin{columns})
+    VALUES (?, ?, ?, 1, ?, ?{values})
+    ON CONFLICT (broadcaster, variant, twitchUser)
+    DO UPDATE SET attempts=slot_stats.attempts + 1,
+        wins=slot_stats.wins + excluded.wins,
+        lastWin=COALESCE(excluded.lastWin, slot_stats.lastWin){updates}
+'''
+    params = ((chat.channel, slotVariant.name, nick, int(allMatching),
+               timestamp if allMatching else None,)
+              + tuple(int(score) for score in scores.values()))
+    rows.append(recorder.row(sqliteQuery, params, query))
+    await recorder.record(rows)
+
+    recordState(chat, slotVariant.name, nick, timestamp)
+    store: Optional[shared.SharedStore] = shared.get()
+    if store is not None:
+        await store.record(chat.channel, slotVariant.name, nick, timestamp)
+    retention.start()
+
+
+def statsColumn(column: str) -> str:
+    """
+    The slot_stats column counting an attempt column, isKappaMatch is
+    counted in kappaMatches
+    """
+    return column[2].lower() + column[3:] + 'es'
+
+
+async def getSlotStats(
+        database: DatabaseMain,
+        broadcaster: str,
+        user: str) -> Dict[str, SlotStats]:
+    slotsRepository: SlotsRepository
+    async with SlotsRepository(database) as slotsRepository:
+        return await slotsRepository.slotStats(broadcaster, user)
+
+
+async def getTopWinners(
+        database: DatabaseMain,
+        broadcaster: str,
+        slotVariant: SlotVariant,
+        limit: int = 5) -> List[Tuple[str, int]]:
+    slotsRepository: SlotsRepository
+    async with SlotsRepository(database) as slotsRepository:
+        return await slotsRepository.topWinners(broadcaster, slotVariant,
+                                                limit)
+
+
+scoring.register(scoring.Category(
+    'basic', basicEmotes.__contains__, 'isBasicMatch'))
+scoring.register(scoring.Category('kappa', is_kappa, 'isKappaMatch'))
+scoring.register(scoring.Category(
+    'cat', catEmotes.__contains__, 'isCatMatch'))
+scoring.register(scoring.Category(
+    'dog', dogEmotes.__contains__, 'isDogMatch'))
+
+variant.register(SlotVariant(
+    name='twitch',
+    feature='slots',
+    featureName='Emoticon Slots',
+    command='!slots',
+    winnersCommand='!slotswinners',
+    winnersName='Slots Winners',
+    winnersPath='twitch-slots',
+    generatePool=generate_twitch_pool,
+    loadPool=load_twitch_pool,
+    scorer=score_twitch,
+    timeoutEmote=25,
+    ))
+variant.register(SlotVariant(
+    name='ffz',
+    feature='ffzslots',
+    featureName='FrankerFaceZ Emoticon Slots',
+    command='!ffzslots',
+    winnersCommand='!ffzslotswinners',
+    winnersName='FFZ Slots Winners',
+    winnersPath='ffz-slots',
+    generatePool=generate_ffz_pool,
+    loadPool=load_ffz_pool,
+    ))
+variant.register(SlotVariant(
+    name='bttv',
+    feature='bttvslots',
+    featureName='Better Twitch.TV Emoticon Slots',
+    command='!bttvslots',
+    winnersCommand='!bttvslotswinners',
+    winnersName='Slot Winners',
+    winnersPath='bttv-slots',
+    generatePool=generate_bttv_pool,
+    loadPool=load_bttv_pool,
+    ))
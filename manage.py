@@ -0,0 +1,212 @@
+import asyncio
+from typing import Any, List, Optional, Tuple  # noqa: F401
+
+import bot.globals
+from bot import data  # noqa: F401
+from lib.data import ManageBotArgs
+from lib.database import DatabaseMain
+from . import notifier, output, pool, reels, scheduler, timing
+from .repository import AttemptSpin, SlotsRepository
+from .variant import SlotVariant, variants
+
+oddsSpins: int = 1000000
+
+
+def formatStage(stage: str, histogram: timing.Histogram) -> str:
+    return f'''\
+{stage} {histogram.count}x p50 {histogram.percentile(0.5):.3g}ms \
+p99 {histogram.percentile(0.99):.3g}ms max {histogram.max:.3g}ms'''
+
+
+async def manageSlotsTiming(args: ManageBotArgs) -> bool:
+    """
+    !managebot slotstiming [on|off|reset|channel [variant]]
+    """
+    option: Optional[str] = (args.message.lower[2] if len(args.message) > 2
+                             else None)
+    if option == 'on':
+        timing.enabled = True
+        args.send('Slots timing is enabled')
+        return True
+    if option == 'off':
+        timing.enabled = False
+        args.send('Slots timing is disabled')
+        return True
+    if option == 'reset':
+        timing.reset()
+        args.send('Slots timing is reset')
+        return True
+
+    slotVariant: Optional[str] = (args.message.lower[3]
+                                  if len(args.message) > 3 else None)
+    if slotVariant is not None and slotVariant not in variants:
+        args.send(f'Unknown slots variant {slotVariant}')
+        return True
+    stages: List[Tuple[str, timing.Histogram]] = timing.summary(
+        option, slotVariant)
+    if not stages:
+        state: str = 'enabled' if timing.enabled else 'disabled'
+        args.send(f'No slots timings recorded, timing is {state}')
+        return True
+    args.send(output.pack((formatStage(s, h) for s, h in stages), ' | '))
+    return True
+
+
+def formatQueue(channel: str, spinScheduler: scheduler.SpinScheduler) -> str:
+    return f'''\
+{channel} served {spinScheduler.served} dropped {spinScheduler.dropped} \
+already queued {spinScheduler.duplicates} depth {spinScheduler.depth}/\
+{spinScheduler.maxDepth} wait avg {spinScheduler.averageWait:.3g}s \
+max {spinScheduler.maxWait:.3g}s'''
+
+
+async def manageSlotsQueue(args: ManageBotArgs) -> bool:
+    """
+    !managebot slotsqueue [channel]
+    """
+    channels: List[str] = sorted(bot.globals.channels)
+    if len(args.message) > 2:
+        if args.message.lower[2] not in bot.globals.channels:
+            args.send(f'Not in channel {args.message.lower[2]}')
+            return True
+        channels = [args.message.lower[2]]
+    lines: List[str] = []
+    channel: str
+    for channel in channels:
+        spinScheduler: Optional[scheduler.SpinScheduler] = scheduler.find(
+            bot.globals.channels[channel])
+        if spinScheduler is not None:
+            lines.append(formatQueue(channel, spinScheduler))
+    cooldownNotifier: notifier.CooldownNotifier = notifier.get()
+    lines.append(f'''\
+whispers sent {cooldownNotifier.sent} suppressed \
+{cooldownNotifier.suppressed}''')
+    args.send(output.pack(lines, ' | '))
+    return True
+
+
+async def manageSlotsOdds(args: ManageBotArgs) -> bool:
+    """
+    !managebot slotsodds channel [variant] [emotes per spin]
+    """
+    if len(args.message) < 3:
+        return False
+    try:
+        from . import odds
+    except ImportError:
+        args.send('slotsodds needs NumPy')
+        return True
+    channel: str = args.message.lower[2]
+    name: str = args.message.lower[3] if len(args.message) > 3 else 'twitch'
+    size: int = odds.sampleSize
+    if len(args.message) > 4:
+        try:
+            size = int(args.message[4])
+        except ValueError:
+            return False
+    if channel not in bot.globals.channels:
+        args.send(f'Not in channel {channel}')
+        return True
+    if name not in variants:
+        args.send(f'Unknown slots variant {name}')
+        return True
+    if size < 1:
+        return False
+    slotVariant: SlotVariant = variants[name]
+    chat: data.Channel = bot.globals.channels[channel]
+    emotePool: Optional[pool.EmotePool]
+    emotePool = await slotVariant.loadPool(chat, args.data)
+    if emotePool is None:
+        args.send(f'The {slotVariant.command} emotes did not load')
+        return True
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    flags: List[odds.Odds] = await loop.run_in_executor(
+        None, odds.odds, emotePool, slotVariant.name, oddsSpins, size)
+    lines: List[str] = [f'''\
+{slotVariant.command} in {channel}: {len(emotePool)} emotes, \
+{min(size, len(emotePool))} per spin, {oddsSpins} spins''']
+    lines += [f'{o.flag} {o.exact:.4%} (simulated {o.simulated:.4%})'
+              for o in flags]
+    args.send(output.pack(lines, ' | '))
+    return True
+
+
+async def manageSlotsReplay(args: ManageBotArgs) -> bool:
+    """
+    !managebot slotsreplay attempt-id
+
+    Draws a recorded attempt again from its seed and counter, the same
+    emotes as long as the emote pool of the channel has not changed
+    """
+    if len(args.message) < 3:
+        return False
+    try:
+        attemptId: int = int(args.message[2])
+    except ValueError:
+        return False
+    db: DatabaseMain
+    slotsRepository: SlotsRepository
+    async with DatabaseMain.acquire() as db, \
+            SlotsRepository(db) as slotsRepository:
+        attempt: Optional[AttemptSpin] = await slotsRepository.attemptSpin(
+            attemptId)
+    if attempt is None:
+        args.send(f'No slots attempt {attemptId}')
+        return True
+    if attempt.spinSeed is None or attempt.spinCounter is None:
+        args.send(f'Slots attempt {attemptId} has no seed to replay')
+        return True
+    if attempt.variant not in variants:
+        args.send(f'Unknown slots variant {attempt.variant}')
+        return True
+    if attempt.broadcaster not in bot.globals.channels:
+        args.send(f'Not in channel {attempt.broadcaster}')
+        return True
+    slotVariant: SlotVariant = variants[attempt.variant]
+    replayed: Optional[Tuple[pool.Sample, List[Any]]] = await reels.replay(
+        slotVariant, bot.globals.channels[attempt.broadcaster], args.data,
+        attempt.spinSeed, attempt.spinCounter)
+    if replayed is None:
+        args.send(f'The {slotVariant.command} emotes did not load')
+        return True
+    emotes: pool.Sample
+    selected: List[Any]
+    emotes, selected = replayed
+    drawn: str = ' | '.join(emotes[i] for i in selected)
+    if ([str(i) for i in selected] == attempt.emoteIds
+            and [emotes[i] for i in selected] == attempt.emotes):
+        args.send(f'Slots attempt {attemptId} replays {drawn} as recorded')
+    else:
+        recorded: str = ' | '.join(attempt.emotes)
+        args.send(f'''\
+Slots attempt {attemptId} replays {drawn}, it was {recorded} with the emote \
+pool of then''')
+    return True
+
+
+async def manageSlotsSeed(args: ManageBotArgs) -> bool:
+    """
+    !managebot slotsseed channel [seed]
+    """
+    if len(args.message) < 3:
+        return False
+    channel: str = args.message.lower[2]
+    if channel not in bot.globals.channels:
+        args.send(f'Not in channel {channel}')
+        return True
+    chat: data.Channel = bot.globals.channels[channel]
+    if len(args.message) < 4:
+        reelRandom: reels.ReelRandom = reels.get(chat)
+        args.send(f'''\
+Slots in {channel} are on seed {reelRandom.seed} spin {reelRandom.counter}''')
+        return True
+    try:
+        seed: int = int(args.message[3])
+    except ValueError:
+        return False
+    if not 0 <= seed < 1 << 63:
+        return False
+    reels.seed(chat, seed)
+    args.send(f'Slots in {channel} restart from seed {seed}')
+    return True
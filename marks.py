@@ -0,0 +1,84 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple  # noqa: F401
+
+import aioodbc.cursor  # noqa: F401
+
+from lib.database import DatabaseMain
+from .repository import SlotsRepository
+
+# How long a mark keeps a user a bot, library.unbotCooldown
+markDuration: timedelta = timedelta(hours=1)
+sweepBatch: int = 500
+
+
+class BotMarks:
+    """
+    The unexpired slot_bots marks of every channel in memory
+
+    Loaded in one query before the first spin and kept in sync by mark(),
+    so the bot check of a spin is a dictionary lookup.
+    """
+    def __init__(self) -> None:
+        self.marks: Dict[Tuple[str, str], datetime] = {}
+        self.loaded: bool = False
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def load(self,
+                   slotsRepository: SlotsRepository,
+                   timestamp: datetime) -> None:
+        if self.loaded:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self.loaded:
+                return
+            broadcaster: str
+            user: str
+            marked: datetime
+            for broadcaster, user, marked in await slotsRepository.botMarks(
+                    timestamp - markDuration):
+                self.mark(broadcaster, user, marked)
+            self.loaded = True
+
+    def marked(self, broadcaster: str, user: str) -> datetime:
+        return self.marks.get((broadcaster, user), datetime.min)
+
+    def mark(self, broadcaster: str, user: str, timestamp: datetime) -> None:
+        if timestamp > self.marked(broadcaster, user):
+            self.marks[broadcaster, user] = timestamp
+
+    def prune(self, before: datetime) -> None:
+        key: Tuple[str, str]
+        for key in [k for k, m in self.marks.items() if m < before]:
+            del self.marks[key]
+
+
+async def sweep(database: DatabaseMain, before: datetime) -> int:
+    """
+    Delete the marks older than before, sweepBatch rows per transaction
+    """
+    rowId: str = 'rowid' if database.isSqlite else 'ctid'
+    query: str = f'''
+DELETE FROM slot_bots WHERE {rowId} IN (
+    SELECT {rowId} FROM slot_bots WHERE marked<? LIMIT ?)
+'''
+    deleted: int = 0
+    cursor: aioodbc.cursor.Cursor
+    async with await database.cursor() as cursor:
+        while True:
+            await cursor.execute(query, (before, sweepBatch))
+            count: int = cursor.rowcount
+            await database.commit()
+            deleted += count
+            if count < sweepBatch:
+                return deleted
+            await asyncio.sleep(0)
+
+
+_marks: BotMarks = BotMarks()
+
+
+def get() -> BotMarks:
+    return _marks
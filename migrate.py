@@ -0,0 +1,103 @@
+import asyncio
+import os
+import re
+from datetime import datetime
+from typing import List, Optional, Set, Tuple  # noqa: F401
+
+import aioodbc.cursor  # noqa: F401
+
+from lib.database import DatabaseMain
+
+migrationsPath: str = os.path.join(os.path.dirname(__file__), 'migrations')
+
+_lock: Optional[asyncio.Lock] = None
+_migrated: bool = False
+
+
+def migrations(dialect: str) -> List[Tuple[int, str]]:
+    pattern: str = r'(\d+)-.+-' + re.escape(dialect) + r'\.sql$'
+    found: List[Tuple[int, str]] = []
+    filename: str
+    for filename in os.listdir(migrationsPath):
+        match = re.match(pattern, filename)
+        if match is not None:
+            found.append((int(match.group(1)),
+                          os.path.join(migrationsPath, filename)))
+    return sorted(found)
+
+
+def statements(script: str) -> List[str]:
+    """
+    Split a migration script on semicolons outside of $$ quoted bodies
+    """
+    result: List[str] = []
+    quoted: bool = False
+    current: str = ''
+    part: str
+    for part in re.split(r'(\$\$|;)', script):
+        if part == '$$':
+            quoted = not quoted
+        if part == ';' and not quoted:
+            if current.strip():
+                result.append(current.strip())
+            current = ''
+        else:
+            current += part
+    if current.strip():
+        result.append(current.strip())
+    return result
+
+
+async def migrate(database: DatabaseMain) -> List[int]:
+    """
+    Apply the pending scripts in migrations/ and return their versions
+    """
+    dialect: str = 'sqlite' if database.isSqlite else 'postgres'
+    applied: List[int] = []
+    cursor: aioodbc.cursor.Cursor
+    async with await database.cursor() as cursor:
+        await cursor.execute('''
+CREATE TABLE IF NOT EXISTS slots_migrations (
+    version INTEGER NOT NULL PRIMARY KEY,
+    applied TIMESTAMP NOT NULL
+)
+''')
+        await database.commit()
+        done: Set[int] = {version async for version,
+                          in await cursor.execute(
+                              'SELECT version FROM slots_migrations')}
+
+        version: int
+        path: str
+        for version, path in migrations(dialect):
+            if version in done:
+                continue
+            with open(path, encoding='utf-8') as file:
+                script: str = file.read()
+            statement: str
+            for statement in statements(script):
+                await cursor.execute(statement)
+            await cursor.execute('''
+INSERT INTO slots_migrations (version, applied) VALUES (?, ?)
+''', (version, datetime.utcnow()))
+            await database.commit()
+            applied.append(version)
+    return applied
+
+
+async def ensure() -> None:
+    """
+    Migrate the database once per process, before the first slots query
+    """
+    global _lock, _migrated
+    if _migrated:
+        return
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        if _migrated:
+            return
+        db: DatabaseMain
+        async with DatabaseMain.acquire() as db:
+            await migrate(db)
+        _migrated = True
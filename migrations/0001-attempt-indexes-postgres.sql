@@ -0,0 +1,17 @@
+CREATE INDEX slot_attempts_broadcaster_user
+    ON slot_attempts (broadcaster, twitchUser, attemptTime);
+CREATE INDEX slot_attempts_broadcaster_time
+    ON slot_attempts (broadcaster, attemptTime);
+DROP INDEX slot_attempts_broadcaster;
+
+CREATE INDEX ffz_slot_attempts_broadcaster_user
+    ON ffz_slot_attempts (broadcaster, twitchUser, attemptTime);
+CREATE INDEX ffz_slot_attempts_broadcaster_time
+    ON ffz_slot_attempts (broadcaster, attemptTime);
+DROP INDEX ffz_slot_attempts_broadcaster;
+
+CREATE INDEX bttv_slot_attempts_broadcaster_user
+    ON bttv_slot_attempts (broadcaster, twitchUser, attemptTime);
+CREATE INDEX bttv_slot_attempts_broadcaster_time
+    ON bttv_slot_attempts (broadcaster, attemptTime);
+DROP INDEX bttv_slot_attempts_broadcaster;
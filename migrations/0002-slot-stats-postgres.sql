@@ -0,0 +1,45 @@
+CREATE TABLE slot_stats (
+    broadcaster VARCHAR NOT NULL,
+    variant VARCHAR NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    attempts INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    basicMatches INTEGER NOT NULL DEFAULT 0,
+    kappaMatches INTEGER NOT NULL DEFAULT 0,
+    catMatches INTEGER NOT NULL DEFAULT 0,
+    dogMatches INTEGER NOT NULL DEFAULT 0,
+    subscriberMatches INTEGER NOT NULL DEFAULT 0,
+    lastWin TIMESTAMP,
+    PRIMARY KEY (broadcaster, variant, twitchUser)
+);
+CREATE INDEX slot_stats_wins ON slot_stats (broadcaster, variant, wins);
+
+INSERT INTO slot_stats
+    (broadcaster, variant, twitchUser, attempts, wins, basicMatches,
+    kappaMatches, catMatches, dogMatches, subscriberMatches, lastWin)
+    SELECT broadcaster, 'twitch', twitchUser, COUNT(*),
+        SUM(CASE WHEN isWin THEN 1 ELSE 0 END),
+        SUM(CASE WHEN isBasicMatch THEN 1 ELSE 0 END),
+        SUM(CASE WHEN isKappaMatch THEN 1 ELSE 0 END),
+        SUM(CASE WHEN isCatMatch THEN 1 ELSE 0 END),
+        SUM(CASE WHEN isDogMatch THEN 1 ELSE 0 END),
+        SUM(CASE WHEN isSubscriberMatch THEN 1 ELSE 0 END),
+        MAX(CASE WHEN isWin THEN attemptTime END)
+        FROM slot_attempts
+        GROUP BY broadcaster, twitchUser;
+
+INSERT INTO slot_stats
+    (broadcaster, variant, twitchUser, attempts, wins, lastWin)
+    SELECT broadcaster, 'ffz', twitchUser, COUNT(*),
+        SUM(CASE WHEN isWin THEN 1 ELSE 0 END),
+        MAX(CASE WHEN isWin THEN attemptTime END)
+        FROM ffz_slot_attempts
+        GROUP BY broadcaster, twitchUser;
+
+INSERT INTO slot_stats
+    (broadcaster, variant, twitchUser, attempts, wins, lastWin)
+    SELECT broadcaster, 'bttv', twitchUser, COUNT(*),
+        SUM(CASE WHEN isWin THEN 1 ELSE 0 END),
+        MAX(CASE WHEN isWin THEN attemptTime END)
+        FROM bttv_slot_attempts
+        GROUP BY broadcaster, twitchUser;
@@ -0,0 +1,168 @@
+CREATE FUNCTION slots_attempt_partition(tableName VARCHAR, month DATE)
+RETURNS VOID AS $$
+DECLARE
+    partitionName VARCHAR := tableName || '_' || to_char(month, 'YYYYMM');
+    nextMonth DATE := month + INTERVAL '1 month';
+BEGIN
+    IF to_regclass(partitionName) IS NOT NULL THEN
+        RETURN;
+    END IF;
+    -- Rows of the month in the default partition would block the new one
+    EXECUTE format('CREATE TEMPORARY TABLE slots_moved (LIKE %I)', tableName);
+    EXECUTE format('WITH moved AS (DELETE FROM %I WHERE attemptTime>=%L '
+                   'AND attemptTime<%L RETURNING *) '
+                   'INSERT INTO slots_moved SELECT * FROM moved',
+                   tableName || '_default', month, nextMonth);
+    EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) '
+                   'TO (%L)', partitionName, tableName, month, nextMonth);
+    EXECUTE format('INSERT INTO %I SELECT * FROM slots_moved', tableName);
+    DROP TABLE slots_moved;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TABLE slot_attempts_daily (
+    broadcaster VARCHAR NOT NULL,
+    variant VARCHAR NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    day DATE NOT NULL,
+    attempts INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    PRIMARY KEY (broadcaster, variant, twitchUser, day)
+);
+
+DROP INDEX slot_attempts_broadcaster_user;
+DROP INDEX slot_attempts_broadcaster_time;
+ALTER TABLE slot_attempts RENAME TO slot_attempts_unpartitioned;
+ALTER TABLE slot_attempts_unpartitioned
+    RENAME CONSTRAINT slot_attempts_pkey
+    TO slot_attempts_unpartitioned_pkey;
+CREATE TABLE slot_attempts (
+    id INTEGER NOT NULL DEFAULT nextval('slot_attempts_id_seq'),
+    broadcaster VARCHAR NOT NULL,
+    attemptTime TIMESTAMP NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    numMatching INTEGER NOT NULL,
+    isWin BOOLEAN NOT NULL,
+    emoticon1 VARCHAR NOT NULL,
+    emoticon2 VARCHAR NOT NULL,
+    emoticon3 VARCHAR NOT NULL,
+    emoticonId1 INTEGER NOT NULL,
+    emoticonId2 INTEGER NOT NULL,
+    emoticonId3 INTEGER NOT NULL,
+    isBasicMatch BOOLEAN NOT NULL,
+    isKappaMatch BOOLEAN NOT NULL,
+    isCatMatch BOOLEAN NOT NULL,
+    isDogMatch BOOLEAN NOT NULL,
+    isSubscriberMatch BOOLEAN NOT NULL,
+    PRIMARY KEY (id, attemptTime)
+) PARTITION BY RANGE (attemptTime);
+CREATE TABLE slot_attempts_default PARTITION OF slot_attempts
+    DEFAULT;
+CREATE INDEX slot_attempts_broadcaster_user
+    ON slot_attempts (broadcaster, twitchUser, attemptTime);
+CREATE INDEX slot_attempts_broadcaster_time
+    ON slot_attempts (broadcaster, attemptTime);
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN SELECT generate_series(
+            date_trunc('month', COALESCE(MIN(attemptTime), now())),
+            date_trunc('month', now()) + INTERVAL '1 month',
+            INTERVAL '1 month')
+            FROM slot_attempts_unpartitioned LOOP
+        PERFORM slots_attempt_partition('slot_attempts', month);
+    END LOOP;
+END
+$$;
+INSERT INTO slot_attempts SELECT * FROM slot_attempts_unpartitioned;
+ALTER SEQUENCE slot_attempts_id_seq OWNED BY slot_attempts.id;
+DROP TABLE slot_attempts_unpartitioned;
+
+DROP INDEX ffz_slot_attempts_broadcaster_user;
+DROP INDEX ffz_slot_attempts_broadcaster_time;
+ALTER TABLE ffz_slot_attempts RENAME TO ffz_slot_attempts_unpartitioned;
+ALTER TABLE ffz_slot_attempts_unpartitioned
+    RENAME CONSTRAINT ffz_slot_attempts_pkey
+    TO ffz_slot_attempts_unpartitioned_pkey;
+CREATE TABLE ffz_slot_attempts (
+    id INTEGER NOT NULL DEFAULT nextval('ffz_slot_attempts_id_seq'),
+    broadcaster VARCHAR NOT NULL,
+    attemptTime TIMESTAMP NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    numMatching INTEGER NOT NULL,
+    isWin BOOLEAN NOT NULL,
+    emoticon1 VARCHAR NOT NULL,
+    emoticon2 VARCHAR NOT NULL,
+    emoticon3 VARCHAR NOT NULL,
+    emoticonId1 INTEGER NOT NULL,
+    emoticonId2 INTEGER NOT NULL,
+    emoticonId3 INTEGER NOT NULL,
+    PRIMARY KEY (id, attemptTime)
+) PARTITION BY RANGE (attemptTime);
+CREATE TABLE ffz_slot_attempts_default PARTITION OF ffz_slot_attempts
+    DEFAULT;
+CREATE INDEX ffz_slot_attempts_broadcaster_user
+    ON ffz_slot_attempts (broadcaster, twitchUser, attemptTime);
+CREATE INDEX ffz_slot_attempts_broadcaster_time
+    ON ffz_slot_attempts (broadcaster, attemptTime);
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN SELECT generate_series(
+            date_trunc('month', COALESCE(MIN(attemptTime), now())),
+            date_trunc('month', now()) + INTERVAL '1 month',
+            INTERVAL '1 month')
+            FROM ffz_slot_attempts_unpartitioned LOOP
+        PERFORM slots_attempt_partition('ffz_slot_attempts', month);
+    END LOOP;
+END
+$$;
+INSERT INTO ffz_slot_attempts SELECT * FROM ffz_slot_attempts_unpartitioned;
+ALTER SEQUENCE ffz_slot_attempts_id_seq OWNED BY ffz_slot_attempts.id;
+DROP TABLE ffz_slot_attempts_unpartitioned;
+
+DROP INDEX bttv_slot_attempts_broadcaster_user;
+DROP INDEX bttv_slot_attempts_broadcaster_time;
+ALTER TABLE bttv_slot_attempts RENAME TO bttv_slot_attempts_unpartitioned;
+ALTER TABLE bttv_slot_attempts_unpartitioned
+    RENAME CONSTRAINT bttv_slot_attempts_pkey
+    TO bttv_slot_attempts_unpartitioned_pkey;
+CREATE TABLE bttv_slot_attempts (
+    id INTEGER NOT NULL DEFAULT nextval('bttv_slot_attempts_id_seq'),
+    broadcaster VARCHAR NOT NULL,
+    attemptTime TIMESTAMP NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    numMatching INTEGER NOT NULL,
+    isWin BOOLEAN NOT NULL,
+    emoticon1 VARCHAR NOT NULL,
+    emoticon2 VARCHAR NOT NULL,
+    emoticon3 VARCHAR NOT NULL,
+    emoticonId1 VARCHAR NOT NULL,
+    emoticonId2 VARCHAR NOT NULL,
+    emoticonId3 VARCHAR NOT NULL,
+    PRIMARY KEY (id, attemptTime)
+) PARTITION BY RANGE (attemptTime);
+CREATE TABLE bttv_slot_attempts_default PARTITION OF bttv_slot_attempts
+    DEFAULT;
+CREATE INDEX bttv_slot_attempts_broadcaster_user
+    ON bttv_slot_attempts (broadcaster, twitchUser, attemptTime);
+CREATE INDEX bttv_slot_attempts_broadcaster_time
+    ON bttv_slot_attempts (broadcaster, attemptTime);
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN SELECT generate_series(
+            date_trunc('month', COALESCE(MIN(attemptTime), now())),
+            date_trunc('month', now()) + INTERVAL '1 month',
+            INTERVAL '1 month')
+            FROM bttv_slot_attempts_unpartitioned LOOP
+        PERFORM slots_attempt_partition('bttv_slot_attempts', month);
+    END LOOP;
+END
+$$;
+INSERT INTO bttv_slot_attempts SELECT * FROM bttv_slot_attempts_unpartitioned;
+ALTER SEQUENCE bttv_slot_attempts_id_seq OWNED BY bttv_slot_attempts.id;
+DROP TABLE bttv_slot_attempts_unpartitioned;
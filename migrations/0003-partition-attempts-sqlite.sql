@@ -0,0 +1,65 @@
+CREATE TABLE slot_attempts_archive (
+    id INTEGER NOT NULL PRIMARY KEY,
+    broadcaster VARCHAR NOT NULL,
+    attemptTime TIMESTAMP NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    numMatching INTEGER NOT NULL,
+    isWin BOOLEAN NOT NULL,
+    emoticon1 VARCHAR NOT NULL,
+    emoticon2 VARCHAR NOT NULL,
+    emoticon3 VARCHAR NOT NULL,
+    emoticonId1 INTEGER NOT NULL,
+    emoticonId2 INTEGER NOT NULL,
+    emoticonId3 INTEGER NOT NULL,
+    isBasicMatch BOOLEAN NOT NULL,
+    isKappaMatch BOOLEAN NOT NULL,
+    isCatMatch BOOLEAN NOT NULL,
+    isDogMatch BOOLEAN NOT NULL,
+    isSubscriberMatch BOOLEAN NOT NULL
+);
+CREATE INDEX slot_attempts_archive_time
+    ON slot_attempts_archive (attemptTime);
+
+CREATE TABLE ffz_slot_attempts_archive (
+    id INTEGER NOT NULL PRIMARY KEY,
+    broadcaster VARCHAR NOT NULL,
+    attemptTime TIMESTAMP NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    numMatching INTEGER NOT NULL,
+    isWin BOOLEAN NOT NULL,
+    emoticon1 VARCHAR NOT NULL,
+    emoticon2 VARCHAR NOT NULL,
+    emoticon3 VARCHAR NOT NULL,
+    emoticonId1 INTEGER NOT NULL,
+    emoticonId2 INTEGER NOT NULL,
+    emoticonId3 INTEGER NOT NULL
+);
+CREATE INDEX ffz_slot_attempts_archive_time
+    ON ffz_slot_attempts_archive (attemptTime);
+
+CREATE TABLE bttv_slot_attempts_archive (
+    id INTEGER NOT NULL PRIMARY KEY,
+    broadcaster VARCHAR NOT NULL,
+    attemptTime TIMESTAMP NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    numMatching INTEGER NOT NULL,
+    isWin BOOLEAN NOT NULL,
+    emoticon1 VARCHAR NOT NULL,
+    emoticon2 VARCHAR NOT NULL,
+    emoticon3 VARCHAR NOT NULL,
+    emoticonId1 VARCHAR NOT NULL,
+    emoticonId2 VARCHAR NOT NULL,
+    emoticonId3 VARCHAR NOT NULL
+);
+CREATE INDEX bttv_slot_attempts_archive_time
+    ON bttv_slot_attempts_archive (attemptTime);
+
+CREATE TABLE slot_attempts_daily (
+    broadcaster VARCHAR NOT NULL,
+    variant VARCHAR NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    day DATE NOT NULL,
+    attempts INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    PRIMARY KEY (broadcaster, variant, twitchUser, day)
+);
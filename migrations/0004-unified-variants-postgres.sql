@@ -0,0 +1,185 @@
+DO $$
+DECLARE
+    tableName VARCHAR;
+    partitionName VARCHAR;
+BEGIN
+    FOREACH tableName IN ARRAY ARRAY['slot_attempts', 'ffz_slot_attempts',
+                                     'bttv_slot_attempts'] LOOP
+        FOR partitionName IN SELECT c.relname
+                FROM pg_inherits AS i
+                    JOIN pg_class AS c ON c.oid=i.inhrelid
+                    JOIN pg_class AS p ON p.oid=i.inhparent
+                WHERE p.relname=tableName LOOP
+            EXECUTE format('ALTER TABLE %I RENAME TO %I', partitionName,
+                           tableName || '_legacy'
+                           || substr(partitionName, length(tableName) + 1));
+        END LOOP;
+        EXECUTE format('ALTER TABLE %I RENAME TO %I', tableName,
+                       tableName || '_legacy');
+        EXECUTE format('ALTER TABLE %I RENAME CONSTRAINT %I TO %I',
+                       tableName || '_legacy', tableName || '_pkey',
+                       tableName || '_legacy_pkey');
+        EXECUTE format('ALTER INDEX %I RENAME TO %I',
+                       tableName || '_broadcaster_user',
+                       tableName || '_legacy_broadcaster_user');
+        EXECUTE format('ALTER INDEX %I RENAME TO %I',
+                       tableName || '_broadcaster_time',
+                       tableName || '_legacy_broadcaster_time');
+        EXECUTE format('ALTER SEQUENCE %I RENAME TO %I',
+                       tableName || '_id_seq', tableName || '_legacy_id_seq');
+    END LOOP;
+    FOREACH tableName IN ARRAY ARRAY['slot_winners', 'ffz_slot_winners',
+                                     'bttv_slot_winners'] LOOP
+        EXECUTE format('ALTER TABLE %I RENAME TO %I', tableName,
+                       tableName || '_legacy');
+        EXECUTE format('ALTER TABLE %I RENAME CONSTRAINT %I TO %I',
+                       tableName || '_legacy', tableName || '_pkey',
+                       tableName || '_legacy_pkey');
+        EXECUTE format('ALTER INDEX %I RENAME TO %I',
+                       tableName || '_broadcaster',
+                       tableName || '_legacy_broadcaster');
+        EXECUTE format('ALTER SEQUENCE %I RENAME TO %I',
+                       tableName || '_id_seq', tableName || '_legacy_id_seq');
+    END LOOP;
+END
+$$;
+
+CREATE SEQUENCE slot_attempts_id_seq;
+CREATE TABLE slot_attempts (
+    id INTEGER NOT NULL DEFAULT nextval('slot_attempts_id_seq'),
+    variant VARCHAR NOT NULL,
+    broadcaster VARCHAR NOT NULL,
+    attemptTime TIMESTAMP NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    numMatching INTEGER NOT NULL,
+    isWin BOOLEAN NOT NULL,
+    emoticon1 VARCHAR NOT NULL,
+    emoticon2 VARCHAR NOT NULL,
+    emoticon3 VARCHAR NOT NULL,
+    emoticonId1 VARCHAR NOT NULL,
+    emoticonId2 VARCHAR NOT NULL,
+    emoticonId3 VARCHAR NOT NULL,
+    isBasicMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isKappaMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isCatMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isDogMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isSubscriberMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    PRIMARY KEY (id, attemptTime)
+) PARTITION BY RANGE (attemptTime);
+CREATE TABLE slot_attempts_default PARTITION OF slot_attempts
+    DEFAULT;
+CREATE INDEX slot_attempts_broadcaster_user
+    ON slot_attempts (broadcaster, variant, twitchUser, attemptTime);
+CREATE INDEX slot_attempts_broadcaster_time
+    ON slot_attempts (broadcaster, attemptTime);
+ALTER SEQUENCE slot_attempts_id_seq OWNED BY slot_attempts.id;
+
+DO $$
+DECLARE
+    month DATE;
+BEGIN
+    FOR month IN SELECT generate_series(
+            date_trunc('month', COALESCE(MIN(attemptTime), now())),
+            date_trunc('month', now()) + INTERVAL '1 month',
+            INTERVAL '1 month')
+            FROM (SELECT attemptTime FROM slot_attempts_legacy
+                UNION ALL
+                SELECT attemptTime FROM ffz_slot_attempts_legacy
+                UNION ALL
+                SELECT attemptTime FROM bttv_slot_attempts_legacy) AS a LOOP
+        PERFORM slots_attempt_partition('slot_attempts', month);
+    END LOOP;
+END
+$$;
+
+CREATE TABLE slot_winners (
+    id SERIAL NOT NULL PRIMARY KEY,
+    variant VARCHAR NOT NULL,
+    broadcaster VARCHAR NOT NULL,
+    winningTime TIMESTAMP NOT NULL,
+    winner VARCHAR NOT NULL,
+    winningEmote VARCHAR NOT NULL,
+    winningEmoteId VARCHAR NOT NULL
+);
+CREATE INDEX slot_winners_broadcaster ON slot_winners (broadcaster, variant);
+
+SELECT setval('slot_attempts_id_seq', COALESCE(MAX(id), 0) + 1, false)
+    FROM (
+        SELECT MAX(id) AS id FROM slot_attempts_legacy
+        UNION ALL
+        SELECT MAX(id) AS id FROM ffz_slot_attempts_legacy
+        UNION ALL
+        SELECT MAX(id) AS id FROM bttv_slot_attempts_legacy
+        ) AS a;
+
+SELECT setval('slot_winners_id_seq', COALESCE(MAX(id), 0) + 1, false)
+    FROM (
+        SELECT MAX(id) AS id FROM slot_winners_legacy
+        UNION ALL
+        SELECT MAX(id) AS id FROM ffz_slot_winners_legacy
+        UNION ALL
+        SELECT MAX(id) AS id FROM bttv_slot_winners_legacy
+        ) AS a;
+
+CREATE VIEW twitch_slot_attempts AS
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+            emoticonId3, isBasicMatch, isKappaMatch, isCatMatch, isDogMatch,
+            isSubscriberMatch
+        FROM slot_attempts WHERE variant='twitch'
+    UNION ALL
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, CAST(emoticonId1 AS VARCHAR),
+            CAST(emoticonId2 AS VARCHAR), CAST(emoticonId3 AS VARCHAR),
+            isBasicMatch, isKappaMatch, isCatMatch, isDogMatch,
+            isSubscriberMatch
+        FROM slot_attempts_legacy;
+
+CREATE VIEW twitch_slot_winners AS
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            winningEmoteId
+        FROM slot_winners WHERE variant='twitch'
+    UNION ALL
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            CAST(winningEmoteId AS VARCHAR)
+        FROM slot_winners_legacy;
+
+CREATE VIEW ffz_slot_attempts AS
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+            emoticonId3
+        FROM slot_attempts WHERE variant='ffz'
+    UNION ALL
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, CAST(emoticonId1 AS VARCHAR),
+            CAST(emoticonId2 AS VARCHAR), CAST(emoticonId3 AS VARCHAR)
+        FROM ffz_slot_attempts_legacy;
+
+CREATE VIEW ffz_slot_winners AS
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            winningEmoteId
+        FROM slot_winners WHERE variant='ffz'
+    UNION ALL
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            CAST(winningEmoteId AS VARCHAR)
+        FROM ffz_slot_winners_legacy;
+
+CREATE VIEW bttv_slot_attempts AS
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+            emoticonId3
+        FROM slot_attempts WHERE variant='bttv'
+    UNION ALL
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, CAST(emoticonId1 AS VARCHAR),
+            CAST(emoticonId2 AS VARCHAR), CAST(emoticonId3 AS VARCHAR)
+        FROM bttv_slot_attempts_legacy;
+
+CREATE VIEW bttv_slot_winners AS
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            winningEmoteId
+        FROM slot_winners WHERE variant='bttv'
+    UNION ALL
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            CAST(winningEmoteId AS VARCHAR)
+        FROM bttv_slot_winners_legacy;
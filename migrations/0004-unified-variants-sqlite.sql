@@ -0,0 +1,168 @@
+DROP INDEX slot_attempts_broadcaster_user;
+DROP INDEX slot_attempts_broadcaster_time;
+ALTER TABLE slot_attempts RENAME TO slot_attempts_legacy;
+DROP INDEX slot_attempts_archive_time;
+ALTER TABLE slot_attempts_archive
+    RENAME TO slot_attempts_legacy_archive;
+DROP INDEX slot_winners_broadcaster;
+ALTER TABLE slot_winners RENAME TO slot_winners_legacy;
+
+DROP INDEX ffz_slot_attempts_broadcaster_user;
+DROP INDEX ffz_slot_attempts_broadcaster_time;
+ALTER TABLE ffz_slot_attempts RENAME TO ffz_slot_attempts_legacy;
+DROP INDEX ffz_slot_attempts_archive_time;
+ALTER TABLE ffz_slot_attempts_archive
+    RENAME TO ffz_slot_attempts_legacy_archive;
+DROP INDEX ffz_slot_winners_broadcaster;
+ALTER TABLE ffz_slot_winners RENAME TO ffz_slot_winners_legacy;
+
+DROP INDEX bttv_slot_attempts_broadcaster_user;
+DROP INDEX bttv_slot_attempts_broadcaster_time;
+ALTER TABLE bttv_slot_attempts RENAME TO bttv_slot_attempts_legacy;
+DROP INDEX bttv_slot_attempts_archive_time;
+ALTER TABLE bttv_slot_attempts_archive
+    RENAME TO bttv_slot_attempts_legacy_archive;
+DROP INDEX bttv_slot_winners_broadcaster;
+ALTER TABLE bttv_slot_winners RENAME TO bttv_slot_winners_legacy;
+
+CREATE TABLE slot_attempts (
+    id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    variant VARCHAR NOT NULL,
+    broadcaster VARCHAR NOT NULL,
+    attemptTime TIMESTAMP NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    numMatching INTEGER NOT NULL,
+    isWin BOOLEAN NOT NULL,
+    emoticon1 VARCHAR NOT NULL,
+    emoticon2 VARCHAR NOT NULL,
+    emoticon3 VARCHAR NOT NULL,
+    emoticonId1 VARCHAR NOT NULL,
+    emoticonId2 VARCHAR NOT NULL,
+    emoticonId3 VARCHAR NOT NULL,
+    isBasicMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isKappaMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isCatMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isDogMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isSubscriberMatch BOOLEAN NOT NULL DEFAULT FALSE
+);
+CREATE INDEX slot_attempts_broadcaster_user
+    ON slot_attempts (broadcaster, variant, twitchUser, attemptTime);
+CREATE INDEX slot_attempts_broadcaster_time
+    ON slot_attempts (broadcaster, attemptTime);
+
+CREATE TABLE slot_attempts_archive (
+    id INTEGER NOT NULL PRIMARY KEY,
+    variant VARCHAR NOT NULL,
+    broadcaster VARCHAR NOT NULL,
+    attemptTime TIMESTAMP NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    numMatching INTEGER NOT NULL,
+    isWin BOOLEAN NOT NULL,
+    emoticon1 VARCHAR NOT NULL,
+    emoticon2 VARCHAR NOT NULL,
+    emoticon3 VARCHAR NOT NULL,
+    emoticonId1 VARCHAR NOT NULL,
+    emoticonId2 VARCHAR NOT NULL,
+    emoticonId3 VARCHAR NOT NULL,
+    isBasicMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isKappaMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isCatMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isDogMatch BOOLEAN NOT NULL DEFAULT FALSE,
+    isSubscriberMatch BOOLEAN NOT NULL DEFAULT FALSE
+);
+CREATE INDEX slot_attempts_archive_time
+    ON slot_attempts_archive (attemptTime);
+
+CREATE TABLE slot_winners (
+    id INTEGER NOT NULL PRIMARY KEY AUTOINCREMENT,
+    variant VARCHAR NOT NULL,
+    broadcaster VARCHAR NOT NULL,
+    winningTime TIMESTAMP NOT NULL,
+    winner VARCHAR NOT NULL,
+    winningEmote VARCHAR NOT NULL,
+    winningEmoteId VARCHAR NOT NULL
+);
+CREATE INDEX slot_winners_broadcaster ON slot_winners (broadcaster, variant);
+
+INSERT INTO sqlite_sequence (name, seq)
+    SELECT 'slot_attempts', COALESCE(MAX(id), 0)
+        FROM (
+            SELECT MAX(id) AS id FROM slot_attempts_legacy
+            UNION ALL
+            SELECT MAX(id) AS id FROM ffz_slot_attempts_legacy
+            UNION ALL
+            SELECT MAX(id) AS id FROM bttv_slot_attempts_legacy
+            ) AS a;
+
+INSERT INTO sqlite_sequence (name, seq)
+    SELECT 'slot_winners', COALESCE(MAX(id), 0)
+        FROM (
+            SELECT MAX(id) AS id FROM slot_winners_legacy
+            UNION ALL
+            SELECT MAX(id) AS id FROM ffz_slot_winners_legacy
+            UNION ALL
+            SELECT MAX(id) AS id FROM bttv_slot_winners_legacy
+            ) AS a;
+
+CREATE VIEW twitch_slot_attempts AS
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+            emoticonId3, isBasicMatch, isKappaMatch, isCatMatch, isDogMatch,
+            isSubscriberMatch
+        FROM slot_attempts WHERE variant='twitch'
+    UNION ALL
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, CAST(emoticonId1 AS VARCHAR),
+            CAST(emoticonId2 AS VARCHAR), CAST(emoticonId3 AS VARCHAR),
+            isBasicMatch, isKappaMatch, isCatMatch, isDogMatch,
+            isSubscriberMatch
+        FROM slot_attempts_legacy;
+
+CREATE VIEW twitch_slot_winners AS
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            winningEmoteId
+        FROM slot_winners WHERE variant='twitch'
+    UNION ALL
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            CAST(winningEmoteId AS VARCHAR)
+        FROM slot_winners_legacy;
+
+CREATE VIEW ffz_slot_attempts AS
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+            emoticonId3
+        FROM slot_attempts WHERE variant='ffz'
+    UNION ALL
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, CAST(emoticonId1 AS VARCHAR),
+            CAST(emoticonId2 AS VARCHAR), CAST(emoticonId3 AS VARCHAR)
+        FROM ffz_slot_attempts_legacy;
+
+CREATE VIEW ffz_slot_winners AS
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            winningEmoteId
+        FROM slot_winners WHERE variant='ffz'
+    UNION ALL
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            CAST(winningEmoteId AS VARCHAR)
+        FROM ffz_slot_winners_legacy;
+
+CREATE VIEW bttv_slot_attempts AS
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+            emoticonId3
+        FROM slot_attempts WHERE variant='bttv'
+    UNION ALL
+    SELECT id, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+            emoticon1, emoticon2, emoticon3, CAST(emoticonId1 AS VARCHAR),
+            CAST(emoticonId2 AS VARCHAR), CAST(emoticonId3 AS VARCHAR)
+        FROM bttv_slot_attempts_legacy;
+
+CREATE VIEW bttv_slot_winners AS
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            winningEmoteId
+        FROM slot_winners WHERE variant='bttv'
+    UNION ALL
+    SELECT id, broadcaster, winningTime, winner, winningEmote,
+            CAST(winningEmoteId AS VARCHAR)
+        FROM bttv_slot_winners_legacy;
@@ -0,0 +1,2 @@
+ALTER TABLE slot_attempts ADD COLUMN spinSeed BIGINT;
+ALTER TABLE slot_attempts ADD COLUMN spinCounter INTEGER;
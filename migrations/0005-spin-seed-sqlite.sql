@@ -0,0 +1,5 @@
+ALTER TABLE slot_attempts ADD COLUMN spinSeed BIGINT;
+ALTER TABLE slot_attempts ADD COLUMN spinCounter INTEGER;
+
+ALTER TABLE slot_attempts_archive ADD COLUMN spinSeed BIGINT;
+ALTER TABLE slot_attempts_archive ADD COLUMN spinCounter INTEGER;
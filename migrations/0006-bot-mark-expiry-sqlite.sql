@@ -0,0 +1 @@
+CREATE INDEX slot_bots_marked ON slot_bots (marked);
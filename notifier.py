@@ -0,0 +1,73 @@
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple  # noqa: F401
+
+from bot import utils
+
+# (channel, nick, kind of whisper)
+Key = Tuple[str, str, str]
+
+
+class CooldownNotifier:
+    """
+    Whispers a user about a cooldown once, the whispers about the same
+    cooldown are suppressed until it ends
+
+    A cooldown is told once per channel and kind, a whisper about one does
+    not hold back the whispers about another.
+
+    Whispers share one global rate limit of the bot, a user spamming a
+    command would otherwise use it up for every other command.
+
+    The cooldowns are expired from a heap ordered by their end, a whisper
+    only touches the entries that ended since the one before it.
+    """
+    def __init__(self) -> None:
+        self.notified: Dict[Key, datetime] = {}
+        self._expiry: List[Tuple[datetime, Key]] = []
+        self.sent: int = 0
+        self.suppressed: int = 0
+
+    def whisper(self,
+                channel: str,
+                nick: str,
+                kind: str,
+                message: str,
+                timestamp: datetime,
+                until: datetime) -> bool:
+        self.expire(timestamp)
+        key: Key = (channel, nick, kind)
+        if key in self.notified and timestamp < self.notified[key]:
+            self.suppressed += 1
+            return False
+        self.notified[key] = until
+        heapq.heappush(self._expiry, (until, key))
+        self.sent += 1
+        utils.whisper(nick, message)
+        return True
+
+    def expire(self, timestamp: datetime) -> None:
+        while self._expiry and self._expiry[0][0] <= timestamp:
+            until: datetime
+            key: Key
+            until, key = heapq.heappop(self._expiry)
+            # A key whispered again since has a later entry of its own
+            if self.notified.get(key) == until:
+                del self.notified[key]
+
+
+_notifier: CooldownNotifier = CooldownNotifier()
+
+
+def get() -> CooldownNotifier:
+    return _notifier
+
+
+def whisper(channel: str,
+            nick: str,
+            kind: str,
+            message: str,
+            timestamp: datetime,
+            cooldown: timedelta) -> bool:
+    return _notifier.whisper(channel, nick, kind, message, timestamp,
+                             timestamp + cooldown)
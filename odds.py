@@ -0,0 +1,194 @@
+"""
+Exact and Monte Carlo odds of the attempt flags of a slots emote pool
+
+NumPy is only needed by the slotsodds manage command, it is not a dependency
+of the spins.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple  # noqa: F401
+
+import numpy
+
+from . import pool, scoring
+
+sampleSize: int = 16
+# generate_twitch_pool draws 15 emotes and always adds Kappa
+kappaId: int = 25
+
+
+class Layout(NamedTuple):
+    """
+    A spin as the pool providers draw it, a sample of the first population
+    emotes and, for Twitch, a forced emote after them in the last position
+    """
+    masks: Any
+    groups: Any
+    sampleSize: int
+    population: int
+    forced: bool
+
+
+class Odds(NamedTuple):
+    flag: str
+    exact: float
+    simulated: float
+
+
+def layout(emotePool: 'pool.EmotePool',
+           variant: str,
+           size: int = sampleSize) -> Layout:
+    masks: List[int] = list(emotePool.masks)
+    groups: List[Any] = list(emotePool.groups)
+    count: int = len(emotePool)
+    if variant != 'twitch' or count <= size:
+        return Layout(numpy.array(masks, dtype=numpy.int64),
+                      numpy.array(groups, dtype=object),
+                      min(size, count), count, False)
+    if emotePool.ids[-1] == kappaId:
+        count -= 1
+        forcedMask: int = masks.pop()
+        forcedGroup: Any = groups.pop()
+    else:
+        forcedMask = scoring.mask('Kappa', emotePool.categories)
+        forcedGroup = kappaId
+    masks.append(forcedMask)
+    groups.append(forcedGroup)
+    return Layout(numpy.array(masks, dtype=numpy.int64),
+                  numpy.array(groups, dtype=object), size, count, True)
+
+
+def choose(n: int, k: int) -> int:
+    if k < 0 or k > n:
+        return 0
+    result: int = 1
+    i: int
+    for i in range(min(k, n - k)):
+        result = result * (n - i) // (i + 1)
+    return result
+
+
+def cubedShare(population: int,
+               successes: int,
+               spinLayout: Layout,
+               forced: bool) -> float:
+    """
+    E[(m / k) ** 3] for the m sample emotes of a set with successes emotes
+    in the population, the chance all three reels land in the set
+    """
+    size: int = spinLayout.sampleSize
+    draws: int = size - 1 if spinLayout.forced else size
+    total: int = choose(population, draws)
+    expected: float = 0.0
+    x: int
+    for x in range(min(successes, draws) + 1):
+        ways: int = choose(successes, x) * choose(population - successes,
+                                                  draws - x)
+        expected += ways / total * ((x + forced) / size) ** 3
+    return expected
+
+
+def exact(spinLayout: Layout,
+          categories: Tuple[scoring.Category, ...],
+          groups: bool) -> Dict[str, float]:
+    population: int = spinLayout.population
+    masks: Any = spinLayout.masks[:population]
+    result: Dict[str, float] = {'isWin': 1 / spinLayout.sampleSize ** 2}
+    bit: int
+    category: scoring.Category
+    for bit, category in enumerate(categories):
+        forced: bool = (spinLayout.forced
+                        and bool(spinLayout.masks[-1] & (1 << bit)))
+        result[category.column or category.name] = cubedShare(
+            population, int(numpy.count_nonzero(masks & (1 << bit))),
+            spinLayout, forced)
+    if groups:
+        counts: Dict[Any, int] = {}
+        group: Any
+        for group in spinLayout.groups[:population]:
+            counts[group] = counts.get(group, 0) + 1
+        if spinLayout.forced:
+            counts.setdefault(spinLayout.groups[-1], 0)
+        result['isSubscriberMatch'] = sum(
+            cubedShare(population, count, spinLayout,
+                       spinLayout.forced and spinLayout.groups[-1] == group)
+            for group, count in counts.items() if group != 0)
+    return result
+
+
+def simulate(spinLayout: Layout,
+             categories: Tuple[scoring.Category, ...],
+             groups: bool,
+             spins: int,
+             seed: Optional[int] = None) -> Dict[str, float]:
+    """
+    Spin the layout spins times at once
+
+    The reels land on positions of the sample. Distinct positions hold
+    distinct emotes, drawn from the population without replacement by
+    rejecting repeats, so the sample never has to be built.
+    """
+    rng: Any = numpy.random.default_rng(seed)
+    size: int = spinLayout.sampleSize
+    population: int = spinLayout.population
+    # Reels on the forced emote never clash with the drawn ones
+    forcedPosition: int = size - 1 if spinLayout.forced else -1
+    positions: Any = rng.integers(0, size, (spins, 3))
+    emotes: Any = rng.integers(0, population, (spins, 3))
+    reel: int
+    for reel in range(1, 3):
+        earlier: int
+        for earlier in range(reel):
+            same: Any = positions[:, reel] == positions[:, earlier]
+            emotes[same, reel] = emotes[same, earlier]
+        while True:
+            clash: Any = numpy.zeros(spins, dtype=bool)
+            for earlier in range(reel):
+                clash |= ((positions[:, reel] != positions[:, earlier])
+                          & (positions[:, earlier] != forcedPosition)
+                          & (emotes[:, reel] == emotes[:, earlier]))
+            clash &= positions[:, reel] != forcedPosition
+            if not clash.any():
+                break
+            emotes[clash, reel] = rng.integers(0, population,
+                                               int(clash.sum()))
+    emotes[positions == forcedPosition] = population
+
+    win: Any = ((positions[:, 0] == positions[:, 1])
+                & (positions[:, 0] == positions[:, 2]))
+    result: Dict[str, float] = {'isWin': float(win.mean())}
+    masks: Any = spinLayout.masks[emotes]
+    matches: Any = masks[:, 0] & masks[:, 1] & masks[:, 2]
+    bit: int
+    category: scoring.Category
+    for bit, category in enumerate(categories):
+        result[category.column or category.name] = float(
+            numpy.count_nonzero(matches & (1 << bit)) / spins)
+    if groups:
+        codes: Dict[Any, int] = {}
+        groupCodes: Any = numpy.array(
+            [codes.setdefault(g, len(codes)) for g in spinLayout.groups])
+        reels: Any = groupCodes[emotes]
+        zero: int = codes.get(0, -1)
+        result['isSubscriberMatch'] = float(numpy.count_nonzero(
+            (reels[:, 0] != zero) & (reels[:, 0] == reels[:, 1])
+            & (reels[:, 0] == reels[:, 2])) / spins)
+    return result
+
+
+def odds(emotePool: 'pool.EmotePool',
+         variant: str,
+         spins: int = 1000000,
+         size: int = sampleSize,
+         seed: Optional[int] = None) -> List[Odds]:
+    """
+    The chance of every flag recorded for an attempt of the variant, the
+    category flags are only recorded by Twitch slots
+    """
+    spinLayout: Layout = layout(emotePool, variant, size)
+    categories: Tuple[scoring.Category, ...] = (
+        emotePool.categories if variant == 'twitch' else ())
+    groups: bool = variant == 'twitch'
+    exactOdds: Dict[str, float] = exact(spinLayout, categories, groups)
+    simulated: Dict[str, float] = simulate(spinLayout, categories, groups,
+                                           spins, seed)
+    return [Odds(flag, exactOdds[flag], simulated[flag])
+            for flag in exactOdds]
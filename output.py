@@ -0,0 +1,87 @@
+import asyncio
+from datetime import timedelta
+from typing import Iterable, List, Optional  # noqa: F401
+
+from bot import data  # noqa: F401
+
+maxLength: int = 500
+digestWindow: timedelta = timedelta(seconds=10)
+
+
+def pack(lines: Iterable[str], separator: str) -> List[str]:
+    """
+    Join the lines into as few messages as fit in the Twitch message length
+    """
+    messages: List[str] = []
+    line: str
+    for line in lines:
+        if messages and (len(messages[-1]) + len(separator) + len(line)
+                         <= maxLength):
+            messages[-1] += separator + line
+        else:
+            messages.append(line)
+    return messages
+
+
+class Digest:
+    """
+    Collects the results of a channel and sends them together once
+    digestWindow passed since the first one
+    """
+    def __init__(self,
+                 chat: 'data.Channel',
+                 window: timedelta = digestWindow) -> None:
+        self.chat: data.Channel = chat
+        self.window: timedelta = window
+        self.lines: List[str] = []
+        self._task: Optional[asyncio.Future] = None
+
+    def add(self, line: str) -> None:
+        self.lines.append(line)
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._send_later())
+
+    async def _send_later(self) -> None:
+        try:
+            await asyncio.sleep(self.window.total_seconds())
+        finally:
+            self._task = None
+            self.flush()
+
+    def flush(self) -> None:
+        if self.lines:
+            self.chat.send(pack(self.lines, ' / '))
+            self.lines = []
+
+
+def digest(chat: 'data.Channel') -> Digest:
+    if 'slotsDigest' not in chat.sessionData:
+        chat.sessionData['slotsDigest'] = Digest(chat)
+    return chat.sessionData['slotsDigest']
+
+
+class SpinOutput:
+    """
+    The chat output of one spin, the informational lines are sent as one
+    message and the moderator commands on their own after it
+    """
+    def __init__(self) -> None:
+        self.lines: List[str] = []
+        self.commands: List[str] = []
+
+    def say(self, line: str) -> None:
+        self.lines.append(line)
+
+    def command(self, command: str) -> None:
+        self.commands.append(command)
+
+    def send(self,
+             chat: 'data.Channel',
+             channelDigest: Optional[Digest] = None) -> None:
+        if self.lines:
+            if channelDigest is not None:
+                channelDigest.add(' - '.join(self.lines))
+            else:
+                chat.send(pack(self.lines, ' - '))
+        if self.commands:
+            chat.send(self.commands)
@@ -0,0 +1,150 @@
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, Generic, Iterable, List, Mapping  # noqa: F401
+from typing import Optional, Tuple, TypeVar  # noqa: F401
+
+from . import scoring
+from .scoring import Category
+
+Id = TypeVar('Id', int, str)
+
+poolDuration: timedelta = timedelta(minutes=5)
+
+
+class Sample(Dict[Id, str]):
+    """
+    The emotes drawn for a spin with the category masks and groups of each
+    """
+    def __init__(self, categories: Tuple[Category, ...]) -> None:
+        super().__init__()
+        self.categories: Tuple[Category, ...] = categories
+        # The emote ids in draw order, the reels index into it
+        self.ids: List[Id] = []
+        self.masks: Dict[Id, int] = {}
+        self.groups: Dict[Id, Any] = {}
+
+    def matches(self, selectedIds: Iterable[Id]) -> int:
+        """
+        The categories all the selected emotes belong to, as a bitmask
+        """
+        result: int = -1
+        emoteId: Id
+        for emoteId in selectedIds:
+            result &= self.masks[emoteId]
+        return result
+
+
+class EmotePool(Generic[Id]):
+    """
+    The emote universe of a slots variant, flattened into parallel tuples so
+    a spin only has to draw indexes
+
+    The category mask of every emote is computed when the pool is built.
+    Groups are optional extra keys, such as the Twitch emote set, defaulting
+    to the emote id.
+    """
+    __slots__ = ('ids', 'names', 'masks', 'groups', 'index', 'categories',
+                 'expires', 'source')
+
+    def __init__(self,
+                 emotes: Mapping[Id, str],
+                 expires: datetime,
+                 categories: Tuple[Category, ...] = (),
+                 groups: Optional[Mapping[Id, Any]] = None) -> None:
+        self.ids: Tuple[Id, ...] = tuple(emotes.keys())
+        self.names: Tuple[str, ...] = tuple(emotes[i] for i in self.ids)
+        self.masks: Tuple[int, ...] = tuple(scoring.mask(n, categories)
+                                            for n in self.names)
+        self.groups: Tuple[Any, ...] = tuple(
+            groups.get(i, i) if groups is not None else i for i in self.ids)
+        self.index: Dict[Id, int] = {i: n for n, i in enumerate(self.ids)}
+        self.categories: Tuple[Category, ...] = categories
+        self.expires: datetime = expires
+        # The cache data the pool was built from
+        self.source: int = fingerprint(emotes, groups)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def sample(self,
+               k: int,
+               rng: random.Random,
+               count: Optional[int] = None) -> Sample[Id]:
+        """
+        Draw k emotes with rng from the first count emotes of the pool
+        """
+        if count is None:
+            count = len(self.ids)
+        indexes: Any = (range(count) if k >= count
+                        else rng.sample(range(count), k))
+        emotes: Sample[Id] = Sample(self.categories)
+        i: int
+        for i in indexes:
+            emoteId: Id = self.ids[i]
+            emotes.ids.append(emoteId)
+            emotes[emoteId] = self.names[i]
+            emotes.masks[emoteId] = self.masks[i]
+            emotes.groups[emoteId] = self.groups[i]
+        return emotes
+
+    def put(self, emotes: Sample[Id], emoteId: Id, name: str) -> None:
+        """
+        Add an emote to a sample, even one that is not in the pool
+        """
+        if emoteId not in emotes:
+            emotes.ids.append(emoteId)
+        emotes[emoteId] = name
+        if emoteId in self.index:
+            emotes.masks[emoteId] = self.masks[self.index[emoteId]]
+            emotes.groups[emoteId] = self.groups[self.index[emoteId]]
+        else:
+            emotes.masks[emoteId] = scoring.mask(name, self.categories)
+            emotes.groups[emoteId] = emoteId
+
+
+def fingerprint(emotes: Mapping[Any, str],
+                groups: Optional[Mapping[Any, Any]] = None) -> int:
+    return hash((tuple(emotes.items()),
+                 tuple(groups.items()) if groups is not None else None))
+
+
+_pools: Dict[Tuple[str, Optional[str]], EmotePool] = {}
+
+
+def get(variant: str,
+        broadcaster: Optional[str],
+        now: datetime) -> Optional[EmotePool]:
+    emotePool: Optional[EmotePool] = _pools.get((variant, broadcaster))
+    if emotePool is None or emotePool.expires <= now:
+        return None
+    return emotePool
+
+
+def store(variant: str,
+          broadcaster: Optional[str],
+          emotes: Mapping[Any, str],
+          now: datetime,
+          groups: Optional[Mapping[Any, Any]] = None) -> EmotePool:
+    """
+    Keep the pool built from emotes, the pool already stored is kept for
+    another poolDuration when the cache still has the same emotes
+    """
+    categories: Tuple[Category, ...] = scoring.categoriesFor(broadcaster)
+    stored: Optional[EmotePool] = _pools.get((variant, broadcaster))
+    if (stored is not None and stored.categories == categories
+            and stored.source == fingerprint(emotes, groups)):
+        stored.expires = now + poolDuration
+        return stored
+    emotePool: EmotePool = EmotePool(emotes, now + poolDuration, categories,
+                                     groups)
+    _pools[variant, broadcaster] = emotePool
+    return emotePool
+
+
+def invalidate(variant: Optional[str] = None,
+               broadcaster: Optional[str] = None) -> None:
+    key: Tuple[str, Optional[str]]
+    for key in list(_pools):
+        if ((variant is None or key[0] == variant)
+                and (broadcaster is None or key[1] == broadcaster)):
+            del _pools[key]
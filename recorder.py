@@ -0,0 +1,185 @@
+import asyncio
+import atexit
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional  # noqa: F401
+from typing import Tuple  # noqa: F401
+
+import aioodbc.cursor  # noqa: F401
+
+import bot.globals
+from bot import utils
+from lib.database import DatabaseMain
+from . import timing
+
+
+class Row(NamedTuple):
+    sqlite: str
+    postgres: str
+    params: Tuple[Any, ...]
+
+
+def row(query: str,
+        params: Tuple[Any, ...],
+        postgres: Optional[str] = None) -> Row:
+    return Row(query, postgres if postgres is not None else query, params)
+
+
+class SlotsRecorder:
+    """
+    Write-behind writer for the slots attempt and winner tables
+
+    Rows are queued from every channel and written by a background task with
+    executemany, one transaction per batch. A batch is written when it
+    reaches batchSize rows or flushInterval seconds after its first row. The
+    queue is bounded, record() waits when it is full. The rows of one
+    record() call are queued together and always land in the same batch, so
+    they commit in one transaction. Every row has its query for each
+    dialect.
+
+    A batch that fails to write is retried, ahead of the queued rows, with a
+    delay doubling from retryDelay. Its rows are only dropped, and counted
+    in dropped, after maxAttempts failed writes.
+    """
+    def __init__(self,
+                 maxQueue: int = 1000,
+                 batchSize: int = 100,
+                 flushInterval: float = 1.0,
+                 maxAttempts: int = 5,
+                 retryDelay: float = 1.0) -> None:
+        self.maxQueue: int = maxQueue
+        self.batchSize: int = batchSize
+        self.flushInterval: float = flushInterval
+        self.maxAttempts: int = maxAttempts
+        self.retryDelay: float = retryDelay
+        self.batches: int = 0
+        self.rows: int = 0
+        self.retries: int = 0
+        self.dropped: int = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Future] = None
+        self._closing: bool = False
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def idle(self) -> bool:
+        return not self.queued and (self._task is None or self._task.done())
+
+    async def record(self, rows: List[Row]) -> None:
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.maxQueue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        await self._queue.put(rows)
+
+    async def _run(self) -> None:
+        while (bot.globals.running and not self._closing) or self.queued:
+            batch: List[Row] = await self._collect()
+            if batch:
+                await self._write(batch)
+
+    async def _collect(self) -> List[Row]:
+        assert self._queue is not None
+        loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+        batch: List[Row] = []
+        timeout: float = self.flushInterval
+        deadline: float = loop.time() + timeout
+        while len(batch) < self.batchSize and timeout > 0:
+            try:
+                first: bool = not batch
+                batch.extend(
+                    await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+            if first:
+                deadline = loop.time() + self.flushInterval
+            timeout = deadline - loop.time()
+        return batch
+
+    async def _write(self, batch: List[Row]) -> None:
+        attempt: int
+        for attempt in range(1, self.maxAttempts + 1):
+            try:
+                await self._writeBatch(batch)
+                self.batches += 1
+                self.rows += len(batch)
+                return
+            except Exception:
+                if attempt == self.maxAttempts:
+                    self.dropped += len(batch)
+                    utils.logException(
+                        f'Dropped {len(batch)} slots rows after {attempt} '
+                        'failed writes')
+                    return
+            self.retries += 1
+            await asyncio.sleep(self.retryDelay * 2 ** (attempt - 1))
+
+    async def _writeBatch(self, batch: List[Row]) -> None:
+        db: DatabaseMain
+        async with DatabaseMain.acquire() as db:
+            grouped: Dict[str, List[Tuple[Any, ...]]] = OrderedDict()
+            batchRow: Row
+            for batchRow in batch:
+                query: str = (batchRow.sqlite if db.isSqlite
+                              else batchRow.postgres)
+                grouped.setdefault(query, []).append(batchRow.params)
+            cursor: aioodbc.cursor.Cursor
+            with timing.span(timing.anyChannel, timing.anyChannel, 'write'):
+                async with await db.cursor() as cursor:
+                    paramsList: List[Tuple[Any, ...]]
+                    for query, paramsList in grouped.items():
+                        await cursor.executemany(query, paramsList)
+                    await db.commit()
+
+    async def flush(self) -> None:
+        batch: List[Row] = []
+        while self.queued:
+            assert self._queue is not None
+            batch.extend(self._queue.get_nowait())
+            if len(batch) >= self.batchSize:
+                await self._write(batch)
+                batch = []
+        if batch:
+            await self._write(batch)
+
+    async def shutdown(self) -> None:
+        self._closing = True
+        try:
+            if self._task is not None:
+                await self._task
+            await self.flush()
+        finally:
+            self._task = None
+            self._closing = False
+
+
+_recorder: SlotsRecorder = SlotsRecorder()
+
+
+def get() -> SlotsRecorder:
+    return _recorder
+
+
+async def record(rows: List[Row]) -> None:
+    await _recorder.record(rows)
+
+
+async def shutdown() -> None:
+    await _recorder.shutdown()
+
+
+def shutdownAtExit() -> None:
+    """
+    Write the rows still queued when the bot process exits
+    """
+    if _recorder.idle:
+        return
+    loop: asyncio.AbstractEventLoop = asyncio.get_event_loop()
+    if loop.is_closed() or loop.is_running():
+        return
+    loop.run_until_complete(_recorder.shutdown())
+
+
+atexit.register(shutdownAtExit)
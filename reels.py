@@ -0,0 +1,83 @@
+import random
+from typing import Any, List, NamedTuple, Optional, Tuple  # noqa: F401
+
+from bot import data  # noqa: F401
+from lib.cache import CacheStore
+from . import pool  # noqa: F401
+from .variant import SlotVariant
+
+length: int = 3
+
+
+class Spin(NamedTuple):
+    seed: int
+    counter: int
+    random: random.Random
+
+
+def newSeed() -> int:
+    # Fits a signed BIGINT
+    return random.SystemRandom().getrandbits(63)
+
+
+def generator(seed: int, counter: int) -> random.Random:
+    """
+    The generator of one spin, every draw of the spin comes from it so the
+    spin is replayed from the seed and counter alone
+    """
+    return random.Random((seed << 32) + counter)
+
+
+class ReelRandom:
+    """
+    The seeded source of the spins of a channel
+
+    Every spin takes the next counter. The seed and counter of an attempt are
+    recorded with it in spinSeed and spinCounter.
+    """
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.seed: int = seed if seed is not None else newSeed()
+        self.counter: int = 0
+
+    def next(self) -> Spin:
+        self.counter += 1
+        return Spin(self.seed, self.counter,
+                    generator(self.seed, self.counter))
+
+
+def get(chat: 'data.Channel') -> ReelRandom:
+    if 'slotsReels' not in chat.sessionData:
+        chat.sessionData['slotsReels'] = ReelRandom()
+    return chat.sessionData['slotsReels']
+
+
+def seed(chat: 'data.Channel', value: int) -> None:
+    """
+    Restart the spins of the channel from the seed
+    """
+    chat.sessionData['slotsReels'] = ReelRandom(value)
+
+
+def draw(rng: random.Random, emotes: 'pool.Sample') -> List[Any]:
+    """
+    The emote ids of all the reels, drawn in one call
+    """
+    return rng.choices(emotes.ids, k=length)
+
+
+async def replay(slotVariant: SlotVariant,
+                 chat: 'data.Channel',
+                 dataCache: CacheStore,
+                 spinSeed: int,
+                 spinCounter: int
+                 ) -> Optional[Tuple['pool.Sample', List[Any]]]:
+    """
+    Draw a recorded spin again, exact while the emote pool of the channel
+    is the one the spin had
+    """
+    rng: random.Random = generator(spinSeed, spinCounter)
+    emotes: Optional[pool.Sample]
+    emotes = await slotVariant.generatePool(chat, dataCache, rng)
+    if emotes is None:
+        return None
+    return emotes, draw(rng, emotes)
@@ -0,0 +1,231 @@
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Set  # noqa: F401
+from typing import Tuple  # noqa: F401
+
+import aioodbc.cursor  # noqa: F401
+
+from lib.database import DatabaseMain
+from .variant import SlotVariant
+
+
+class SlotStats(NamedTuple):
+    attempts: int
+    wins: int
+    lastWin: Optional[datetime]
+
+
+class PreSpinState(NamedTuple):
+    isBot: bool
+    botMarked: datetime
+    lastAttempt: datetime
+    lastSlots: datetime
+    attempts: List[datetime]
+
+
+class AttemptSpin(NamedTuple):
+    variant: str
+    broadcaster: str
+    spinSeed: Optional[int]
+    spinCounter: Optional[int]
+    emotes: List[str]
+    emoteIds: List[str]
+
+
+class Statement(NamedTuple):
+    name: str
+    sqlite: str
+    postgres: str
+
+
+def statement(name: str,
+              sqlite: str,
+              postgres: Optional[str] = None) -> Statement:
+    """
+    A query, written with ? parameters, with its PostgreSQL text when it
+    differs
+    """
+    return Statement(name, sqlite,
+                     postgres if postgres is not None else sqlite)
+
+
+markSlotBotsQuery: Statement = statement('mark_bot', '''
+REPLACE INTO slot_bots (broadcaster, bot, marked) VALUES (?, ?, ?)
+''', '''
+INSERT INTO slot_bots (broadcaster, bot, marked) VALUES (?, ?, ?)
+    ON CONFLICT ON CONSTRAINT slot_bots_pkey
+    DO UPDATE SET marked=excluded.marked
+''')
+botMarksQuery: Statement = statement('bot_marks', '''
+SELECT broadcaster, bot, marked FROM slot_bots WHERE marked>=?
+''')
+slotStatsQuery: Statement = statement('stats', '''
+SELECT variant, attempts, wins, lastWin
+    FROM slot_stats
+    WHERE broadcaster=? AND twitchUser=?
+''')
+topWinnersQuery: Statement = statement('top_winners', '''
+SELECT twitchUser, wins
+    FROM slot_stats
+    WHERE broadcaster=? AND variant=? AND wins>0
+    ORDER BY wins DESC
+    LIMIT ?
+''')
+attemptSpinQuery: Statement = statement('attempt_spin', '''
+SELECT variant, broadcaster, spinSeed, spinCounter, emoticon1, emoticon2,
+        emoticon3, emoticonId1, emoticonId2, emoticonId3
+    FROM slot_attempts WHERE id=?
+''')
+# SQLite only, retention.archive moves the old attempts there
+attemptSpinArchiveQuery: Statement = statement('attempt_spin_archive', '''
+SELECT variant, broadcaster, spinSeed, spinCounter, emoticon1, emoticon2,
+        emoticon3, emoticonId1, emoticonId2, emoticonId3
+    FROM slot_attempts_archive WHERE id=?
+''')
+
+
+def preSpinQuery(alias: str, withMark: bool, withAttempts: bool) -> str:
+    query: str = f'''
+SELECT 'user' AS kind, MAX(attemptTime) AS {alias}
+    FROM slot_attempts
+    WHERE broadcaster=? AND variant=? AND twitchUser=? AND attemptTime>=?
+UNION ALL
+SELECT 'channel', MAX(attemptTime)
+    FROM slot_attempts WHERE broadcaster=? AND attemptTime>=?
+'''
+    if withMark:
+        query += '''\
+UNION ALL
+SELECT 'bot', marked FROM slot_bots WHERE broadcaster=? AND bot=?
+'''
+    if withAttempts:
+        query += '''\
+UNION ALL
+SELECT 'attempt', attemptTime
+    FROM slot_attempts
+    WHERE broadcaster=? AND variant=? AND twitchUser=? AND attemptTime>=?
+'''
+    return query
+
+
+preSpinStates: Dict[Tuple[bool, bool], Statement] = {
+    (withMark, withAttempts): statement(
+        'prespin' + '_mark' * withMark + '_attempts' * withAttempts,
+        preSpinQuery('"[timestamp]"', withMark, withAttempts),
+        preSpinQuery('attemptTime', withMark, withAttempts))
+    for withMark in (False, True) for withAttempts in (False, True)
+    }
+
+
+class SlotsRepository:
+    """
+    The slots queries over one DatabaseMain connection
+
+    Every query of a repository runs on one cursor, opened by the first
+    query and closed with the repository, so a spin opens a single cursor.
+    The queries are fixed texts per dialect, so the statement cache of the
+    driver finds them already compiled.
+    """
+    def __init__(self, database: DatabaseMain) -> None:
+        self.database: DatabaseMain = database
+        self._cursor: Optional[aioodbc.cursor.Cursor] = None
+
+    async def __aenter__(self) -> 'SlotsRepository':
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._cursor is not None:
+            await self._cursor.close()
+            self._cursor = None
+
+    async def execute(self,
+                      query: Statement,
+                      params: Tuple[Any, ...]) -> aioodbc.cursor.Cursor:
+        if self._cursor is None:
+            self._cursor = await self.database.cursor()
+        return await self._cursor.execute(
+            query.sqlite if self.database.isSqlite else query.postgres,
+            params)
+
+    async def markSlotBots(self,
+                           broadcaster: str,
+                           user: str,
+                           timestamp: datetime) -> bool:
+        cursor: aioodbc.cursor.Cursor = await self.execute(
+            markSlotBotsQuery, (broadcaster, user, timestamp))
+        return cursor.rowcount != 0
+
+    async def botMarks(self,
+                       since: datetime) -> List[Tuple[str, str, datetime]]:
+        return [(broadcaster, user, marked)
+                async for broadcaster, user, marked
+                in await self.execute(botMarksQuery, (since,))]
+
+    async def preSpinState(self,
+                           broadcaster: str,
+                           slotVariant: SlotVariant,
+                           user: str,
+                           since: datetime,
+                           markedSince: datetime,
+                           withAttempts: bool = True,
+                           withMark: bool = True) -> PreSpinState:
+        """
+        Fetch everything the cooldown and bot checks need in one query,
+        the attempts since since and the user as a bot if marked since
+        markedSince
+        """
+        params: Tuple[Any, ...] = (broadcaster, slotVariant.name, user, since,
+                                   broadcaster, since)
+        if withMark:
+            params += broadcaster, user
+        if withAttempts:
+            params += broadcaster, slotVariant.name, user, since
+        marked: datetime = datetime.min
+        lastAttempt: datetime = datetime.min
+        lastSlots: datetime = datetime.min
+        attempts: List[datetime] = []
+        kind: str
+        value: Optional[datetime]
+        async for kind, value in await self.execute(
+                preSpinStates[withMark, withAttempts], params):
+            if value is None:
+                continue
+            if kind == 'bot':
+                marked = value
+            elif kind == 'user':
+                lastAttempt = value
+            elif kind == 'channel':
+                lastSlots = value
+            else:
+                attempts.append(value)
+        attempts.sort()
+        return PreSpinState(marked >= markedSince, marked, lastAttempt,
+                            lastSlots, attempts)
+
+    async def slotStats(self,
+                        broadcaster: str,
+                        user: str) -> Dict[str, SlotStats]:
+        return {row[0]: SlotStats(*row[1:]) async for row
+                in await self.execute(slotStatsQuery, (broadcaster, user))}
+
+    async def attemptSpin(self, attemptId: int) -> Optional[AttemptSpin]:
+        cursor: aioodbc.cursor.Cursor = await self.execute(
+            attemptSpinQuery, (attemptId,))
+        row: Optional[Tuple[Any, ...]] = await cursor.fetchone()
+        if row is None and self.database.isSqlite:
+            cursor = await self.execute(attemptSpinArchiveQuery, (attemptId,))
+            row = await cursor.fetchone()
+        if row is None:
+            return None
+        return AttemptSpin(row[0], row[1], row[2], row[3], list(row[4:7]),
+                           list(row[7:10]))
+
+    async def topWinners(self,
+                         broadcaster: str,
+                         slotVariant: SlotVariant,
+                         limit: int = 5) -> List[Tuple[str, int]]:
+        return [(user, wins) async for user, wins
+                in await self.execute(
+                    topWinnersQuery, (broadcaster, slotVariant.name, limit))]
@@ -0,0 +1,189 @@
+import asyncio
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional  # noqa: F401
+
+import aioodbc.cursor  # noqa: F401
+
+import bot.globals
+from bot import utils
+from lib.database import DatabaseMain
+from . import marks
+
+# Raw attempts are kept for the current month and this many before it
+retentionMonths: int = 3
+# SQLite keeps the attempts older than this in the archive tables
+hotWindow: timedelta = timedelta(hours=2)
+interval: timedelta = timedelta(hours=1)
+
+
+def monthStart(timestamp: datetime) -> datetime:
+    return datetime(timestamp.year, timestamp.month, 1)
+
+
+def addMonths(month: datetime, months: int) -> datetime:
+    index: int = month.year * 12 + month.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+async def ensurePartitions(database: DatabaseMain,
+                           timestamp: datetime) -> None:
+    """
+    Create the Postgres partitions of the current and the next month
+    """
+    if database.isSqlite:
+        return
+    month: datetime = monthStart(timestamp)
+    cursor: aioodbc.cursor.Cursor
+    async with await database.cursor() as cursor:
+        await cursor.execute('''
+SELECT slots_attempt_partition('slot_attempts', ?),
+    slots_attempt_partition('slot_attempts', ?)
+''', (month.date(), addMonths(month, 1).date()))
+        await database.commit()
+
+
+async def archive(database: DatabaseMain, timestamp: datetime) -> int:
+    """
+    Move the SQLite attempts from before the current month to the archive
+    table, keeping at least hotWindow of them in slot_attempts
+    """
+    if not database.isSqlite:
+        return 0
+    before: datetime = monthStart(timestamp - hotWindow)
+    cursor: aioodbc.cursor.Cursor
+    async with await database.cursor() as cursor:
+        await cursor.execute('''
+INSERT INTO slot_attempts_archive
+    SELECT * FROM slot_attempts WHERE attemptTime<?
+''', (before,))
+        await cursor.execute('''
+DELETE FROM slot_attempts WHERE attemptTime<?
+''', (before,))
+        moved: int = cursor.rowcount
+        await database.commit()
+    return moved
+
+
+async def rollupRows(cursor: aioodbc.cursor.Cursor,
+                     isSqlite: bool,
+                     source: str,
+                     before: datetime) -> None:
+    if isSqlite:
+        # SQLite only has ON CONFLICT DO UPDATE from 3.24, the REPLACE reads
+        # the old row in the same statement
+        await cursor.execute(f'''
+REPLACE INTO slot_attempts_daily
+    (broadcaster, variant, twitchUser, day, attempts, wins)
+    SELECT n.broadcaster, n.variant, n.twitchUser, n.day,
+            COALESCE(d.attempts, 0) + n.attempts, COALESCE(d.wins, 0) + n.wins
+        FROM (SELECT broadcaster, variant, twitchUser,
+                    DATE(attemptTime) AS day, COUNT(*) AS attempts,
+                    SUM(CASE WHEN isWin THEN 1 ELSE 0 END) AS wins
+                FROM {source}
+                WHERE attemptTime<?
+                GROUP BY broadcaster, variant, twitchUser, DATE(attemptTime)
+            ) AS n
+            LEFT JOIN slot_attempts_daily AS d
+                ON d.broadcaster=n.broadcaster AND d.variant=n.variant
+                    AND d.twitchUser=n.twitchUser AND d.day=n.day
+''', (before,))
+        return
+    await cursor.execute(f'''
+INSERT INTO slot_attempts_daily
+    (broadcaster, variant, twitchUser, day, attempts, wins)
+    SELECT broadcaster, variant, twitchUser, CAST(attemptTime AS DATE),
+            COUNT(*), SUM(CASE WHEN isWin THEN 1 ELSE 0 END)
+        FROM {source}
+        WHERE attemptTime<?
+        GROUP BY broadcaster, variant, twitchUser, CAST(attemptTime AS DATE)
+    ON CONFLICT (broadcaster, variant, twitchUser, day)
+    DO UPDATE SET attempts=slot_attempts_daily.attempts + excluded.attempts,
+        wins=slot_attempts_daily.wins + excluded.wins
+''', (before,))
+
+
+async def rollup(database: DatabaseMain, timestamp: datetime) -> int:
+    """
+    Roll the attempts older than retentionMonths into slot_attempts_daily
+    and drop them, whole partitions at a time on Postgres
+
+    Returns the number of partitions dropped or rows deleted on SQLite.
+    """
+    before: datetime = addMonths(monthStart(timestamp), -retentionMonths)
+    removed: int = 0
+    cursor: aioodbc.cursor.Cursor
+    async with await database.cursor() as cursor:
+        if database.isSqlite:
+            await rollupRows(cursor, True, 'slot_attempts_archive', before)
+            await cursor.execute('''
+DELETE FROM slot_attempts_archive WHERE attemptTime<?
+''', (before,))
+            removed = cursor.rowcount
+            await database.commit()
+            return removed
+
+        partitions: List[str] = [partition async for partition, in
+                                 await cursor.execute('''
+SELECT c.relname
+    FROM pg_inherits AS i
+        JOIN pg_class AS c ON c.oid=i.inhrelid
+        JOIN pg_class AS p ON p.oid=i.inhparent
+    WHERE p.relname='slot_attempts'
+''')]
+        partition: str
+        for partition in partitions:
+            match = re.fullmatch(r'slot_attempts_(\d{4})(\d{2})', partition)
+            if match is None:
+                continue
+            month: datetime = datetime(int(match.group(1)),
+                                       int(match.group(2)), 1)
+            if month >= before:
+                continue
+            await rollupRows(cursor, False, partition, addMonths(month, 1))
+            await cursor.execute(f'DROP TABLE {partition}')
+            removed += 1
+        await rollupRows(cursor, False, 'slot_attempts_default', before)
+        await cursor.execute('''
+DELETE FROM slot_attempts_default WHERE attemptTime<?
+''', (before,))
+        await database.commit()
+    return removed
+
+
+async def maintain(timestamp: datetime) -> None:
+    db: DatabaseMain
+    async with DatabaseMain.acquire() as db:
+        await ensurePartitions(db, timestamp)
+        await archive(db, timestamp)
+        await rollup(db, timestamp)
+        await marks.sweep(db, timestamp - marks.markDuration)
+    marks.get().prune(timestamp - marks.markDuration)
+
+
+class RetentionJob:
+    """
+    Runs maintain every interval while the bot runs, started with the first
+    recorded attempt
+    """
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Future] = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        while bot.globals.running:
+            try:
+                await maintain(datetime.utcnow())
+            except Exception:
+                utils.logException()
+            await asyncio.sleep(interval.total_seconds())
+
+
+_job: RetentionJob = RetentionJob()
+
+
+def start() -> None:
+    _job.start()
@@ -0,0 +1,80 @@
+import asyncio
+from datetime import timedelta
+from typing import Dict, Optional  # noqa: F401
+
+from bot import data  # noqa: F401
+
+queueLength: int = 5
+
+
+class SpinScheduler:
+    """
+    Serves the slots spins of a channel in arrival order, each one as soon
+    as the channel cooldown allows
+
+    At most maxQueue users wait at once, including the one spinning, and a
+    user cannot queue twice. Everyone else is dropped, the users already
+    queued are counted apart in duplicates.
+    """
+    def __init__(self, maxQueue: int = queueLength) -> None:
+        self.maxQueue: int = maxQueue
+        self.lock: asyncio.Lock = asyncio.Lock()
+        self.admitted: Dict[str, float] = {}
+        self.served: int = 0
+        self.dropped: int = 0
+        self.duplicates: int = 0
+        self.maxDepth: int = 0
+        self.totalWait: float = 0.0
+        self.maxWait: float = 0.0
+
+    @property
+    def depth(self) -> int:
+        return len(self.admitted)
+
+    @property
+    def averageWait(self) -> float:
+        return self.totalWait / self.served if self.served else 0.0
+
+    def isQueued(self, user: str) -> bool:
+        return user in self.admitted
+
+    def admit(self, user: str) -> bool:
+        if user in self.admitted:
+            self.duplicates += 1
+            return False
+        if len(self.admitted) >= self.maxQueue:
+            self.dropped += 1
+            return False
+        self.admitted[user] = asyncio.get_event_loop().time()
+        self.maxDepth = max(self.maxDepth, len(self.admitted))
+        return True
+
+    def waited(self, user: str) -> timedelta:
+        return timedelta(
+            seconds=asyncio.get_event_loop().time() - self.admitted[user])
+
+    def start(self, user: str) -> timedelta:
+        """
+        Record that the spin of user starts and return how long it waited
+        """
+        waited: float = asyncio.get_event_loop().time() - self.admitted[user]
+        self.served += 1
+        self.totalWait += waited
+        self.maxWait = max(self.maxWait, waited)
+        return timedelta(seconds=waited)
+
+    def leave(self, user: str) -> None:
+        self.admitted.pop(user, None)
+
+
+def find(chat: 'data.Channel') -> Optional[SpinScheduler]:
+    """
+    The scheduler of the channel if it has had a spin
+    """
+    return chat.sessionData.get('slotsScheduler')
+
+
+def get(chat: 'data.Channel') -> SpinScheduler:
+    if 'slotsScheduler' not in chat.sessionData:
+        chat.sessionData['slotsScheduler'] = SpinScheduler()
+    return chat.sessionData['slotsScheduler']
@@ -0,0 +1,59 @@
+from typing import Callable, Dict, Iterable, List, NamedTuple  # noqa: F401
+from typing import Optional, Tuple  # noqa: F401
+
+
+class Category(NamedTuple):
+    """
+    A set of emotes that scores a match when all the reels belong to it, the
+    column is the attempt table column the match is recorded in. A match of
+    a category without a column is only said in chat.
+    """
+    name: str
+    test: Callable[[str], bool]
+    column: Optional[str] = None
+
+
+categories: List[Category] = []
+channelCategories: Dict[str, List[Category]] = {}
+
+
+def register(category: Category, broadcaster: Optional[str] = None) -> None:
+    """
+    Add a category for every channel or, with a broadcaster, for one channel
+
+    The pools built with the previous categories are dropped, the next spin
+    loads them again with the new masks.
+    """
+    # pool imports scoring for the masks
+    from . import pool
+    if broadcaster is None:
+        categories.append(category)
+        pool.invalidate()
+    else:
+        channelCategories.setdefault(broadcaster, []).append(category)
+        pool.invalidate(broadcaster=broadcaster)
+
+
+def categoriesFor(broadcaster: Optional[str]) -> Tuple[Category, ...]:
+    if broadcaster is None or broadcaster not in channelCategories:
+        return tuple(categories)
+    return tuple(categories + channelCategories[broadcaster])
+
+
+def mask(name: str, emoteCategories: Iterable[Category]) -> int:
+    result: int = 0
+    bit: int
+    category: Category
+    for bit, category in enumerate(emoteCategories):
+        if category.test(name):
+            result |= 1 << bit
+    return result
+
+
+def matched(matchedMask: int,
+            emoteCategories: Iterable[Category]) -> List[Category]:
+    """
+    The categories of the bits set in matchedMask
+    """
+    return [category for bit, category in enumerate(emoteCategories)
+            if matchedMask & (1 << bit)]
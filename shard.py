@@ -0,0 +1,149 @@
+"""
+Spread the slots of the channels over several bot processes
+
+Every process joins the channels as usual and only spins the slots of the
+channels the hash ring gives it. The processes are configured with
+
+    SLOTS_WORKERS=slots1,slots2,slots3  the names of all the processes
+    SLOTS_WORKER=slots2                 the name of this one
+    SLOTS_SHARED_STORE=/var/lib/botgotsthis/slots-shared.db
+
+Without SLOTS_WORKER a process spins every channel. When the workers change
+a channel moves to another process, the shared store keeps the cooldowns so
+the new owner still waits out channelCooldown.
+
+Every worker writes a heartbeat to the shared store every heartbeatInterval
+once it joins a channel. A worker not seen for workerTimeout is left out of
+the ring, its channels move to the other workers until it is back. While
+the workers disagree on who is alive, for up to heartbeatInterval, a
+channel can be spun by two of them; claiming the channel in the shared
+store still keeps those spins channelCooldown apart. Without a shared store
+the workers can not see each other and the channels of a dead worker stop
+spinning until SLOTS_WORKERS is changed.
+"""
+import asyncio
+import bisect
+import hashlib
+import os
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple  # noqa: F401
+
+import bot.globals
+from bot import utils
+from . import shared
+
+replicas: int = 64
+heartbeatInterval: timedelta = timedelta(seconds=15)
+workerTimeout: timedelta = timedelta(minutes=1)
+
+
+def hashKey(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+
+class HashRing:
+    """
+    Consistent hashing of channels to workers, adding or removing a worker
+    only moves the channels next to its points on the ring
+    """
+    def __init__(self, workers: List[str], replicas: int = replicas) -> None:
+        points: List[Tuple[int, str]] = sorted(
+            (hashKey(f'{worker}#{i}'), worker)
+            for worker in workers for i in range(replicas))
+        self.hashes: List[int] = [h for h, _ in points]
+        self.workers: List[str] = [w for _, w in points]
+
+    def owner(self, channel: str) -> Optional[str]:
+        if not self.workers:
+            return None
+        index: int = bisect.bisect(self.hashes, hashKey(channel))
+        return self.workers[index % len(self.workers)]
+
+
+class Shard:
+    """
+    The channels of this worker on the ring of the workers alive
+
+    Every worker counts as alive until workerTimeout after the start, so
+    the workers starting together do not move channels around.
+    """
+    def __init__(self,
+                 worker: Optional[str] = None,
+                 workers: Optional[List[str]] = None) -> None:
+        self.worker: Optional[str] = worker
+        self.workers: List[str] = workers or []
+        self.alive: List[str] = self.workers
+        self.ring: HashRing = HashRing(self.alive)
+        self.started: datetime = datetime.utcnow()
+        self._owners: Dict[str, bool] = {}
+        self._task: Optional[asyncio.Future] = None
+
+    def start(self) -> None:
+        if self.worker is None or shared.get() is None:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        while bot.globals.running:
+            try:
+                await self.heartbeat(datetime.utcnow())
+            except Exception:
+                utils.logException()
+            await asyncio.sleep(heartbeatInterval.total_seconds())
+
+    async def heartbeat(self, timestamp: datetime) -> None:
+        store: Optional[shared.SharedStore] = shared.get()
+        if self.worker is None or store is None:
+            return
+        seen: List[str] = await store.heartbeat(self.worker, timestamp,
+                                                timestamp - workerTimeout)
+        if timestamp - self.started < workerTimeout:
+            return
+        self.update([w for w in self.workers
+                     if w in seen or w == self.worker])
+
+    def update(self, alive: List[str]) -> None:
+        if alive == self.alive:
+            return
+        self.alive = alive
+        self.ring = HashRing(alive)
+        self._owners = {}
+
+    def owns(self, channel: str) -> bool:
+        if self.worker is None:
+            return True
+        if channel not in self._owners:
+            self._owners[channel] = self.ring.owner(channel) == self.worker
+        return self._owners[channel]
+
+
+def fromEnvironment() -> Shard:
+    worker: Optional[str] = os.environ.get('SLOTS_WORKER') or None
+    workers: List[str] = [w.strip() for w
+                          in os.environ.get('SLOTS_WORKERS', '').split(',')
+                          if w.strip()]
+    return Shard(worker, workers)
+
+
+_shard: Optional[Shard] = None
+
+
+def get() -> Shard:
+    global _shard
+    if _shard is None:
+        _shard = fromEnvironment()
+    return _shard
+
+
+def configure(shard: Shard) -> None:
+    global _shard
+    _shard = shard
+
+
+def start() -> None:
+    get().start()
+
+
+def owns(channel: str) -> bool:
+    return get().owns(channel)
@@ -0,0 +1,229 @@
+import abc
+import asyncio
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Optional, TypeVar  # noqa: F401
+
+# Entries older than this no longer affect any cooldown
+keepFor: timedelta = timedelta(hours=1)
+timeFormat: str = '%Y-%m-%d %H:%M:%S.%f'
+
+T = TypeVar('T')
+
+
+class SharedStore(abc.ABC):
+    """
+    Cooldown and bot mark state shared by the bot processes spinning slots
+
+    Only the times the cooldown checks need are kept, the attempts stay in
+    the database.
+    """
+    @abc.abstractmethod
+    async def claim(self,
+                    channel: str,
+                    timestamp: datetime,
+                    cooldown: timedelta) -> Optional[datetime]:
+        """
+        Take the channel for a spin at timestamp, atomically over every
+        process. Returns None when taken, otherwise the time of the spin
+        still within cooldown.
+        """
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def lastAttempt(self,
+                          channel: str,
+                          variant: str,
+                          user: str) -> datetime:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def record(self,
+                     channel: str,
+                     variant: str,
+                     user: str,
+                     timestamp: datetime) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def botMarked(self, channel: str, user: str) -> datetime:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def mark(self, channel: str, user: str, timestamp: datetime) -> None:
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    async def heartbeat(self,
+                        worker: str,
+                        timestamp: datetime,
+                        since: datetime) -> List[str]:
+        """
+        Record worker as alive at timestamp, returns the workers seen alive
+        since then
+        """
+        raise NotImplementedError()
+
+
+class SqliteSharedStore(SharedStore):
+    """
+    SharedStore in a SQLite file, for processes on one host and for tests
+
+    Every call is a short local transaction. The calls run one at a time on
+    a thread of their own, so a busy file never blocks the event loop.
+    """
+    def __init__(self, path: str) -> None:
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='slots-shared')
+        # Created here, only ever used from the executor thread
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            path, timeout=5, isolation_level=None, check_same_thread=False)
+        self.connection.executescript('''
+CREATE TABLE IF NOT EXISTS shared_channels (
+    channel VARCHAR NOT NULL PRIMARY KEY,
+    lastSlots VARCHAR NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shared_attempts (
+    channel VARCHAR NOT NULL,
+    variant VARCHAR NOT NULL,
+    twitchUser VARCHAR NOT NULL,
+    attemptTime VARCHAR NOT NULL,
+    PRIMARY KEY (channel, variant, twitchUser)
+);
+CREATE TABLE IF NOT EXISTS shared_bots (
+    channel VARCHAR NOT NULL,
+    bot VARCHAR NOT NULL,
+    marked VARCHAR NOT NULL,
+    PRIMARY KEY (channel, bot)
+);
+CREATE TABLE IF NOT EXISTS shared_workers (
+    worker VARCHAR NOT NULL PRIMARY KEY,
+    seen VARCHAR NOT NULL
+);
+''')
+        self.pruned: datetime = datetime.min
+
+    async def _run(self, function: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_event_loop().run_in_executor(
+            self.executor, function, *args)
+
+    def _time(self, query: str, *params: str) -> datetime:
+        row: Optional[sqlite3.Row] = self.connection.execute(
+            query, params).fetchone()
+        return datetime.strptime(row[0], timeFormat) if row else datetime.min
+
+    async def claim(self,
+                    channel: str,
+                    timestamp: datetime,
+                    cooldown: timedelta) -> Optional[datetime]:
+        return await self._run(self._claim, channel, timestamp, cooldown)
+
+    def _claim(self,
+               channel: str,
+               timestamp: datetime,
+               cooldown: timedelta) -> Optional[datetime]:
+        self.connection.execute('BEGIN IMMEDIATE')
+        try:
+            lastSlots: datetime = self._time('''
+SELECT lastSlots FROM shared_channels WHERE channel=?
+''', channel)
+            if timestamp - lastSlots < cooldown:
+                return lastSlots
+            self.connection.execute('''
+REPLACE INTO shared_channels (channel, lastSlots) VALUES (?, ?)
+''', (channel, timestamp.strftime(timeFormat)))
+            return None
+        finally:
+            self.connection.execute('COMMIT')
+
+    async def lastAttempt(self,
+                          channel: str,
+                          variant: str,
+                          user: str) -> datetime:
+        return await self._run(self._time, '''
+SELECT attemptTime FROM shared_attempts
+    WHERE channel=? AND variant=? AND twitchUser=?
+''', channel, variant, user)
+
+    async def record(self,
+                     channel: str,
+                     variant: str,
+                     user: str,
+                     timestamp: datetime) -> None:
+        await self._run(self._record, channel, variant, user, timestamp)
+
+    def _record(self,
+                channel: str,
+                variant: str,
+                user: str,
+                timestamp: datetime) -> None:
+        self.connection.execute('''
+REPLACE INTO shared_attempts (channel, variant, twitchUser, attemptTime)
+    VALUES (?, ?, ?, ?)
+''', (channel, variant, user, timestamp.strftime(timeFormat)))
+        if timestamp - self.pruned >= keepFor:
+            self.prune(timestamp - keepFor)
+
+    async def botMarked(self, channel: str, user: str) -> datetime:
+        return await self._run(self._time, '''
+SELECT marked FROM shared_bots WHERE channel=? AND bot=?
+''', channel, user)
+
+    async def mark(self, channel: str, user: str, timestamp: datetime) -> None:
+        await self._run(self.connection.execute, '''
+REPLACE INTO shared_bots (channel, bot, marked) VALUES (?, ?, ?)
+''', (channel, user, timestamp.strftime(timeFormat)))
+
+    async def heartbeat(self,
+                        worker: str,
+                        timestamp: datetime,
+                        since: datetime) -> List[str]:
+        return await self._run(self._heartbeat, worker, timestamp, since)
+
+    def _heartbeat(self,
+                   worker: str,
+                   timestamp: datetime,
+                   since: datetime) -> List[str]:
+        self.connection.execute('''
+REPLACE INTO shared_workers (worker, seen) VALUES (?, ?)
+''', (worker, timestamp.strftime(timeFormat)))
+        return [row[0] for row in self.connection.execute('''
+SELECT worker FROM shared_workers WHERE seen>=?
+''', (since.strftime(timeFormat),))]
+
+    def prune(self, before: datetime) -> None:
+        self.pruned = before
+        self.connection.execute('''
+DELETE FROM shared_attempts WHERE attemptTime<?
+''', (before.strftime(timeFormat),))
+        self.connection.execute('''
+DELETE FROM shared_bots WHERE marked<?
+''', (before.strftime(timeFormat),))
+
+
+_store: Optional[SharedStore] = None
+_configured: bool = False
+
+
+def fromEnvironment() -> Optional[SharedStore]:
+    path: Optional[str] = os.environ.get('SLOTS_SHARED_STORE')
+    return SqliteSharedStore(path) if path else None
+
+
+def get() -> Optional[SharedStore]:
+    """
+    The store of SLOTS_SHARED_STORE, opened on the first use
+    """
+    global _store, _configured
+    if not _configured:
+        _store = fromEnvironment()
+        _configured = True
+    return _store
+
+
+def configure(store: Optional[SharedStore]) -> None:
+    global _store, _configured
+    _store = store
+    _configured = True
@@ -0,0 +1,139 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional  # noqa: F401
+
+from lib.data import ChatCommandArgs
+from lib.database import DatabaseMain, DatabaseTimeout
+from . import library, migrate, notifier, output, pool, reels, scheduler
+from . import scoring, shard, state, timing
+from .repository import SlotsRepository
+from .variant import SlotVariant
+
+
+async def spin(args: ChatCommandArgs, slotVariant: SlotVariant) -> bool:
+    if not shard.owns(args.chat.channel):
+        return False
+    if library.in_cached_cooldown(args.chat, slotVariant.name, args.nick,
+                                  args.timestamp):
+        return False
+    spinScheduler: scheduler.SpinScheduler = scheduler.get(args.chat)
+    if not spinScheduler.admit(args.nick):
+        if spinScheduler.isQueued(args.nick):
+            notifier.whisper(args.chat.channel, args.nick, 'queued',
+                             'Your slots spin is already queued',
+                             args.timestamp, library.channelCooldown)
+        else:
+            notifier.whisper(args.chat.channel, args.nick, 'queue',
+                             'The slots queue is full, try again later',
+                             args.timestamp, library.channelCooldown)
+        return True
+    try:
+        async with spinScheduler.lock:
+            with timing.span(args.chat.channel, slotVariant.name, 'turn'):
+                return await spin_turn(args, slotVariant, spinScheduler)
+    finally:
+        spinScheduler.leave(args.nick)
+
+
+async def spin_turn(args: ChatCommandArgs,
+                    slotVariant: SlotVariant,
+                    spinScheduler: 'scheduler.SpinScheduler') -> bool:
+    # The spin happens once it is the turn of the user, args.timestamp is
+    # when the command was received
+    timestamp: datetime = args.timestamp + spinScheduler.waited(args.nick)
+    delay: timedelta = library.channel_cooldown_left(
+        timestamp, state.get(args.chat).lastSlots)
+    if delay:
+        await asyncio.sleep(delay.total_seconds())
+        timestamp += delay
+
+    channel: str = args.chat.channel
+    await migrate.ensure()
+    db: DatabaseMain
+    slotsRepository: SlotsRepository
+    async with DatabaseMain.acquire() as db, \
+            SlotsRepository(db) as slotsRepository:
+        with timing.span(channel, slotVariant.name, 'prespin'):
+            preSpin: library.PreSpinState = await library.loadPreSpinState(
+                slotsRepository, args.chat, slotVariant, args.nick, timestamp)
+        # Another process of the bot may have spun in the channel
+        delay = library.channel_cooldown_left(timestamp, preSpin.lastSlots)
+        if delay:
+            await asyncio.sleep(delay.total_seconds())
+        waited: timedelta = spinScheduler.start(args.nick)
+        timing.observe(channel, slotVariant.name, 'queue',
+                       waited.total_seconds())
+        timestamp = args.timestamp + waited
+        if library.in_cooldown(channel, args.nick, timestamp,
+                               preSpin.lastAttempt, preSpin.isBot):
+            return False
+        timestamp = await library.claim_channel(channel, timestamp)
+
+        with timing.span(channel, slotVariant.name, 'bot'):
+            markedBot: Optional[bool] = await library.process_bot(
+                slotsRepository, args.chat, slotVariant.name, args.nick,
+                timestamp, preSpin.lastAttempt, preSpin.isBot)
+
+        spinRandom: reels.Spin = reels.get(args.chat).next()
+        emotes: Optional[pool.Sample]
+        with timing.span(channel, slotVariant.name, 'pool'):
+            emotes = await slotVariant.generatePool(args.chat, args.data,
+                                                    spinRandom.random)
+        if emotes is None:
+            return False
+        selected: List[Any] = reels.draw(spinRandom.random, emotes)
+
+        matchEmoteId: Any = selected[0]
+        numMatching: int = 0
+        emoteId: Any
+        for emoteId in selected:
+            if emoteId == matchEmoteId:
+                numMatching += 1
+        allMatching: bool = numMatching == 3
+
+        spinOutput: output.SpinOutput = output.SpinOutput()
+        selectedEmotes: str = ' | '.join(emotes[i] for i in selected)
+        msg: str = f'{args.nick} -> {selectedEmotes}'
+        spinOutput.say(msg)
+        if allMatching:
+            spinOutput.say(f'{args.nick} has won {slotVariant.command}')
+            if (slotVariant.timeoutEmote is not None
+                    and matchEmoteId == slotVariant.timeoutEmote
+                    and args.permissions.chatModerator):
+                spinOutput.command(f'.timeout {args.nick} 1')
+                spinOutput.say(
+                    f'Thanks for winning the {emotes[matchEmoteId]}!')
+                dbTimeout: DatabaseTimeout
+                async with DatabaseTimeout.acquire() as dbTimeout:
+                    await dbTimeout.recordTimeout(
+                        args.chat.channel, args.nick, None, 'slots', None,
+                        1, str(args.message), msg)
+        # The categories with a column are kept in the attempt, the others
+        # are only told in chat
+        categories: List[str] = [
+            category.name for category in scoring.matched(
+                emotes.matches(selected), emotes.categories)
+            if category.column is None]
+        if categories:
+            spinOutput.say(
+                f'{args.nick} matched {", ".join(categories)}')
+        if markedBot is True:
+            spinOutput.say(f'''\
+{args.nick} is now considered as a bot. His cooldown is increased to 20 \
+minutes.''')
+        if markedBot is False:
+            spinOutput.say(f'''\
+{args.nick} is now considered not as a bot. His cooldown is back to 2 \
+minutes.''')
+        with timing.span(channel, slotVariant.name, 'output'):
+            channelDigest: Optional[output.Digest] = None
+            if await args.data.hasFeature(channel, 'slotsdigest'):
+                channelDigest = output.digest(args.chat)
+            spinOutput.send(args.chat, channelDigest)
+
+        with timing.span(channel, slotVariant.name, 'record'):
+            await library.recordSlots(slotVariant, args.data, args.chat,
+                                      args.nick, emotes, selected,
+                                      timestamp, spinRandom.seed,
+                                      spinRandom.counter)
+        return True
@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Dict, Optional, Tuple  # noqa: F401
+
+from bot import data  # noqa: F401
+from .detector import BotDetector
+
+
+class SlotsState:
+    """
+    Write-through cooldown state of a channel, kept in chat.sessionData
+
+    A missing entry means the value has not been loaded from the database
+    yet, not that the user never played.
+    """
+    def __init__(self) -> None:
+        self.lastSlots: Optional[datetime] = None
+        self.lastAttempts: Dict[Tuple[str, str], datetime] = {}
+        self.detectors: Dict[Tuple[str, str], BotDetector] = {}
+        self.pruned: datetime = datetime.min
+
+    def record(self, variant: str, user: str, timestamp: datetime) -> None:
+        if self.lastSlots is None or timestamp > self.lastSlots:
+            self.lastSlots = timestamp
+        self.lastAttempts[variant, user] = timestamp
+        if (variant, user) in self.detectors:
+            self.detectors[variant, user].add(timestamp)
+
+    def prune(self, before: datetime) -> None:
+        self.pruned = before
+        key: Tuple[str, str]
+        for key in [k for k, v in self.lastAttempts.items() if v < before]:
+            del self.lastAttempts[key]
+        for key in [k for k, d in self.detectors.items()
+                    if not d.times or d.times[-1] < before]:
+            del self.detectors[key]
+
+
+def get(chat: 'data.Channel') -> SlotsState:
+    if 'slotsState' not in chat.sessionData:
+        chat.sessionData['slotsState'] = SlotsState()
+    return chat.sessionData['slotsState']
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import sqlite3
+from typing import Any, Awaitable, List, Optional, Sequence  # noqa: F401
+
+testsPath: str = os.path.dirname(__file__)
+schemaPath: str = os.path.join(os.path.dirname(testsPath),
+                               'database-sqlite.sql')
+baselinePath: str = os.path.join(testsPath, 'baseline-sqlite.sql')
+
+
+class SqliteCursor:
+    def __init__(self, connection: sqlite3.Connection) -> None:
+        self._cursor: sqlite3.Cursor = connection.cursor()
+
+    async def __aenter__(self) -> 'SqliteCursor':
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._cursor.close()
+
+    async def close(self) -> None:
+        self._cursor.close()
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    async def execute(self,
+                      query: str,
+                      params: Sequence[Any] = ()) -> 'SqliteCursor':
+        self._cursor.execute(query, params)
+        return self
+
+    async def executemany(self,
+                          query: str,
+                          params: Sequence[Sequence[Any]]) -> 'SqliteCursor':
+        self._cursor.executemany(query, params)
+        return self
+
+    async def fetchone(self) -> Optional[Any]:
+        return self._cursor.fetchone()
+
+    async def fetchall(self) -> List[Any]:
+        return self._cursor.fetchall()
+
+    def __aiter__(self) -> 'SqliteCursor':
+        return self
+
+    async def __anext__(self) -> Any:
+        row: Optional[Any] = self._cursor.fetchone()
+        if row is None:
+            raise StopAsyncIteration
+        return row
+
+
+class SqliteDatabase:
+    """
+    The DatabaseMain interface over an in-memory SQLite database
+    """
+    isSqlite: bool = True
+
+    def __init__(self, schemaPath: str = schemaPath) -> None:
+        self.connection: sqlite3.Connection = sqlite3.connect(
+            ':memory:',
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+        with open(schemaPath, encoding='utf-8') as file:
+            self.connection.executescript(file.read())
+
+    def acquire(self) -> 'SqliteDatabase':
+        return self
+
+    async def __aenter__(self) -> 'SqliteDatabase':
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        pass
+
+    async def cursor(self) -> SqliteCursor:
+        return SqliteCursor(self.connection)
+
+    async def commit(self) -> None:
+        self.connection.commit()
+
+    async def rollback(self) -> None:
+        self.connection.rollback()
+
+
+def run(awaitable: Awaitable[Any]) -> Any:
+    return asyncio.get_event_loop().run_until_complete(awaitable)
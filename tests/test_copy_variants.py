@@ -0,0 +1,87 @@
+import importlib.util
+import os
+import unittest
+from datetime import datetime, timedelta
+from types import ModuleType
+from typing import Any, List, Tuple  # noqa: F401
+
+from .. import migrate, retention
+from .database import SqliteDatabase, baselinePath, run
+
+toolPath: str = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                             'tools', 'copy_variants.py')
+
+
+def load_tool() -> ModuleType:
+    spec = importlib.util.spec_from_file_location('copy_variants', toolPath)
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def attempt(table: str,
+            id: int,
+            time: datetime,
+            twitch: bool,
+            variant: str = '') -> str:
+    columns: str = ('id, broadcaster, attemptTime, twitchUser, numMatching, '
+                    'isWin, emoticon1, emoticon2, emoticon3, emoticonId1, '
+                    'emoticonId2, emoticonId3')
+    values: str = (f"{id}, 'botgotsthis', '{time}', 'megotsthis', 1, 0, "
+                   "'Kappa', 'Keepo', 'PogChamp', 25, 1902, 88")
+    if variant:
+        columns += ', variant'
+        values += f", '{variant}'"
+    if twitch:
+        columns += (', isBasicMatch, isKappaMatch, isCatMatch, isDogMatch, '
+                    'isSubscriberMatch')
+        values += ', 0, 1, 0, 0, 0'
+    return f'INSERT INTO {table} ({columns}) VALUES ({values})'
+
+
+class TestCopyVariants(unittest.TestCase):
+    def setUp(self) -> None:
+        self.database: SqliteDatabase = SqliteDatabase(baselinePath)
+        self.copyVariants: ModuleType = load_tool()
+        self.old: datetime = datetime(2017, 1, 1)
+
+    def seed(self, prefixes: List[str], ids: range, suffix: str) -> None:
+        prefix: str
+        for prefix in prefixes:
+            id: int
+            for id in ids:
+                self.database.connection.execute(attempt(
+                    f'{prefix}slot_attempts{suffix}', id,
+                    self.old + timedelta(minutes=id), prefix == ''))
+        self.database.connection.commit()
+
+    def copy(self) -> None:
+        source: Any
+        for source in self.copyVariants.sources(True):
+            while self.copyVariants.copy_batch(
+                    self.database.connection, source, 2):
+                pass
+
+    def test_archive_after_copy(self) -> None:
+        prefixes: List[str] = ['', 'ffz_', 'bttv_']
+        self.seed(prefixes, range(1, 6), '')
+        self.assertEqual(run(migrate.migrate(self.database)),
+                         [1, 2, 3, 4, 5, 6])
+        self.seed(prefixes, range(1, 4), '_legacy_archive')
+        self.copy()
+        self.database.connection.execute(attempt(
+            'slot_attempts', 100, self.old, True, 'twitch'))
+        self.database.connection.commit()
+
+        moved: int = run(retention.archive(self.database, datetime.utcnow()))
+
+        self.assertEqual(moved, 16)
+        ids: List[Tuple[int]] = self.database.connection.execute(
+            'SELECT id FROM slot_attempts_archive').fetchall()
+        self.assertEqual(len(ids), 25)
+        self.assertEqual(len(set(ids)), 25)
+        variants: List[Tuple[str, int]] = self.database.connection.execute('''
+SELECT variant, COUNT(*) FROM slot_attempts_archive
+    GROUP BY variant ORDER BY variant
+''').fetchall()
+        self.assertEqual(variants, [('bttv', 8), ('ffz', 8), ('twitch', 9)])
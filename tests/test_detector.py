@@ -0,0 +1,106 @@
+import random
+import statistics
+import unittest
+from datetime import datetime, timedelta
+from typing import List  # noqa: F401
+
+from .. import detector
+
+window: timedelta = timedelta(hours=2)
+
+
+def stdev_is_bot(attempts: List[datetime]) -> bool:
+    """
+    The bot check as it was written with statistics.stdev
+    """
+    s: List[int] = []
+    for i in range(1, len(attempts)):
+        s.append(int((attempts[i] - attempts[i - 1]).total_seconds()))
+    toMark: bool = False
+    # < 2 seconds of variations
+    if len(s) >= 5 and statistics.stdev(s) < 1:
+        toMark = True
+    # < 2 seconds of variations on the last 5
+    if len(s) >= 5 and statistics.stdev(s[-5:]) < 1:
+        toMark = True
+    # < 10 seconds
+    if len(s) >= 10 and statistics.stdev(s) < 3.5:
+        toMark = True
+    # < 30 seconds
+    if len(s) >= 15 and statistics.stdev(s) < 10:
+        toMark = True
+    return toMark
+
+
+def trace(rng: random.Random, length: int) -> List[datetime]:
+    """
+    Attempt times alternating between steady, bot like stretches and
+    irregular ones, with sub-second jitter
+    """
+    times: List[datetime] = []
+    timestamp: datetime = datetime(2019, 1, 1)
+    period: float = rng.uniform(20, 600)
+    spread: float = rng.choice([0, 0.5, 1, 2, 5, 20, 60])
+    while len(times) < length:
+        if rng.random() < 0.05:
+            period = rng.uniform(20, 600)
+            spread = rng.choice([0, 0.5, 1, 2, 5, 20, 60])
+        timestamp += timedelta(
+            seconds=max(period + rng.uniform(-spread, spread), 1))
+        times.append(timestamp)
+    return times
+
+
+class TestBelowStdev(unittest.TestCase):
+    def test_random_intervals(self) -> None:
+        rng: random.Random = random.Random(20190101)
+        _: int
+        for _ in range(5000):
+            count: int = rng.randint(2, 20)
+            base: int = rng.randint(0, 900)
+            spread: int = rng.choice([0, 1, 2, 3, 5, 10, 30, 60])
+            s: List[int] = [max(base + rng.randint(-spread, spread), 0)
+                            for _ in range(count)]
+            limit: float
+            for limit in (1, 3.5, 10):
+                self.assertEqual(
+                    detector.below_stdev(len(s), sum(s),
+                                         sum(i * i for i in s), limit),
+                    statistics.stdev(s) < limit,
+                    (s, limit))
+
+
+class TestBotDetector(unittest.TestCase):
+    def test_random_traces(self) -> None:
+        rng: random.Random = random.Random(20190102)
+        marks: int = 0
+        checks: int = 0
+        _: int
+        for _ in range(200):
+            times: List[datetime] = trace(rng, rng.randint(1, 120))
+            botDetector: detector.BotDetector = detector.BotDetector()
+            i: int
+            timestamp: datetime
+            for i, timestamp in enumerate(times):
+                botDetector.add(timestamp)
+                since: datetime = timestamp - window
+                attempts: List[datetime] = [t for t in times[:i + 1]
+                                            if t >= since]
+                expected: bool = stdev_is_bot(attempts)
+                self.assertEqual(botDetector.is_bot(since), expected,
+                                 attempts)
+                marks += expected
+                checks += 1
+        # Both outcomes have to be exercised for the comparison to matter
+        self.assertGreater(marks, 0)
+        self.assertLess(marks, checks)
+
+    def test_seeded(self) -> None:
+        rng: random.Random = random.Random(20190103)
+        _: int
+        for _ in range(200):
+            times: List[datetime] = trace(rng, rng.randint(1, 60))
+            since: datetime = times[-1] - window
+            self.assertEqual(
+                detector.BotDetector(times).is_bot(since),
+                stdev_is_bot([t for t in times if t >= since]))
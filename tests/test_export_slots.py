@@ -0,0 +1,82 @@
+import importlib.util
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from types import ModuleType
+from typing import Any, List  # noqa: F401
+from unittest import mock
+
+from .database import SqliteDatabase
+
+toolPath: str = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                             'tools', 'export_slots.py')
+
+
+def load_tool() -> ModuleType:
+    spec = importlib.util.spec_from_file_location('export_slots', toolPath)
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestExportWatermark(unittest.TestCase):
+    def setUp(self) -> None:
+        self.exportSlots: ModuleType = load_tool()
+        patcher: Any = mock.patch('sys.stderr', io.StringIO())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.database: SqliteDatabase = SqliteDatabase()
+        directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.outDir: str = directory.name
+        self.now: datetime = datetime(2019, 1, 1, 12)
+        self.table: Any = self.exportSlots.tables(True)[0]
+        self.filters: Any = self.exportSlots.Filters([], [], None, None)
+
+    def insert(self, id: int, attemptTime: datetime) -> None:
+        self.database.connection.execute('''
+INSERT INTO slot_attempts
+    (id, variant, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+    emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2, emoticonId3)
+    VALUES (?, 'twitch', 'botgotsthis', ?, 'megotsthis', 1, 0, 'Kappa',
+        'Keepo', 'PogChamp', '25', '1902', '88')
+''', (id, attemptTime))
+        self.database.connection.commit()
+
+    def export(self, afterId: int, now: datetime) -> int:
+        return self.exportSlots.export_table(
+            self.database.connection, self.table, self.filters, afterId,
+            self.outDir, 'csv', 2, 1, now - self.exportSlots.commitDelay)
+
+    def exported(self) -> List[str]:
+        return sorted(os.listdir(self.outDir))
+
+    def test_late_commit(self) -> None:
+        self.insert(1, self.now - timedelta(hours=1))
+        self.insert(2, self.now - timedelta(hours=1))
+        self.insert(3, self.now - timedelta(minutes=30))
+        # Id 4 is still being written when id 5 commits
+        self.insert(5, self.now - timedelta(minutes=1))
+        self.insert(6, self.now - timedelta(hours=2))
+
+        lastId: int = self.export(0, self.now)
+        self.assertEqual(lastId, 3)
+        self.assertEqual(self.exported(), ['attempts-1-3.csv'])
+
+        self.insert(4, self.now - timedelta(minutes=1))
+        lastId = self.export(lastId, self.now + timedelta(minutes=30))
+        self.assertEqual(lastId, 6)
+        self.assertEqual(self.exported(),
+                         ['attempts-1-3.csv', 'attempts-4-6.csv'])
+        with open(os.path.join(self.outDir, 'attempts-4-6.csv'),
+                  encoding='utf-8') as file:
+            ids: List[str] = [line.split(',')[0]
+                              for line in file.read().splitlines()[1:]]
+        self.assertEqual(ids, ['4', '5', '6'])
+
+    def test_nothing_old_enough(self) -> None:
+        self.insert(1, self.now)
+        self.assertEqual(self.export(0, self.now), 0)
+        self.assertEqual(self.exported(), [])
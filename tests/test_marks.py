@@ -0,0 +1,48 @@
+import unittest
+from datetime import datetime, timedelta
+from typing import Any  # noqa: F401
+from unittest import mock
+
+from .. import library, marks, state
+
+
+class TestCachedCooldown(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher: Any = mock.patch.object(marks, '_marks', marks.BotMarks())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.botMarks: marks.BotMarks = marks.get()
+        self.botMarks.loaded = True
+        self.chat: mock.Mock = mock.Mock()
+        self.chat.channel = 'botgotsthis'
+        self.chat.sessionData = {}
+        self.now: datetime = datetime(2019, 1, 1)
+        state.get(self.chat).lastAttempts['slots', 'megotsthis'] = (
+            self.now - timedelta(minutes=5))
+
+    def in_cached_cooldown(self, hours: int = 0) -> bool:
+        return library.in_cached_cooldown(
+            self.chat, 'slots', 'megotsthis',
+            self.now + timedelta(hours=hours))
+
+    def test_unmarked(self) -> None:
+        self.assertFalse(self.in_cached_cooldown())
+
+    def test_marked(self) -> None:
+        self.botMarks.mark('botgotsthis', 'megotsthis', self.now)
+        self.assertTrue(self.in_cached_cooldown())
+
+    def test_other_channel(self) -> None:
+        self.botMarks.mark('megotsthis', 'megotsthis', self.now)
+        self.assertFalse(self.in_cached_cooldown())
+
+    def test_prune(self) -> None:
+        self.botMarks.mark('botgotsthis', 'megotsthis', self.now)
+        library.recordState(self.chat, 'slots', 'megotsthis', self.now)
+        state.get(self.chat).prune(self.now - timedelta(minutes=1))
+        self.assertTrue(self.in_cached_cooldown())
+
+    def test_not_loaded(self) -> None:
+        self.botMarks.mark('botgotsthis', 'megotsthis', self.now)
+        self.botMarks.loaded = False
+        self.assertFalse(self.in_cached_cooldown())
@@ -0,0 +1,50 @@
+import unittest
+from typing import Any, List, Tuple  # noqa: F401
+from unittest import mock
+
+from lib.database import DatabaseMain
+
+from .. import migrate
+from .database import SqliteDatabase, baselinePath, run
+
+
+def schema(database: SqliteDatabase) -> List[Tuple[str, str]]:
+    return database.connection.execute('''
+SELECT name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%'
+    ORDER BY name
+''').fetchall()
+
+
+class TestMigrate(unittest.TestCase):
+    def test_idempotent(self) -> None:
+        database: SqliteDatabase = SqliteDatabase(baselinePath)
+        versions: List[int] = [v for v, _ in migrate.migrations('sqlite')]
+        self.assertEqual(run(migrate.migrate(database)), versions)
+        migrated: List[Tuple[str, str]] = schema(database)
+        self.assertEqual(run(migrate.migrate(database)), [])
+        self.assertEqual(schema(database), migrated)
+        self.assertEqual(database.connection.execute(
+            'SELECT COUNT(*) FROM slots_migrations').fetchone()[0],
+            len(versions))
+
+    def test_current_schema(self) -> None:
+        database: SqliteDatabase = SqliteDatabase()
+        self.assertEqual(run(migrate.migrate(database)), [])
+
+    def test_ensure_once(self) -> None:
+        database: SqliteDatabase = SqliteDatabase(baselinePath)
+        patchers: List[Any] = [
+            mock.patch.object(migrate, '_migrated', False),
+            mock.patch.object(migrate, '_lock', None),
+            mock.patch.object(DatabaseMain, 'acquire', database.acquire),
+            mock.patch.object(migrate, 'migrate', wraps=migrate.migrate),
+            ]
+        patcher: Any
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        run(migrate.ensure())
+        run(migrate.ensure())
+        self.assertEqual(migrate.migrate.call_count, 1)
+        self.assertTrue(database.connection.execute(
+            'SELECT COUNT(*) FROM slots_migrations').fetchone()[0])
@@ -0,0 +1,53 @@
+import unittest
+from datetime import datetime, timedelta
+from typing import Any  # noqa: F401
+from unittest import mock
+
+from bot import utils
+
+from .. import notifier
+
+
+class TestCooldownNotifier(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher: Any = mock.patch.object(utils, 'whisper')
+        self.mockWhisper: mock.Mock = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.notifier: notifier.CooldownNotifier = notifier.CooldownNotifier()
+        self.now: datetime = datetime(2019, 1, 1)
+        self.until: datetime = self.now + timedelta(minutes=2)
+
+    def whisper(self, channel: str, kind: str, seconds: int = 0) -> bool:
+        return self.notifier.whisper(
+            channel, 'megotsthis', kind, 'Slots Cooldown',
+            self.now + timedelta(seconds=seconds), self.until)
+
+    def test_suppressed(self) -> None:
+        self.assertTrue(self.whisper('botgotsthis', 'cooldown'))
+        self.assertFalse(self.whisper('botgotsthis', 'cooldown', 30))
+        self.assertTrue(self.whisper('botgotsthis', 'cooldown', 120))
+        self.assertEqual(self.notifier.sent, 2)
+        self.assertEqual(self.notifier.suppressed, 1)
+
+    def test_keys(self) -> None:
+        self.assertTrue(self.whisper('botgotsthis', 'cooldown'))
+        self.assertTrue(self.whisper('megotsthis', 'cooldown', 1))
+        self.assertTrue(self.whisper('botgotsthis', 'queue', 2))
+        self.assertFalse(self.whisper('megotsthis', 'cooldown', 3))
+        self.assertEqual(self.mockWhisper.call_count, 3)
+
+    def test_expire(self) -> None:
+        i: int
+        for i in range(2000):
+            self.notifier.whisper('botgotsthis', f'user{i}', 'cooldown',
+                                  'Slots Cooldown', self.now,
+                                  self.now + timedelta(seconds=i % 10 + 1))
+        self.assertEqual(len(self.notifier.notified), 2000)
+        self.assertTrue(self.whisper('botgotsthis', 'cooldown', 5))
+        self.assertEqual(len(self.notifier.notified), 1001)
+        self.assertFalse(self.notifier.whisper(
+            'botgotsthis', 'user9', 'cooldown', 'Slots Cooldown',
+            self.now + timedelta(seconds=5), self.now))
+        self.assertTrue(self.notifier.whisper(
+            'botgotsthis', 'user4', 'cooldown', 'Slots Cooldown',
+            self.now + timedelta(seconds=5), self.now))
@@ -0,0 +1,99 @@
+import unittest
+from datetime import datetime
+from typing import Any, List  # noqa: F401
+from unittest import mock
+
+import bot.globals
+
+from .. import pool, scoring, warmer
+from .database import run
+
+
+class TestInvalidate(unittest.TestCase):
+    def setUp(self) -> None:
+        patchers: List[Any] = [
+            mock.patch.object(pool, '_pools', {}),
+            mock.patch.object(scoring, 'categories', []),
+            mock.patch.object(scoring, 'channelCategories', {}),
+            ]
+        patcher: Any
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.now: datetime = datetime(2019, 1, 1)
+        pool.store('twitch', None, {25: 'Kappa'}, self.now)
+        pool.store('ffz', 'botgotsthis', {1: 'ZreknarF'}, self.now)
+        pool.store('ffz', 'megotsthis', {1: 'ZreknarF'}, self.now)
+
+    def test_register_channel(self) -> None:
+        scoring.register(scoring.Category('kappa', lambda n: n == 'Kappa'),
+                         'botgotsthis')
+        self.assertIsNotNone(pool.get('twitch', None, self.now))
+        self.assertIsNone(pool.get('ffz', 'botgotsthis', self.now))
+        self.assertIsNotNone(pool.get('ffz', 'megotsthis', self.now))
+
+    def test_register(self) -> None:
+        scoring.register(scoring.Category('kappa', lambda n: n == 'Kappa'))
+        self.assertIsNone(pool.get('twitch', None, self.now))
+        self.assertIsNone(pool.get('ffz', 'megotsthis', self.now))
+
+    def test_part(self) -> None:
+        async def warmChannel(channel: str) -> None:
+            pass
+
+        emoteWarmer: warmer.EmoteWarmer = warmer.EmoteWarmer()
+        emoteWarmer.channels = {'botgotsthis', 'megotsthis'}
+        with mock.patch.object(bot.globals, 'channels',
+                               {'megotsthis': mock.Mock()}), \
+                mock.patch.object(emoteWarmer, 'warmChannel', warmChannel):
+            run(emoteWarmer.warm())
+        self.assertEqual(emoteWarmer.channels, {'megotsthis'})
+        self.assertIsNone(pool.get('ffz', 'botgotsthis', self.now))
+        self.assertIsNotNone(pool.get('ffz', 'megotsthis', self.now))
+        self.assertIsNotNone(pool.get('twitch', None, self.now))
+
+
+class TestStore(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher: Any = mock.patch.object(pool, '_pools', {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now: datetime = datetime(2019, 1, 1)
+
+    def test_same_source(self) -> None:
+        emotePool: pool.EmotePool = pool.store(
+            'ffz', 'botgotsthis', {1: 'ZreknarF'}, self.now)
+        later: datetime = self.now + pool.poolDuration
+        self.assertIs(pool.store('ffz', 'botgotsthis', {1: 'ZreknarF'},
+                                 later), emotePool)
+        self.assertEqual(emotePool.expires, later + pool.poolDuration)
+
+    def test_refreshed_source(self) -> None:
+        emotePool: pool.EmotePool = pool.store(
+            'ffz', 'botgotsthis', {1: 'ZreknarF'}, self.now)
+        refreshed: pool.EmotePool = pool.store(
+            'ffz', 'botgotsthis', {1: 'ZreknarF', 2: 'LilZ'}, self.now)
+        self.assertIsNot(refreshed, emotePool)
+        self.assertIs(pool.get('ffz', 'botgotsthis', self.now), refreshed)
+
+    def test_warmer_reloads(self) -> None:
+        loads: List[datetime] = []
+
+        async def loadPool(chat: Any, dataCache: Any) -> pool.EmotePool:
+            loads.append(datetime.utcnow())
+            return pool.store('ffz', 'botgotsthis', {1: 'ZreknarF'},
+                              datetime.utcnow())
+
+        chat: mock.Mock = mock.Mock()
+        chat.channel = 'botgotsthis'
+        slotVariant: mock.Mock = mock.Mock()
+        slotVariant.name = 'ffz'
+        slotVariant.loadPool = loadPool
+        emoteWarmer: warmer.EmoteWarmer = warmer.EmoteWarmer()
+        run(emoteWarmer.load(slotVariant, chat, mock.Mock()))
+        run(emoteWarmer.load(slotVariant, chat, mock.Mock()))
+        self.assertEqual(len(loads), 1)
+        stored: pool.EmotePool = pool._pools['ffz', 'botgotsthis']
+        stored.expires -= warmer.interval
+        run(emoteWarmer.load(slotVariant, chat, mock.Mock()))
+        self.assertEqual(len(loads), 2)
@@ -0,0 +1,153 @@
+import unittest
+from datetime import datetime
+from typing import Any, Dict, List, Tuple  # noqa: F401
+from unittest import mock
+
+import bot.globals
+from bot import utils
+from lib.database import DatabaseMain
+
+from .. import library, recorder, retention, shared
+from ..variant import SlotVariant
+from .database import SqliteCursor, SqliteDatabase, run
+
+query: str = '''
+INSERT INTO slot_bots (broadcaster, bot, marked) VALUES (?, ?, ?)
+'''
+
+
+class FlakyDatabase(SqliteDatabase):
+    def __init__(self, failures: int) -> None:
+        super().__init__()
+        self.failures: int = failures
+
+    async def cursor(self) -> SqliteCursor:
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError()
+        return await super().cursor()
+
+
+class TestRecorder(unittest.TestCase):
+    def setUp(self) -> None:
+        self.recorder: recorder.SlotsRecorder = recorder.SlotsRecorder(
+            batchSize=10, flushInterval=0.01, maxAttempts=3, retryDelay=0)
+        patcher: Any = mock.patch.object(bot.globals, 'running', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(utils, 'logException')
+        self.mockLog: mock.Mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, database: SqliteDatabase, count: int) -> None:
+        async def record() -> None:
+            i: int
+            for i in range(count):
+                await self.recorder.record([recorder.row(
+                    query, ('botgotsthis', f'user{i}', '2019-01-01'))])
+            await self.recorder.shutdown()
+
+        with mock.patch.object(DatabaseMain, 'acquire', database.acquire):
+            run(record())
+
+    def stored(self, database: SqliteDatabase) -> int:
+        return database.connection.execute(
+            'SELECT COUNT(*) FROM slot_bots').fetchone()[0]
+
+    def test_retry(self) -> None:
+        database: FlakyDatabase = FlakyDatabase(2)
+        self.write(database, 5)
+        self.assertEqual(self.stored(database), 5)
+        self.assertEqual(self.recorder.retries, 2)
+        self.assertEqual(self.recorder.dropped, 0)
+        self.assertFalse(self.mockLog.called)
+
+    def test_drop(self) -> None:
+        database: FlakyDatabase = FlakyDatabase(3)
+        self.write(database, 5)
+        self.assertEqual(self.stored(database), 0)
+        self.assertEqual(self.recorder.dropped, 5)
+        self.mockLog.assert_called_once_with(
+            'Dropped 5 slots rows after 3 failed writes')
+
+    def test_unit_not_split(self) -> None:
+        self.recorder.batchSize = 2
+        database: SqliteDatabase = SqliteDatabase()
+        batches: List[int] = []
+        writeBatch: Any = self.recorder._writeBatch
+
+        async def countBatch(batch: List[recorder.Row]) -> None:
+            batches.append(len(batch))
+            await writeBatch(batch)
+
+        async def record() -> None:
+            i: int
+            for i in range(3):
+                await self.recorder.record([
+                    recorder.row(query, ('botgotsthis', f'user{i}{j}',
+                                         '2019-01-01'))
+                    for j in range(3)])
+            await self.recorder.shutdown()
+
+        with mock.patch.object(DatabaseMain, 'acquire', database.acquire), \
+                mock.patch.object(self.recorder, '_writeBatch', countBatch):
+            run(record())
+        self.assertEqual(self.stored(database), 9)
+        self.assertTrue(batches)
+        self.assertTrue(all(size % 3 == 0 for size in batches))
+
+
+async def kappaScorer(dataCache: Any,
+                      emotes: Any,
+                      selectedIds: List[Any]) -> Dict[str, bool]:
+    return {'isKappaMatch': emotes[selectedIds[0]] == 'Kappa'}
+
+
+class TestRecordSlots(unittest.TestCase):
+    def setUp(self) -> None:
+        self.database: SqliteDatabase = SqliteDatabase()
+        self.recorder: recorder.SlotsRecorder = recorder.SlotsRecorder(
+            flushInterval=0.01)
+        self.variant: SlotVariant = SlotVariant(
+            'twitch', '', '', '!slots', '!slotswinners', '', '', mock.Mock(),
+            mock.Mock(), kappaScorer)
+        self.channel: mock.Mock = mock.Mock()
+        self.channel.channel = 'botgotsthis'
+        patchers: List[Any] = [
+            mock.patch.object(bot.globals, 'running', True),
+            mock.patch.object(recorder, '_recorder', self.recorder),
+            mock.patch.object(DatabaseMain, 'acquire', self.database.acquire),
+            mock.patch.object(library, 'recordState'),
+            mock.patch.object(shared, 'get', return_value=None),
+            mock.patch.object(retention, 'start'),
+            ]
+        patcher: Any
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def spin(self, selectedIds: List[int], timestamp: datetime) -> None:
+        async def spin() -> None:
+            await library.recordSlots(
+                self.variant, mock.Mock(), self.channel, 'megotsthis',
+                {25: 'Kappa', 1902: 'Keepo'}, selectedIds, timestamp)
+            await self.recorder.shutdown()
+
+        run(spin())
+
+    def test_stats(self) -> None:
+        win: datetime = datetime(2019, 1, 1)
+        self.spin([25, 25, 25], win)
+        self.spin([1902, 25, 25], datetime(2019, 1, 2))
+        self.spin([25, 1902, 25], datetime(2019, 1, 3))
+        connection: Any = self.database.connection
+        self.assertEqual(connection.execute('''
+SELECT variant, attempts, wins, lastWin AS "lastWin [timestamp]",
+        kappaMatches
+    FROM slot_stats
+    WHERE broadcaster='botgotsthis' AND twitchUser='megotsthis'
+''').fetchall(), [('twitch', 3, 1, win, 2)])
+        self.assertEqual(connection.execute(
+            'SELECT COUNT(*) FROM slot_attempts').fetchone()[0], 3)
+        self.assertEqual(connection.execute(
+            'SELECT COUNT(*) FROM slot_winners').fetchone()[0], 1)
@@ -0,0 +1,119 @@
+import random
+import unittest
+from datetime import datetime
+from typing import Any, List, Optional  # noqa: F401
+from unittest import mock
+
+import bot.globals
+from lib.cache import CacheStore
+from lib.database import DatabaseMain
+
+from .. import manage, pool, reels, variant
+from ..variant import SlotVariant
+from .database import SqliteDatabase, run
+
+
+class Message:
+    def __init__(self, text: str) -> None:
+        self.words: List[str] = text.split()
+        self.lower: List[str] = [word.lower() for word in self.words]
+
+    def __getitem__(self, index: int) -> str:
+        return self.words[index]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self) -> None:
+        self.database: SqliteDatabase = SqliteDatabase()
+        self.emotePool: pool.EmotePool = pool.EmotePool(
+            {i: f'Emote{i}' for i in range(1, 31)}, datetime.max)
+        self.chat: mock.Mock = mock.Mock()
+        self.chat.channel = 'botgotsthis'
+        self.chat.sessionData = {}
+        self.slotVariant: SlotVariant = SlotVariant(
+            'twitch', 'slots', '', '!slots', '!slotswinners', '', '',
+            self.generatePool, mock.Mock())
+        patchers: List[Any] = [
+            mock.patch.object(DatabaseMain, 'acquire', self.database.acquire),
+            mock.patch.object(bot.globals, 'channels',
+                              {'botgotsthis': self.chat}),
+            mock.patch.dict(variant.variants, {'twitch': self.slotVariant}),
+            ]
+        patcher: Any
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.send: mock.Mock = mock.Mock()
+
+    async def generatePool(self,
+                           chat: Any,
+                           dataCache: CacheStore,
+                           rng: random.Random) -> Optional[pool.Sample]:
+        return self.emotePool.sample(8, rng)
+
+    def spin(self) -> List[str]:
+        """
+        Spin like spin.spin_turn and store the attempt
+        """
+        spinRandom: reels.Spin = reels.get(self.chat).next()
+        emotes: pool.Sample = run(self.generatePool(self.chat, None,
+                                                    spinRandom.random))
+        selected: List[Any] = reels.draw(spinRandom.random, emotes)
+        self.database.connection.execute('''
+INSERT INTO slot_attempts
+    (variant, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+    emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+    emoticonId3, spinSeed, spinCounter)
+    VALUES ('twitch', 'botgotsthis', '2019-01-01', 'megotsthis', 1, 0,
+        ?, ?, ?, ?, ?, ?, ?, ?)
+''', [emotes[i] for i in selected] + [str(i) for i in selected]
+            + [spinRandom.seed, spinRandom.counter])
+        return [emotes[i] for i in selected]
+
+    def manage(self, command: Any, text: str) -> bool:
+        args: mock.Mock = mock.Mock()
+        args.message = Message(text)
+        args.send = self.send
+        return run(command(args))
+
+    def test_replay(self) -> None:
+        self.assertTrue(self.manage(manage.manageSlotsSeed,
+                                    '!managebot slotsseed botgotsthis 1234'))
+        self.assertEqual(reels.get(self.chat).seed, 1234)
+        spins: List[List[str]] = [self.spin() for _ in range(5)]
+        attemptId: int
+        for attemptId in [3, 1, 5]:
+            self.assertTrue(self.manage(
+                manage.manageSlotsReplay,
+                f'!managebot slotsreplay {attemptId}'))
+            drawn: str = ' | '.join(spins[attemptId - 1])
+            self.send.assert_called_with(
+                f'Slots attempt {attemptId} replays {drawn} as recorded')
+
+    def test_pool_changed(self) -> None:
+        recorded: str = ' | '.join(self.spin())
+        self.emotePool = pool.EmotePool(
+            {i: f'Other{i}' for i in range(1, 31)}, datetime.max)
+        self.manage(manage.manageSlotsReplay, '!managebot slotsreplay 1')
+        self.assertIn(f'it was {recorded}', self.send.call_args[0][0])
+
+    def test_archived(self) -> None:
+        self.spin()
+        recorded: str = ' | '.join(self.spin())
+        self.database.connection.execute('''
+INSERT INTO slot_attempts_archive SELECT * FROM slot_attempts WHERE id=2
+''')
+        self.database.connection.execute(
+            'DELETE FROM slot_attempts WHERE id=2')
+        self.manage(manage.manageSlotsReplay, '!managebot slotsreplay 2')
+        self.send.assert_called_with(
+            f'Slots attempt 2 replays {recorded} as recorded')
+
+    def test_missing(self) -> None:
+        self.manage(manage.manageSlotsReplay, '!managebot slotsreplay 7')
+        self.send.assert_called_with('No slots attempt 7')
+        self.assertFalse(self.manage(manage.manageSlotsReplay,
+                                     '!managebot slotsreplay x'))
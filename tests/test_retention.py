@@ -0,0 +1,43 @@
+import unittest
+from datetime import date, datetime
+from typing import Any, List, Tuple  # noqa: F401
+
+from .. import retention
+from .database import SqliteDatabase, run
+
+
+class TestRollup(unittest.TestCase):
+    def setUp(self) -> None:
+        self.database: SqliteDatabase = SqliteDatabase()
+
+    def insert(self, attemptTime: datetime, isWin: bool) -> None:
+        self.database.connection.execute('''
+INSERT INTO slot_attempts_archive
+    (variant, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+    emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2, emoticonId3)
+    VALUES ('twitch', 'botgotsthis', ?, 'megotsthis', 1, ?, 'Kappa',
+        'Keepo', 'PogChamp', '25', '1902', '88')
+''', (attemptTime, isWin))
+
+    def test_rollup(self) -> None:
+        self.database.connection.execute('''
+INSERT INTO slot_attempts_daily
+    (broadcaster, variant, twitchUser, day, attempts, wins)
+    VALUES ('botgotsthis', 'twitch', 'megotsthis', '2019-01-01', 4, 1)
+''')
+        self.insert(datetime(2019, 1, 1, 10), True)
+        self.insert(datetime(2019, 1, 1, 11), False)
+        self.insert(datetime(2019, 1, 2, 10), False)
+        self.insert(datetime(2019, 5, 1, 10), False)
+        self.database.connection.commit()
+
+        self.assertEqual(
+            run(retention.rollup(self.database, datetime(2019, 5, 2))), 3)
+        rows: List[Tuple[Any, ...]] = self.database.connection.execute('''
+SELECT day AS "day [date]", attempts, wins FROM slot_attempts_daily
+    ORDER BY day
+''').fetchall()
+        self.assertEqual(rows, [(date(2019, 1, 1), 6, 2),
+                                (date(2019, 1, 2), 1, 0)])
+        self.assertEqual(self.database.connection.execute(
+            'SELECT COUNT(*) FROM slot_attempts_archive').fetchone()[0], 1)
@@ -0,0 +1,42 @@
+import unittest
+from typing import Any, List  # noqa: F401
+from unittest import mock
+
+import bot.globals
+
+from .. import manage, scheduler
+from .database import run
+
+
+class TestSpinScheduler(unittest.TestCase):
+    def test_admit(self) -> None:
+        spinScheduler: scheduler.SpinScheduler = scheduler.SpinScheduler(2)
+        self.assertTrue(spinScheduler.admit('megotsthis'))
+        self.assertFalse(spinScheduler.admit('megotsthis'))
+        self.assertTrue(spinScheduler.isQueued('megotsthis'))
+        self.assertTrue(spinScheduler.admit('botgotsthis'))
+        self.assertFalse(spinScheduler.admit('twitch'))
+        self.assertFalse(spinScheduler.isQueued('twitch'))
+        self.assertEqual(spinScheduler.duplicates, 1)
+        self.assertEqual(spinScheduler.dropped, 1)
+        self.assertEqual(spinScheduler.maxDepth, 2)
+
+    def test_manage(self) -> None:
+        chat: mock.Mock = mock.Mock()
+        chat.sessionData = {}
+        idle: mock.Mock = mock.Mock()
+        idle.sessionData = {}
+        spinScheduler: scheduler.SpinScheduler = scheduler.get(chat)
+        spinScheduler.admit('megotsthis')
+        spinScheduler.start('megotsthis')
+        spinScheduler.admit('megotsthis')
+        args: mock.Mock = mock.Mock()
+        args.message.__len__ = mock.Mock(return_value=2)
+        with mock.patch.object(bot.globals, 'channels',
+                               {'botgotsthis': chat, 'megotsthis': idle}):
+            self.assertTrue(run(manage.manageSlotsQueue(args)))
+        lines: List[str] = args.send.call_args[0][0]
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith(
+            'botgotsthis served 1 dropped 0 already queued 1 depth 1/1'))
+        self.assertIn(' | whispers sent ', lines[0])
@@ -0,0 +1,37 @@
+import random
+import unittest
+from datetime import datetime
+from typing import List  # noqa: F401
+
+from .. import pool, scoring
+
+
+class TestMatched(unittest.TestCase):
+    def setUp(self) -> None:
+        self.categories: List[scoring.Category] = [
+            scoring.Category('kappa', lambda n: 'kappa' in n.lower(),
+                             'isKappaMatch'),
+            scoring.Category('pog', lambda n: n.startswith('Pog')),
+            ]
+        self.emotePool: pool.EmotePool = pool.EmotePool(
+            {25: 'Kappa', 88: 'PogChamp', 1: 'PogKappa', 2: 'Keepo'},
+            datetime(2019, 1, 1), tuple(self.categories))
+        self.emotes: pool.Sample = self.emotePool.sample(
+            4, random.Random(0))
+
+    def test_matched(self) -> None:
+        self.assertEqual(
+            scoring.matched(self.emotes.matches([1, 1, 1]), self.categories),
+            self.categories)
+        self.assertEqual(
+            scoring.matched(self.emotes.matches([25, 1, 25]),
+                            self.categories),
+            self.categories[:1])
+        self.assertEqual(
+            scoring.matched(self.emotes.matches([88, 1, 1]),
+                            self.categories),
+            self.categories[1:])
+        self.assertEqual(
+            scoring.matched(self.emotes.matches([88, 2, 25]),
+                            self.categories),
+            [])
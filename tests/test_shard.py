@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from typing import Any, List  # noqa: F401
+from unittest import mock
+
+from .. import shard, shared
+from .database import run
+
+
+class TestShard(unittest.TestCase):
+    def setUp(self) -> None:
+        directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store: shared.SqliteSharedStore = shared.SqliteSharedStore(
+            os.path.join(directory.name, 'shared.db'))
+        self.addCleanup(self.store.executor.shutdown)
+        patcher: Any = mock.patch.object(shared, '_store', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.now: datetime = datetime(2019, 1, 1)
+        self.workers: List[str] = ['slots1', 'slots2', 'slots3']
+        self.shards: List[shard.Shard] = [shard.Shard(w, self.workers)
+                                          for w in self.workers]
+        s: shard.Shard
+        for s in self.shards:
+            s.started = self.now - shard.workerTimeout
+
+    def heartbeat(self, shards: List[shard.Shard], seconds: int) -> None:
+        # The second round sees the heartbeats of every worker
+        i: int
+        s: shard.Shard
+        for i in range(2):
+            for s in shards:
+                run(s.heartbeat(self.now + timedelta(seconds=seconds + i)))
+
+    def owners(self, shards: List[shard.Shard], channel: str) -> List[str]:
+        return [s.worker for s in shards if s.owns(channel)]
+
+    def test_owner(self) -> None:
+        channels: List[str] = [f'channel{i}' for i in range(30)]
+        self.heartbeat(self.shards, 0)
+        channel: str
+        for channel in channels:
+            self.assertEqual(len(self.owners(self.shards, channel)), 1)
+
+    def test_worker_lost(self) -> None:
+        channels: List[str] = [f'channel{i}' for i in range(30)]
+        self.heartbeat(self.shards, 0)
+        lost: List[str] = [c for c in channels
+                           if self.shards[2].owns(c)]
+        self.assertTrue(lost)
+        self.heartbeat(self.shards[:2], 90)
+        channel: str
+        for channel in channels:
+            self.assertEqual(len(self.owners(self.shards[:2], channel)), 1)
+        self.assertEqual(self.shards[0].alive, ['slots1', 'slots2'])
+        self.heartbeat(self.shards, 100)
+        self.assertEqual(self.shards[0].alive, self.workers)
+        for channel in lost:
+            self.assertEqual(self.owners(self.shards, channel), ['slots3'])
+
+    def test_starting(self) -> None:
+        self.shards[0].started = self.now
+        self.heartbeat(self.shards[:1], 0)
+        self.assertEqual(self.shards[0].alive, self.workers)
+
+    def test_no_worker(self) -> None:
+        everyone: shard.Shard = shard.Shard()
+        run(everyone.heartbeat(self.now))
+        self.assertTrue(everyone.owns('botgotsthis'))
+        self.assertEqual(run(self.store.heartbeat('slots1', self.now,
+                                                  self.now)), ['slots1'])
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from typing import List, Optional  # noqa: F401
+
+from .. import shared
+from .database import run
+
+
+class TestSqliteSharedStore(unittest.TestCase):
+    def setUp(self) -> None:
+        directory: tempfile.TemporaryDirectory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.store: shared.SqliteSharedStore = shared.SqliteSharedStore(
+            os.path.join(directory.name, 'shared.db'))
+        self.addCleanup(self.store.executor.shutdown)
+        self.now: datetime = datetime(2019, 1, 1)
+
+    def test_abstract(self) -> None:
+        with self.assertRaises(TypeError):
+            shared.SharedStore()  # type: ignore
+
+    def test_claim(self) -> None:
+        cooldown: timedelta = timedelta(seconds=30)
+        self.assertIsNone(run(self.store.claim('botgotsthis', self.now,
+                                               cooldown)))
+        self.assertEqual(run(self.store.claim(
+            'botgotsthis', self.now + timedelta(seconds=10), cooldown)),
+            self.now)
+        self.assertIsNone(run(self.store.claim(
+            'botgotsthis', self.now + cooldown, cooldown)))
+
+    def test_record_mark(self) -> None:
+        run(self.store.record('botgotsthis', 'twitch', 'megotsthis',
+                              self.now))
+        run(self.store.mark('botgotsthis', 'megotsthis', self.now))
+        self.assertEqual(run(self.store.lastAttempt(
+            'botgotsthis', 'twitch', 'megotsthis')), self.now)
+        self.assertEqual(run(self.store.lastAttempt(
+            'botgotsthis', 'ffz', 'megotsthis')), datetime.min)
+        self.assertEqual(run(self.store.botMarked(
+            'botgotsthis', 'megotsthis')), self.now)
+
+    def test_off_loop(self) -> None:
+        threads: List[Optional[str]] = []
+        time = self.store._time
+
+        def _time(query: str, *params: str) -> datetime:
+            threads.append(threading.current_thread().name)
+            return time(query, *params)
+
+        self.store._time = _time  # type: ignore
+        run(self.store.botMarked('botgotsthis', 'megotsthis'))
+        run(self.store.lastAttempt('botgotsthis', 'twitch', 'megotsthis'))
+        self.assertEqual(len(threads), 2)
+        self.assertEqual(len(set(threads)), 1)
+        self.assertNotEqual(threads[0], threading.current_thread().name)
+
+    def test_heartbeat(self) -> None:
+        since: datetime = self.now - timedelta(minutes=1)
+        self.assertEqual(run(self.store.heartbeat('slots1', since, since)),
+                         ['slots1'])
+        self.assertEqual(
+            sorted(run(self.store.heartbeat('slots2', self.now, since))),
+            ['slots1', 'slots2'])
+        self.assertEqual(run(self.store.heartbeat(
+            'slots2', self.now, self.now)), ['slots2'])
@@ -0,0 +1,153 @@
+import random
+import unittest
+from datetime import datetime, timedelta
+from typing import Any, List, Optional  # noqa: F401
+from unittest import mock
+
+import bot.globals
+from bot import utils
+from lib.database import DatabaseMain
+
+from .. import library, marks, migrate, notifier, pool, recorder, reels
+from .. import retention, shard, shared, spin, state
+from ..variant import SlotVariant
+from .database import SqliteDatabase, run
+
+# The library steps of a spin, in the order spin.spin_turn runs them
+steps: List[str] = ['loadPreSpinState', 'in_cooldown', 'claim_channel',
+                    'process_bot', 'recordSlots']
+
+
+class Cache:
+    async def hasFeature(self, channel: str, feature: str) -> bool:
+        return False
+
+
+class TestSpin(unittest.TestCase):
+    def setUp(self) -> None:
+        self.database: SqliteDatabase = SqliteDatabase()
+        self.emotePool: pool.EmotePool = pool.EmotePool(
+            {1: 'Kappa'}, datetime.max)
+        self.slotVariant: SlotVariant = SlotVariant(
+            'twitch', 'slots', '', '!slots', '!slotswinners', '', '',
+            self.generatePool, mock.Mock())
+        self.chat: mock.Mock = mock.Mock()
+        self.chat.channel = 'botgotsthis'
+        self.chat.sessionData = {}
+        self.now: datetime = datetime(2019, 1, 1)
+        self.calls: mock.Mock = mock.Mock()
+        patchers: List[Any] = [
+            mock.patch.object(DatabaseMain, 'acquire', self.database.acquire),
+            mock.patch.object(bot.globals, 'running', True),
+            mock.patch.object(utils, 'whisper'),
+            mock.patch.object(migrate, '_migrated', False),
+            mock.patch.object(migrate, '_lock', None),
+            mock.patch.object(marks, '_marks', marks.BotMarks()),
+            mock.patch.object(notifier, '_notifier',
+                              notifier.CooldownNotifier()),
+            mock.patch.object(recorder, '_recorder', recorder.SlotsRecorder(
+                flushInterval=0.01)),
+            mock.patch.object(retention, 'start'),
+            mock.patch.object(shard, '_shard', shard.Shard()),
+            mock.patch.object(shared, '_store', None),
+            mock.patch.object(shared, '_configured', True),
+            ]
+        name: str
+        for name in steps:
+            patchers.append(mock.patch.object(
+                library, name, wraps=getattr(library, name)))
+        patchers.append(mock.patch.object(reels, 'draw', wraps=reels.draw))
+        patcher: Any
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for name in steps:
+            self.calls.attach_mock(getattr(library, name), name)
+        self.calls.attach_mock(reels.draw, 'draw')
+
+    async def generatePool(self,
+                           chat: Any,
+                           dataCache: Any,
+                           rng: random.Random) -> Optional[pool.Sample]:
+        return self.emotePool.sample(8, rng)
+
+    def spin(self, nick: str, seconds: int = 0) -> bool:
+        args: mock.Mock = mock.Mock()
+        args.chat = self.chat
+        args.data = Cache()
+        args.nick = nick
+        args.timestamp = self.now + timedelta(seconds=seconds)
+        args.permissions.chatModerator = False
+
+        async def spinAndWrite() -> bool:
+            spun: bool = await spin.spin(args, self.slotVariant)
+            await recorder.shutdown()
+            return spun
+
+        return run(spinAndWrite())
+
+    def rows(self, query: str) -> List[Any]:
+        return self.database.connection.execute(query).fetchall()
+
+    def test_order(self) -> None:
+        self.assertTrue(self.spin('megotsthis'))
+        self.assertEqual([c[0] for c in self.calls.mock_calls],
+                         ['loadPreSpinState', 'in_cooldown', 'claim_channel',
+                          'process_bot', 'draw', 'recordSlots'])
+
+    def test_rows(self) -> None:
+        self.assertTrue(self.spin('megotsthis'))
+        self.assertTrue(self.spin('botgotsthis', 5))
+        self.assertEqual(self.rows('''
+SELECT variant, broadcaster, twitchUser, numMatching, isWin, emoticon1,
+    emoticonId1
+    FROM slot_attempts ORDER BY id
+'''), [('twitch', 'botgotsthis', 'megotsthis', 3, 1, 'Kappa', '1'),
+            ('twitch', 'botgotsthis', 'botgotsthis', 3, 1, 'Kappa', '1')])
+        self.assertEqual(self.rows('''
+SELECT variant, broadcaster, winner, winningEmote FROM slot_winners
+    ORDER BY id
+'''), [('twitch', 'botgotsthis', 'megotsthis', 'Kappa'),
+            ('twitch', 'botgotsthis', 'botgotsthis', 'Kappa')])
+        self.assertEqual(self.rows('''
+SELECT twitchUser, attempts, wins FROM slot_stats ORDER BY twitchUser
+'''), [('botgotsthis', 1, 1), ('megotsthis', 1, 1)])
+
+    def test_stats_upsert(self) -> None:
+        self.assertTrue(self.spin('megotsthis'))
+        self.assertTrue(self.spin('megotsthis', 150))
+        self.assertEqual(self.rows('''
+SELECT twitchUser, attempts, wins, lastWin=(SELECT MAX(attemptTime)
+        FROM slot_attempts)
+    FROM slot_stats
+'''), [('megotsthis', 2, 2, 1)])
+
+    def test_output(self) -> None:
+        self.assertTrue(self.spin('megotsthis'))
+        self.chat.send.assert_called_once_with([
+            'megotsthis -> Kappa | Kappa | Kappa - '
+            'megotsthis has won !slots'])
+        self.assertFalse(self.spin('megotsthis', 30))
+        utils.whisper.assert_called_once_with(
+            'megotsthis', 'Slots Cooldown (90.0 seconds)')
+        self.chat.send.assert_called_once()
+
+    def test_pre_spin_state(self) -> None:
+        self.database.connection.execute('''
+INSERT INTO slot_attempts
+    (variant, broadcaster, attemptTime, twitchUser, numMatching, isWin,
+    emoticon1, emoticon2, emoticon3, emoticonId1, emoticonId2,
+    emoticonId3)
+    VALUES ('twitch', 'botgotsthis', ?, 'megotsthis', 1, 0,
+        'Kappa', 'Kappa', 'Kappa', '1', '1', '1')
+''', (self.now - timedelta(seconds=60),))
+        self.assertFalse(self.spin('megotsthis'))
+        self.assertEqual(
+            state.get(self.chat).lastAttempts['twitch', 'megotsthis'],
+            self.now - timedelta(seconds=60))
+        utils.whisper.assert_called_once_with(
+            'megotsthis', 'Slots Cooldown (60.0 seconds)')
+        self.assertEqual([c[0] for c in self.calls.mock_calls],
+                         ['loadPreSpinState', 'in_cooldown'])
+        self.assertEqual(self.rows('SELECT COUNT(*) FROM slot_attempts'),
+                         [(1,)])
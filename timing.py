@@ -0,0 +1,132 @@
+import bisect
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union  # noqa: F401
+
+# Upper bounds of the histogram buckets in milliseconds, the last bucket
+# has no bound
+bounds: List[float] = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500,
+                       1000, 2500, 5000]
+# The stages of a spin in the order they run
+stages: List[str] = ['queue', 'prespin', 'bot', 'pool', 'output', 'record',
+                     'turn', 'write']
+# The recorder writes the rows of every channel and variant together
+anyChannel: str = '*'
+
+Key = Tuple[str, str, str]
+
+enabled: bool = False
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.buckets: List[int] = [0] * (len(bounds) + 1)
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def add(self, milliseconds: float) -> None:
+        self.buckets[bisect.bisect_left(bounds, milliseconds)] += 1
+        self.count += 1
+        self.total += milliseconds
+        self.max = max(self.max, milliseconds)
+
+    def merge(self, other: 'Histogram') -> None:
+        i: int
+        for i in range(len(self.buckets)):
+            self.buckets[i] += other.buckets[i]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Upper bound of the bucket holding the percentile, at most max
+        """
+        rank: float = max(1, fraction * self.count)
+        seen: int = 0
+        i: int
+        count: int
+        for i, count in enumerate(self.buckets[:-1]):
+            seen += count
+            if seen >= rank:
+                return min(bounds[i], self.max)
+        return self.max
+
+
+histograms: Dict[Key, Histogram] = {}
+
+
+class Span:
+    __slots__ = ('key', 'started')
+
+    def __init__(self, key: Key) -> None:
+        self.key: Key = key
+        self.started: float = 0.0
+
+    def __enter__(self) -> 'Span':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        add(self.key, (time.perf_counter() - self.started) * 1000)
+
+
+class NoSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> 'NoSpan':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        pass
+
+
+_noSpan: NoSpan = NoSpan()
+
+
+def span(channel: str, variant: str, stage: str) -> Union[Span, NoSpan]:
+    """
+    Times the with block into the histogram of the stage, a shared no-op
+    when timing is disabled
+    """
+    if not enabled:
+        return _noSpan
+    return Span((channel, variant, stage))
+
+
+def add(key: Key, milliseconds: float) -> None:
+    histogram: Optional[Histogram] = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = Histogram()
+    histogram.add(milliseconds)
+
+
+def observe(channel: str, variant: str, stage: str, seconds: float) -> None:
+    if enabled:
+        add((channel, variant, stage), seconds * 1000)
+
+
+def summary(channel: Optional[str] = None,
+            variant: Optional[str] = None) -> List[Tuple[str, Histogram]]:
+    """
+    The histograms of every stage merged over the matching channels and
+    variants
+    """
+    merged: Dict[str, Histogram] = {}
+    key: Key
+    histogram: Histogram
+    for key, histogram in list(histograms.items()):
+        keyChannel: str
+        keyVariant: str
+        stage: str
+        keyChannel, keyVariant, stage = key
+        if channel is not None and keyChannel not in (channel, anyChannel):
+            continue
+        if variant is not None and keyVariant not in (variant, anyChannel):
+            continue
+        merged.setdefault(stage, Histogram()).merge(histogram)
+    return [(s, merged[s]) for s in stages if s in merged]
+
+
+def reset() -> None:
+    histograms.clear()
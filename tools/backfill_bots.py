@@ -0,0 +1,276 @@
+"""
+Replay the slots bot detection over the stored attempt history
+
+Streams the slot_attempts of each variant ordered by (broadcaster,
+twitchUser, attemptTime), which the broadcaster_user index serves, and
+evaluates every attempt the way library.process_bot would have
+with NumPy over whole chunks of rows. For each threshold set the users it
+would mark are written as CSV. --populate stores the last mark of the first
+threshold set into slot_bots.
+
+A threshold set is a comma separated list of intervals:stdev, suffixed with
+r to only use the most recent intervals. The set used by the bot is
+
+    5:1,5:1r,10:3.5,15:10
+
+    python tools/backfill_bots.py --sqlite bot.db --set 5:1,5:1r,10:3.5,15:10
+    python tools/backfill_bots.py --odbc "DSN=botgotsthis;UseDeclareFetch=1"
+
+NumPy is only needed by this tool, it is not a dependency of the bot.
+"""
+import argparse
+import csv
+import sys
+from datetime import datetime, timedelta
+from fractions import Fraction
+from typing import Any, Dict, Iterator, List, NamedTuple, Tuple  # noqa: F401
+
+import numpy
+
+slotVariants: List[str] = ['twitch', 'ffz', 'bttv']
+window: timedelta = timedelta(hours=2)
+unbotCooldown: timedelta = timedelta(hours=1)
+second: int = 1000000
+
+
+class Threshold(NamedTuple):
+    minimum: int
+    limit: Fraction
+    onlyRecent: bool
+
+
+class Marks(NamedTuple):
+    count: int
+    first: datetime
+    last: datetime
+
+
+def parse_set(value: str) -> List[Threshold]:
+    thresholds: List[Threshold] = []
+    item: str
+    for item in value.split(','):
+        minimum: str
+        limit: str
+        minimum, limit = item.strip().split(':')
+        onlyRecent: bool = limit.endswith('r')
+        thresholds.append(Threshold(int(minimum),
+                                    Fraction(limit.rstrip('r')), onlyRecent))
+    return thresholds
+
+
+def stream_groups(connection: Any,
+                  variant: str,
+                  chunkSize: int
+                  ) -> Iterator[Tuple[List[Tuple[str, str]], List[int],
+                                      List[Any]]]:
+    """
+    Yield chunks of (keys, key index per row, times) that always hold
+    complete (broadcaster, user) histories
+
+    The times are datetime or, from SQLite, ISO strings and are only
+    converted by NumPy.
+    """
+    cursor: Any = connection.cursor()
+    cursor.execute('''
+SELECT broadcaster, twitchUser, attemptTime
+    FROM slot_attempts
+    WHERE variant=?
+    ORDER BY broadcaster, twitchUser, attemptTime
+''', (variant,))
+    keys: List[Tuple[str, str]] = []
+    groups: List[int] = []
+    times: List[Any] = []
+    while True:
+        rows: List[Any] = cursor.fetchmany(chunkSize)
+        if not rows:
+            break
+        row: Any
+        for row in rows:
+            key: Tuple[str, str] = (row[0], row[1])
+            if not keys or keys[-1] != key:
+                keys.append(key)
+            groups.append(len(keys) - 1)
+            times.append(row[2])
+        if len(times) < chunkSize:
+            continue
+        # Carry the last, possibly incomplete, history over
+        last: int = groups.index(len(keys) - 1)
+        if last == 0:
+            continue
+        yield keys[:-1], groups[:last], times[:last]
+        keys = keys[-1:]
+        times = times[last:]
+        groups = [0] * len(times)
+    if times:
+        yield keys, groups, times
+
+
+def evaluate(groups: numpy.ndarray,
+             times: numpy.ndarray,
+             thresholds: List[Threshold]) -> numpy.ndarray:
+    """
+    Whether the check before each attempt marks the user as a bot
+    """
+    windowUs: int = int(window.total_seconds()) * second
+    gap: numpy.ndarray = numpy.diff(times)
+    sameGroup: numpy.ndarray = groups[1:] == groups[:-1]
+    # A monotonic key where gaps longer than the window and changes of user
+    # count as window + 1, so a window never reaches into another history
+    step: numpy.ndarray = numpy.where(sameGroup,
+                                      numpy.minimum(gap, windowUs + 1),
+                                      windowUs + 1)
+    key: numpy.ndarray = numpy.concatenate(([0], numpy.cumsum(step)))
+
+    interval: numpy.ndarray = gap // second
+    interval = numpy.where(sameGroup,
+                           numpy.minimum(interval, windowUs // second + 1), 0)
+    sums: numpy.ndarray = numpy.concatenate(([0], numpy.cumsum(interval)))
+    squares: numpy.ndarray = numpy.concatenate(
+        ([0], numpy.cumsum(interval * interval)))
+
+    rows: numpy.ndarray = numpy.arange(len(times))
+    start: numpy.ndarray = numpy.searchsorted(key, key - windowUs, 'left')
+    # attempts start..j-1 are in the window of attempt j
+    count: numpy.ndarray = rows - 1 - start
+    checked: numpy.ndarray = numpy.zeros(len(times), dtype=bool)
+    checked[1:] = sameGroup & (gap < int(unbotCooldown.total_seconds())
+                               * second)
+
+    marked: numpy.ndarray = numpy.zeros(len(times), dtype=bool)
+    end: numpy.ndarray = numpy.maximum(rows - 1, 0)
+    threshold: Threshold
+    for threshold in thresholds:
+        first: numpy.ndarray = numpy.clip(start, 0, None)
+        n: numpy.ndarray = count
+        if threshold.onlyRecent:
+            first = numpy.maximum(first, end - 5)
+            n = numpy.minimum(count, 5)
+        total: numpy.ndarray = sums[end] - sums[first]
+        totalSquares: numpy.ndarray = squares[end] - squares[first]
+        limit: Fraction = threshold.limit * threshold.limit
+        below: numpy.ndarray = (
+            (n * totalSquares - total * total) * limit.denominator
+            < limit.numerator * n * (n - 1))
+        marked |= checked & (count >= threshold.minimum) & below
+    return marked
+
+
+def backfill(connection: Any,
+             variants: List[str],
+             sets: List[List[Threshold]],
+             chunkSize: int
+             ) -> List[Dict[Tuple[str, str, str], Marks]]:
+    results: List[Dict[Tuple[str, str, str], Marks]] = [{} for _ in sets]
+    variant: str
+    for variant in variants:
+        keys: List[Tuple[str, str]]
+        groupList: List[int]
+        timeList: List[Any]
+        for keys, groupList, timeList in stream_groups(
+                connection, variant, chunkSize):
+            groups: numpy.ndarray = numpy.array(groupList)
+            dates: numpy.ndarray = numpy.array(timeList,
+                                               dtype='datetime64[us]')
+            times: numpy.ndarray = dates.astype(numpy.int64)
+            i: int
+            thresholds: List[Threshold]
+            for i, thresholds in enumerate(sets):
+                marked: numpy.ndarray = evaluate(groups, times, thresholds)
+                markedRows: numpy.ndarray = numpy.flatnonzero(marked)
+                if not len(markedRows):
+                    continue
+                markedGroups: numpy.ndarray = groups[markedRows]
+                uniqueGroups: numpy.ndarray
+                firsts: numpy.ndarray
+                counts: numpy.ndarray
+                uniqueGroups, firsts, counts = numpy.unique(
+                    markedGroups, return_index=True, return_counts=True)
+                group: int
+                firstIndex: int
+                markCount: int
+                for group, firstIndex, markCount in zip(
+                        uniqueGroups.tolist(), firsts.tolist(),
+                        counts.tolist()):
+                    lastIndex: int = firstIndex + markCount - 1
+                    results[i][(variant,) + keys[group]] = Marks(
+                        markCount,
+                        dates[markedRows[firstIndex]].item(),
+                        dates[markedRows[lastIndex]].item())
+    return results
+
+
+def populate(connection: Any,
+             isSqlite: bool,
+             marks: Dict[Tuple[str, str, str], Marks]) -> None:
+    latest: Dict[Tuple[str, str], datetime] = {}
+    key: Tuple[str, str, str]
+    mark: Marks
+    for key, mark in marks.items():
+        bot: Tuple[str, str] = key[1:]
+        latest[bot] = max(latest.get(bot, datetime.min), mark.last)
+    query: str
+    if isSqlite:
+        # No ON CONFLICT DO UPDATE before SQLite 3.24
+        query = '''
+REPLACE INTO slot_bots (broadcaster, bot, marked)
+    SELECT n.broadcaster, n.bot, MAX(n.marked, COALESCE(s.marked, n.marked))
+        FROM (SELECT ? AS broadcaster, ? AS bot, ? AS marked) AS n
+            LEFT JOIN slot_bots AS s
+                ON s.broadcaster=n.broadcaster AND s.bot=n.bot
+'''
+    else:
+        query = '''
+INSERT INTO slot_bots (broadcaster, bot, marked) VALUES (?, ?, ?)
+    ON CONFLICT ON CONSTRAINT slot_bots_pkey
+    DO UPDATE SET marked=GREATEST(slot_bots.marked, excluded.marked)
+'''
+    cursor: Any = connection.cursor()
+    cursor.executemany(query, [k + (m,) for k, m in latest.items()])
+    connection.commit()
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Replay slots bot detection over the attempt tables')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--sqlite', help='path of the SQLite database')
+    source.add_argument('--odbc', help='ODBC connection string')
+    parser.add_argument('--set', action='append', dest='sets',
+                        help='threshold set, can be repeated')
+    parser.add_argument('--variant', action='append', dest='variants',
+                        choices=slotVariants)
+    parser.add_argument('--chunk', type=int, default=1000000)
+    parser.add_argument('--populate', action='store_true',
+                        help='store the marks of the first set in slot_bots')
+    args: argparse.Namespace = parser.parse_args()
+
+    connection: Any
+    if args.sqlite:
+        import sqlite3
+        connection = sqlite3.connect(args.sqlite)
+    else:
+        import pyodbc
+        connection = pyodbc.connect(args.odbc)
+    sets: List[List[Threshold]] = [
+        parse_set(s) for s in args.sets or ['5:1,5:1r,10:3.5,15:10']]
+    variants: List[str] = args.variants or slotVariants
+
+    results: List[Dict[Tuple[str, str, str], Marks]]
+    results = backfill(connection, variants, sets, args.chunk)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['set', 'variant', 'broadcaster', 'user', 'marks',
+                     'first', 'last'])
+    i: int
+    marks: Dict[Tuple[str, str, str], Marks]
+    for i, marks in enumerate(results):
+        key: Tuple[str, str, str]
+        mark: Marks
+        for key, mark in sorted(marks.items()):
+            writer.writerow([args.sets[i] if args.sets else 'default', *key,
+                             mark.count, mark.first, mark.last])
+    if args.populate:
+        populate(connection, bool(args.sqlite), results[0])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Move the rows of the per-variant tables renamed by migration 0004 into the
+variant keyed slot_attempts and slot_winners
+
+Runs next to the bot. Every batch is moved in its own transaction, inserted
+into the new table and deleted from the legacy one, so the compatibility
+views never show a row twice or miss one. Batches go from the newest id
+down, the recent attempts the cooldown and bot checks read are moved first.
+
+    python tools/copy_variants.py --sqlite bot.db
+    python tools/copy_variants.py --odbc "DSN=botgotsthis" --batch 5000
+
+The legacy ids of the variants overlap, so the rows get new ids. The SQLite
+archive rows go through slot_attempts to take theirs from its sequence, the
+ids retention.archive moves into slot_attempts_archive later never collide
+with them.
+
+Once every legacy table is empty they can be dropped together with the
+compatibility views, which only union them in.
+"""
+import argparse
+import sys
+import time
+from typing import Any, List, NamedTuple, Optional  # noqa: F401
+
+
+class Source(NamedTuple):
+    variant: str
+    table: str
+    target: str
+    columns: List[str]
+
+
+attemptColumns: List[str] = [
+    'broadcaster', 'attemptTime', 'twitchUser', 'numMatching', 'isWin',
+    'emoticon1', 'emoticon2', 'emoticon3', 'emoticonId1', 'emoticonId2',
+    'emoticonId3',
+    ]
+twitchColumns: List[str] = attemptColumns + [
+    'isBasicMatch', 'isKappaMatch', 'isCatMatch', 'isDogMatch',
+    'isSubscriberMatch',
+    ]
+winnerColumns: List[str] = [
+    'broadcaster', 'winningTime', 'winner', 'winningEmote', 'winningEmoteId',
+    ]
+textColumns: List[str] = [
+    'emoticonId1', 'emoticonId2', 'emoticonId3', 'winningEmoteId',
+    ]
+
+
+def sources(isSqlite: bool) -> List[Source]:
+    result: List[Source] = [
+        Source('twitch', 'slot_attempts_legacy', 'slot_attempts',
+               twitchColumns),
+        Source('ffz', 'ffz_slot_attempts_legacy', 'slot_attempts',
+               attemptColumns),
+        Source('bttv', 'bttv_slot_attempts_legacy', 'slot_attempts',
+               attemptColumns),
+        Source('twitch', 'slot_winners_legacy', 'slot_winners',
+               winnerColumns),
+        Source('ffz', 'ffz_slot_winners_legacy', 'slot_winners',
+               winnerColumns),
+        Source('bttv', 'bttv_slot_winners_legacy', 'slot_winners',
+               winnerColumns),
+        ]
+    if isSqlite:
+        result += [
+            Source('twitch', 'slot_attempts_legacy_archive',
+                   'slot_attempts_archive', twitchColumns),
+            Source('ffz', 'ffz_slot_attempts_legacy_archive',
+                   'slot_attempts_archive', attemptColumns),
+            Source('bttv', 'bttv_slot_attempts_legacy_archive',
+                   'slot_attempts_archive', attemptColumns),
+            ]
+    return result
+
+
+def copy_batch(connection: Any, source: Source, batchSize: int) -> int:
+    """
+    Move the batchSize rows with the highest ids, returns how many moved
+    """
+    cursor: Any = connection.cursor()
+    cursor.execute(f'''
+SELECT MIN(id), COUNT(*)
+    FROM (SELECT id FROM {source.table} ORDER BY id DESC LIMIT ?) AS a
+''', (batchSize,))
+    lowest: Optional[int]
+    count: int
+    lowest, count = cursor.fetchone()
+    if lowest is None:
+        return 0
+    columns: str = ', '.join(source.columns)
+    values: str = ', '.join(f'CAST({c} AS VARCHAR)' if c in textColumns
+                            else c for c in source.columns)
+    target: str = ('slot_attempts'
+                   if source.target == 'slot_attempts_archive'
+                   else source.target)
+    cursor.execute(f'''
+INSERT INTO {target} (variant, {columns})
+    SELECT ?, {values} FROM {source.table} WHERE id>=? ORDER BY id
+''', (source.variant, lowest))
+    if target != source.target:
+        # One INSERT takes consecutive ids from the sequence
+        last: int = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+        cursor.execute(f'''
+INSERT INTO {source.target} SELECT * FROM {target} WHERE id BETWEEN ? AND ?
+''', (last - count + 1, last))
+        cursor.execute(f'DELETE FROM {target} WHERE id BETWEEN ? AND ?',
+                       (last - count + 1, last))
+    cursor.execute(f'DELETE FROM {source.table} WHERE id>=?', (lowest,))
+    connection.commit()
+    return count
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Move the legacy slots tables into the unified ones')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--sqlite', help='path of the SQLite database')
+    source.add_argument('--odbc', help='ODBC connection string')
+    parser.add_argument('--batch', type=int, default=1000)
+    parser.add_argument('--pause', type=float, default=0.1,
+                        help='seconds to wait between batches')
+    args: argparse.Namespace = parser.parse_args()
+
+    connection: Any
+    if args.sqlite:
+        import sqlite3
+        connection = sqlite3.connect(args.sqlite)
+    else:
+        import pyodbc
+        connection = pyodbc.connect(args.odbc)
+
+    legacy: Source
+    for legacy in sources(bool(args.sqlite)):
+        total: int = 0
+        while True:
+            moved: int = copy_batch(connection, legacy, args.batch)
+            if not moved:
+                break
+            total += moved
+            print(f'{legacy.table}: {total} rows', file=sys.stderr)
+            time.sleep(args.pause)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,366 @@
+"""
+Export the slots attempts and winners for the winners site as CSV or
+Parquet
+
+Rows are read in id order, batch by batch: each batch is a short query
+starting after the last id of the one before it, served by the primary key.
+Memory stays constant whatever the size of the export and no transaction is
+held open against the production database between batches. On PostgreSQL
+every batch can additionally stream from a server-side cursor with the
+psqlODBC UseDeclareFetch option. On SQLite the attempts moved into
+slot_attempts_archive are exported with the ones still in slot_attempts.
+
+    python tools/export_slots.py --sqlite bot.db --out export
+    python tools/export_slots.py \\
+        --odbc "DSN=botgotsthis;UseDeclareFetch=1;Fetch=5000" \\
+        --out export --format parquet --channel botgotsthis --variant twitch \\
+        --since 2019-01-01 --until 2019-02-01
+
+--watermark keeps the last exported id of each table in a JSON file. The
+next run only exports the rows after it and writes them to new files named
+after their id range, so the site syncs the new rows with one index range
+scan per table instead of reading whole tables.
+
+    python tools/export_slots.py --odbc "DSN=botgotsthis;UseDeclareFetch=1" \\
+        --out export --watermark export/watermark.json
+
+Ids are taken when a row is inserted, not when it commits. A bot process
+still writing a batch can commit ids below rows another one already
+committed, and a watermark past them would skip those rows for good. The
+export stops at the first row, in id order, newer than --commit-delay
+seconds (10 minutes by default) and leaves it and everything after it to
+the next run. The delay has to cover how long a row can take to commit:
+the recorder writes a spin up to its flush interval after it happened and
+retries a failed batch for up to 15 more seconds.
+
+PyArrow is only needed for --format parquet, it is not a dependency of the
+bot.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, NamedTuple  # noqa: F401
+from typing import Optional  # noqa: F401
+
+slotVariants: List[str] = ['twitch', 'ffz', 'bttv']
+timeFormat: str = '%Y-%m-%d %H:%M:%S.%f'
+commitDelay: timedelta = timedelta(minutes=10)
+
+
+class Table(NamedTuple):
+    name: str
+    sources: List[str]
+    timeColumn: str
+    columns: List[str]
+    booleans: List[str]
+
+
+attemptColumns: List[str] = [
+    'id', 'variant', 'broadcaster', 'attemptTime', 'twitchUser',
+    'numMatching', 'isWin', 'emoticon1', 'emoticon2', 'emoticon3',
+    'emoticonId1', 'emoticonId2', 'emoticonId3', 'isBasicMatch',
+    'isKappaMatch', 'isCatMatch', 'isDogMatch', 'isSubscriberMatch',
+    'spinSeed', 'spinCounter',
+    ]
+winnerColumns: List[str] = [
+    'id', 'variant', 'broadcaster', 'winningTime', 'winner', 'winningEmote',
+    'winningEmoteId',
+    ]
+
+
+def tables(isSqlite: bool) -> List[Table]:
+    attemptSources: List[str] = ['slot_attempts']
+    if isSqlite:
+        attemptSources.append('slot_attempts_archive')
+    return [
+        Table('attempts', attemptSources, 'attemptTime', attemptColumns,
+              ['isWin', 'isBasicMatch', 'isKappaMatch', 'isCatMatch',
+               'isDogMatch', 'isSubscriberMatch']),
+        Table('winners', ['slot_winners'], 'winningTime', winnerColumns, []),
+        ]
+
+
+class Filters(NamedTuple):
+    channels: List[str]
+    variants: List[str]
+    since: Optional[datetime]
+    until: Optional[datetime]
+
+
+def batch_query(table: Table,
+                filters: Filters) -> str:
+    conditions: List[str] = ['id>?']
+    if filters.channels:
+        conditions.append(
+            f'broadcaster IN ({", ".join("?" * len(filters.channels))})')
+    if filters.variants:
+        conditions.append(
+            f'variant IN ({", ".join("?" * len(filters.variants))})')
+    if filters.since is not None:
+        conditions.append(f'{table.timeColumn}>=?')
+    if filters.until is not None:
+        conditions.append(f'{table.timeColumn}<?')
+    selects: List[str] = [f'''
+SELECT {", ".join(table.columns)} FROM {source}
+    WHERE {" AND ".join(conditions)}''' for source in table.sources]
+    return '\n    UNION ALL'.join(selects) + '''
+    ORDER BY id
+    LIMIT ?
+'''
+
+
+def batch_params(table: Table,
+                 filters: Filters,
+                 afterId: int,
+                 batchSize: int) -> List[Any]:
+    params: List[Any] = [afterId] + filters.channels + filters.variants
+    if filters.since is not None:
+        params.append(filters.since)
+    if filters.until is not None:
+        params.append(filters.until)
+    return params * len(table.sources) + [batchSize]
+
+
+def stream_rows(connection: Any,
+                table: Table,
+                filters: Filters,
+                afterId: int,
+                batchSize: int,
+                fetchSize: int,
+                cutoff: Optional[datetime] = None) -> Iterator[List[Any]]:
+    """
+    Yield the rows after afterId in id order, at most fetchSize at a time,
+    up to the first row at or after cutoff
+    """
+    query: str = batch_query(table, filters)
+    timeIndex: int = table.columns.index(table.timeColumn)
+    while True:
+        cursor: Any = connection.cursor()
+        cursor.execute(query,
+                       batch_params(table, filters, afterId, batchSize))
+        count: int = 0
+        done: bool = False
+        while not done:
+            rows: List[Any] = cursor.fetchmany(fetchSize)
+            if not rows:
+                break
+            count += len(rows)
+            if cutoff is not None:
+                i: int
+                row: Any
+                for i, row in enumerate(rows):
+                    if parse_time(row[timeIndex]) >= cutoff:
+                        rows = rows[:i]
+                        done = True
+                        break
+            if rows:
+                afterId = rows[-1][0]
+                yield rows
+        cursor.close()
+        # The batch is over, commit so no snapshot outlives it
+        connection.commit()
+        if done or count < batchSize:
+            return
+
+
+class CsvWriter:
+    def __init__(self, path: str, table: Table) -> None:
+        self.file = open(path, 'w', encoding='utf-8', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(table.columns)
+        self.booleans: List[int] = [table.columns.index(c)
+                                    for c in table.booleans]
+
+    def write(self, rows: List[Any]) -> None:
+        row: Any
+        for row in rows:
+            values: List[Any] = list(row)
+            i: int
+            for i in self.booleans:
+                values[i] = int(bool(values[i]))
+            self.writer.writerow(values)
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class ParquetWriter:
+    """
+    Writes a row group per fetch, with the schema fixed up front so empty or
+    all NULL fetches do not change the column types
+    """
+    def __init__(self, path: str, table: Table) -> None:
+        import pyarrow
+        import pyarrow.parquet
+        self.pyarrow = pyarrow
+        types: Dict[str, Any] = {
+            'id': pyarrow.int64(),
+            'numMatching': pyarrow.int32(),
+            'spinSeed': pyarrow.int64(),
+            'spinCounter': pyarrow.int32(),
+            table.timeColumn: pyarrow.timestamp('us'),
+            }
+        types.update({c: pyarrow.bool_() for c in table.booleans})
+        self.table: Table = table
+        self.schema = pyarrow.schema(
+            [(c, types.get(c, pyarrow.string())) for c in table.columns])
+        self.writer = pyarrow.parquet.ParquetWriter(path, self.schema)
+
+    def write(self, rows: List[Any]) -> None:
+        columns: List[List[Any]] = [list(c) for c in zip(*rows)]
+        timeIndex: int = self.table.columns.index(self.table.timeColumn)
+        columns[timeIndex] = [parse_time(t) for t in columns[timeIndex]]
+        column: str
+        for column in self.table.booleans:
+            i: int = self.table.columns.index(column)
+            columns[i] = [bool(v) for v in columns[i]]
+        self.writer.write_table(self.pyarrow.Table.from_arrays(
+            [self.pyarrow.array(c, type=f.type)
+             for c, f in zip(columns, self.schema)],
+            schema=self.schema))
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+def parse_time(value: Any) -> datetime:
+    """
+    SQLite hands back the timestamps as text
+    """
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.strptime(value, timeFormat)
+    except ValueError:
+        return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+
+def export_table(connection: Any,
+                 table: Table,
+                 filters: Filters,
+                 afterId: int,
+                 outDir: str,
+                 fileFormat: str,
+                 batchSize: int,
+                 fetchSize: int,
+                 cutoff: Optional[datetime] = None) -> int:
+    """
+    Export the rows of table after afterId and before the first one at or
+    after cutoff, returns the last id exported
+    """
+    partial: str = os.path.join(outDir, f'{table.name}.partial')
+    writer: Any = None
+    lastId: int = afterId
+    count: int = 0
+    try:
+        rows: List[Any]
+        for rows in stream_rows(connection, table, filters, afterId,
+                                batchSize, fetchSize, cutoff):
+            if writer is None:
+                if fileFormat == 'parquet':
+                    writer = ParquetWriter(partial, table)
+                else:
+                    writer = CsvWriter(partial, table)
+            writer.write(rows)
+            lastId = rows[-1][0]
+            count += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        print(f'{table.name}: no rows after id {afterId}', file=sys.stderr)
+        return afterId
+    path: str = os.path.join(
+        outDir, f'{table.name}-{afterId + 1}-{lastId}.{fileFormat}')
+    os.replace(partial, path)
+    print(f'{table.name}: {count} rows to {path}', file=sys.stderr)
+    return lastId
+
+
+def read_watermark(path: Optional[str]) -> Dict[str, int]:
+    if path is None or not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def write_watermark(path: str, watermark: Dict[str, int]) -> None:
+    with open(path + '.tmp', 'w', encoding='utf-8') as file:
+        json.dump(watermark, file, indent=2, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+def parse_datetime(value: str) -> datetime:
+    dateFormat: str
+    for dateFormat in ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S']:
+        try:
+            return datetime.strptime(value, dateFormat)
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f'invalid UTC time: {value}')
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(
+        description='Export the slots attempts and winners')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--sqlite', help='path of the SQLite database')
+    source.add_argument('--odbc', help='ODBC connection string')
+    parser.add_argument('--out', required=True, help='output directory')
+    parser.add_argument('--format', choices=['csv', 'parquet'],
+                        default='csv')
+    parser.add_argument('--table', action='append', dest='tables',
+                        choices=['attempts', 'winners'])
+    parser.add_argument('--channel', action='append', dest='channels')
+    parser.add_argument('--variant', action='append', dest='variants',
+                        choices=slotVariants)
+    parser.add_argument('--since', type=parse_datetime,
+                        help='UTC time of the first row, inclusive')
+    parser.add_argument('--until', type=parse_datetime,
+                        help='UTC time of the last row, exclusive')
+    parser.add_argument('--after-id', type=int, default=0,
+                        help='only export the rows after this id')
+    parser.add_argument('--watermark',
+                        help='JSON file of the last id exported per table')
+    parser.add_argument('--batch', type=int, default=50000,
+                        help='rows per query')
+    parser.add_argument('--fetch', type=int, default=5000,
+                        help='rows per fetch and Parquet row group')
+    parser.add_argument('--commit-delay', type=float,
+                        default=commitDelay.total_seconds(),
+                        help='seconds a row may take to commit, newer rows '
+                             'are left to the next run')
+    args: argparse.Namespace = parser.parse_args()
+
+    connection: Any
+    if args.sqlite:
+        import sqlite3
+        connection = sqlite3.connect(args.sqlite)
+    else:
+        import pyodbc
+        connection = pyodbc.connect(args.odbc)
+    os.makedirs(args.out, exist_ok=True)
+    filters: Filters = Filters(args.channels or [], args.variants or [],
+                               args.since, args.until)
+    watermark: Dict[str, int] = read_watermark(args.watermark)
+    cutoff: datetime = (datetime.utcnow()
+                        - timedelta(seconds=args.commit_delay))
+
+    table: Table
+    for table in tables(bool(args.sqlite)):
+        if args.tables and table.name not in args.tables:
+            continue
+        afterId: int = max(args.after_id, watermark.get(table.name, 0))
+        watermark[table.name] = export_table(
+            connection, table, filters, afterId, args.out, args.format,
+            args.batch, args.fetch, cutoff)
+        if args.watermark:
+            write_watermark(args.watermark, watermark)
+    connection.close()
+
+
+if __name__ == '__main__':
+    main()
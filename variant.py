@@ -0,0 +1,40 @@
+import random
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List  # noqa: F401
+from typing import NamedTuple, Optional
+
+from bot import data  # noqa: F401
+from lib.cache import CacheStore
+from . import pool  # noqa: F401
+
+# The emotes of a spin drawn with the generator of the spin
+PoolProvider = Callable[['data.Channel', CacheStore, random.Random],
+                        Awaitable[Optional['pool.Sample']]]
+# The whole emote pool of the variant in a channel
+PoolLoader = Callable[['data.Channel', CacheStore],
+                      Awaitable[Optional['pool.EmotePool']]]
+# Extra attempt columns computed from (cache, emotes, selected ids)
+Scorer = Callable[[CacheStore, 'pool.Sample', List[Any]],
+                  Awaitable[Dict[str, bool]]]
+
+
+class SlotVariant(NamedTuple):
+    name: str
+    feature: str
+    featureName: str
+    command: str
+    winnersCommand: str
+    winnersName: str
+    winnersPath: str
+    generatePool: PoolProvider
+    loadPool: PoolLoader
+    scorer: Optional[Scorer] = None
+    timeoutEmote: Optional[Any] = None
+
+
+variants: Dict[str, SlotVariant] = OrderedDict()
+
+
+def register(slotVariant: SlotVariant) -> SlotVariant:
+    variants[slotVariant.name] = slotVariant
+    return slotVariant
@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional, Set, Tuple  # noqa: F401
+
+import bot.globals
+from bot import data, utils  # noqa: F401
+from lib.cache import CacheStore
+from . import library, pool
+from .variant import SlotVariant, variants
+
+interval: timedelta = timedelta(seconds=30)
+# The pools are read again from the CacheStore every interval, a refresh of
+# the emotes in the cache reaches the spins within it
+refreshMargin: timedelta = pool.poolDuration - interval
+maxConcurrent: int = 4
+
+Key = Tuple[str, Optional[str]]
+
+
+class EmoteWarmer:
+    """
+    Loads the emote pools of the slots variants enabled in a channel when
+    the bot joins it and keeps them loaded, so spins find them in pool. The
+    pools are read from the cache again every interval and rebuilt when the
+    cache has other emotes. The pools of a channel the bot left are dropped.
+
+    At most maxConcurrent pools are fetched at a time. A pool shared by
+    channels, like the Twitch one, is loaded once.
+    """
+    def __init__(self, maxConcurrent: int = maxConcurrent) -> None:
+        self.maxConcurrent: int = maxConcurrent
+        self.channels: Set[str] = set()
+        self.loads: int = 0
+        self.failures: int = 0
+        self._loading: Set[Key] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Future] = None
+
+    def join(self, channel: str) -> None:
+        self.channels.add(channel)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        else:
+            asyncio.ensure_future(self._warm(channel))
+
+    async def _run(self) -> None:
+        while bot.globals.running and self.channels:
+            await self.warm()
+            await asyncio.sleep(interval.total_seconds())
+
+    async def warm(self) -> None:
+        parted: Set[str] = self.channels - set(bot.globals.channels)
+        channel: str
+        for channel in parted:
+            pool.invalidate(broadcaster=channel)
+        self.channels -= parted
+        await asyncio.gather(*(self._warm(c) for c in list(self.channels)))
+
+    async def _warm(self, channel: str) -> None:
+        try:
+            await self.warmChannel(channel)
+        except Exception:
+            utils.logException()
+
+    async def warmChannel(self, channel: str) -> None:
+        chat: Optional[data.Channel] = bot.globals.channels.get(channel)
+        if chat is None:
+            return
+        dataCache: CacheStore
+        async with CacheStore.acquire() as dataCache:
+            slotVariant: SlotVariant
+            for slotVariant in variants.values():
+                if not await dataCache.hasFeature(channel,
+                                                  slotVariant.feature):
+                    continue
+                await self.load(slotVariant, chat, dataCache)
+
+    async def load(self,
+                   slotVariant: SlotVariant,
+                   chat: 'data.Channel',
+                   dataCache: CacheStore) -> None:
+        key: Key = (slotVariant.name,
+                    library.poolBroadcaster(slotVariant.name, chat))
+        if key in self._loading:
+            return
+        if pool.get(*key, datetime.utcnow() + refreshMargin) is not None:
+            return
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.maxConcurrent)
+        self._loading.add(key)
+        try:
+            async with self._semaphore:
+                if await slotVariant.loadPool(chat, dataCache) is None:
+                    self.failures += 1
+                else:
+                    self.loads += 1
+        finally:
+            self._loading.discard(key)
+
+
+_warmer: EmoteWarmer = EmoteWarmer()
+
+
+def get() -> EmoteWarmer:
+    return _warmer
+
+
+def join(channel: str) -> None:
+    _warmer.join(channel)